@@ -1,10 +1,170 @@
+import functools
+import hashlib
+
 from django import forms
-from bootstrap_modal_forms.mixins import PopRequestMixin, CreateUpdateAjaxMixin
+from django.core.cache import DEFAULT_CACHE_ALIAS, caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.core.exceptions import EmptyResultSet, ValidationError
+from django.forms.models import ModelChoiceIterator
+from django.utils.translation import get_language
+from bootstrap_modal_forms.mixins import (
+    PopRequestMixin,
+    CreateUpdateAjaxMixin,
+    ModalPhaseFormMixin,
+    ModalPhase,
+    get_cached_choices_generation,
+    get_validation_phase,
+    register_cached_choices
+)
 
 
-class BSModalForm(PopRequestMixin, forms.Form):
+class BSModalForm(PopRequestMixin, ModalPhaseFormMixin, forms.Form):
     pass
 
 
-class BSModalModelForm(PopRequestMixin, CreateUpdateAjaxMixin, forms.ModelForm):
+class BSModalModelForm(PopRequestMixin, ModalPhaseFormMixin, CreateUpdateAjaxMixin, forms.ModelForm):
     pass
+
+
+def _skip_in_phases(phases, func):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if get_validation_phase() not in phases:
+            return func(*args, **kwargs)
+        if args and isinstance(args[0], forms.BaseForm):
+            # Skipped clean method returns the value cleaned so far
+            form = args[0]
+            if func.__name__ == 'clean':
+                return form.cleaned_data
+            if func.__name__.startswith('clean_'):
+                return form.cleaned_data.get(func.__name__[len('clean_'):])
+        return None
+
+    return wrapper
+
+
+def commit_only(func):
+    """
+    Run the form's clean method or the field's validator only when the form is committed, not during the ajax
+    validation request.
+    """
+    return _skip_in_phases({ModalPhase.VALIDATE, ModalPhase.VALIDATE_FIELD}, func)
+
+
+def validate_only(func):
+    """
+    Run the form's clean method or the field's validator only during the ajax validation requests.
+    """
+    return _skip_in_phases({ModalPhase.COMMIT, ModalPhase.ASYNC_COMMIT}, func)
+
+
+class CachedModelChoiceIterator(ModelChoiceIterator):
+    """
+    Iterate over the choices of CachedChoicesMixin field read from the cache instead of the queryset.
+    """
+
+    def __iter__(self):
+        if self.field.empty_label is not None:
+            yield ("", self.field.empty_label)
+        yield from self.field.get_cached_choices()
+
+    def __len__(self):
+        return len(self.field.get_cached_choices()) + (1 if self.field.empty_label is not None else 0)
+
+    def __bool__(self):
+        return self.field.empty_label is not None or bool(self.field.get_cached_choices())
+
+
+class CachedChoicesMixin:
+    """
+    Field Mixin which caches the (value, label) choices of ModelChoiceField with Django's cache framework, so the
+    queryset isn't evaluated every time the modal form is rendered. Submitted values, which aren't among the cached
+    choices, are rejected without querying the database, the others are fetched by the usual query of the field.
+
+    The cache key is built from the SQL of the queryset, to_field_name, label_from_instance, active language and
+    a generation of the queryset's model and models in cache_dependencies, which is bumped whenever their object
+    is saved or deleted. Use invalidate_cached_choices(model) when objects are changed without the post_save or
+    post_delete signal, e.g. by QuerySet.update().
+    """
+
+    iterator = CachedModelChoiceIterator
+
+    def __init__(self, queryset, *, cache_timeout=DEFAULT_TIMEOUT, cache_alias=DEFAULT_CACHE_ALIAS,
+                 cache_dependencies=(), **kwargs):
+        self.cache_timeout = cache_timeout
+        self.cache_alias = cache_alias
+        self.cache_dependencies = tuple(cache_dependencies)
+        for model in self.cache_dependencies:
+            register_cached_choices(model, cache_alias)
+        super().__init__(queryset, **kwargs)
+
+    def _set_queryset(self, queryset):
+        super()._set_queryset(queryset)
+        self._cached_choices = None
+        self._cached_choice_values = None
+        if queryset is not None:
+            register_cached_choices(queryset.model, self.cache_alias)
+
+    queryset = property(forms.ModelChoiceField._get_queryset, _set_queryset)
+
+    def get_choices_cache_key(self):
+        try:
+            query = str(self.queryset.query)
+        except EmptyResultSet:
+            # Empty queryset, e.g. none(), has no SQL and nothing to cache
+            return None
+        label = self.label_from_instance
+        key = ':'.join(str(part) for part in [
+            query,
+            self.to_field_name,
+            '%s.%s' % (label.__module__, label.__qualname__),
+            get_language(),
+            *(get_cached_choices_generation(model, self.cache_alias)
+              for model in (self.queryset.model, *self.cache_dependencies)),
+        ])
+        return 'bootstrap_modal_forms:choices:' + hashlib.md5(key.encode()).hexdigest()
+
+    def get_cached_choices(self):
+        if self._cached_choices is None:
+            key = self.get_choices_cache_key()
+            cache = caches[self.cache_alias]
+            choices = None if key is None else cache.get(key)
+            if choices is None:
+                queryset = self.queryset
+                # Can't use iterator() when queryset uses prefetch_related()
+                if not queryset._prefetch_related_lookups:
+                    queryset = queryset.iterator()
+                choices = [(self.prepare_value(obj), str(self.label_from_instance(obj))) for obj in queryset]
+                if key is not None:
+                    cache.set(key, choices, self.cache_timeout)
+            self._cached_choices = choices
+        return self._cached_choices
+
+    def get_cached_choice_values(self):
+        # Built once per cached choices, so validating many values is a lookup each
+        if self._cached_choice_values is None:
+            self._cached_choice_values = frozenset(str(choice) for choice, label in self.get_cached_choices())
+        return self._cached_choice_values
+
+    def validate_cached_choice(self, value):
+        if str(value) not in self.get_cached_choice_values():
+            raise ValidationError(self.error_messages['invalid_choice'], code='invalid_choice', params={'value': value})
+
+
+class CachedModelChoiceField(CachedChoicesMixin, forms.ModelChoiceField):
+    def to_python(self, value):
+        if value not in self.empty_values and not isinstance(value, self.queryset.model):
+            self.validate_cached_choice(value)
+        return super().to_python(value)
+
+
+class CachedModelMultipleChoiceField(CachedChoicesMixin, forms.ModelMultipleChoiceField):
+    def _check_values(self, value):
+        try:
+            values = frozenset(value)
+        except TypeError:
+            # Let ModelMultipleChoiceField raise invalid_list
+            return super()._check_values(value)
+        for val in values:
+            self.validate_cached_choice(val)
+        return super()._check_values(value)
@@ -1,28 +1,92 @@
 from django.views import generic
+from django.views.generic.list import MultipleObjectMixin
 from django.contrib.auth.views import LoginView
 
-from .mixins import PassRequestMixin, DeleteMessageMixin, LoginAjaxMixin, FormValidationMixin
+from .mixins import (
+    PassRequestMixin,
+    DeleteMessageMixin,
+    LoginAjaxMixin,
+    FormValidationMixin,
+    FormErrorsMixin,
+    FieldValidationMixin,
+    ModalCacheMixin,
+    ConditionalGetMixin,
+    AsyncDataMixin,
+    BulkDeleteMessageMixin,
+    BulkUpdateMixin,
+    BulkCreateMixin,
+    ChoicesSearchMixin,
+    AsyncSingleObjectMixin,
+    AsyncFormMixin,
+    AsyncFormValidationMixin,
+    AsyncDeleteMessageMixin,
+    AsyncLoginAjaxMixin
+)
 
 
-class BSModalLoginView(LoginAjaxMixin, LoginView):
+class BSModalLoginView(LoginAjaxMixin, FormErrorsMixin, LoginView):
     pass
 
 
-class BSModalFormView(PassRequestMixin, generic.FormView):
+class BSModalFormView(PassRequestMixin, FieldValidationMixin, FormErrorsMixin, generic.FormView):
     pass
 
 
-class BSModalCreateView(PassRequestMixin, FormValidationMixin, generic.CreateView):
+class BSModalCreateView(PassRequestMixin, FieldValidationMixin, FormValidationMixin, FormErrorsMixin, generic.CreateView):
     pass
 
 
-class BSModalUpdateView(PassRequestMixin, FormValidationMixin, generic.UpdateView):
+class BSModalUpdateView(PassRequestMixin, FieldValidationMixin, ConditionalGetMixin, ModalCacheMixin, FormValidationMixin, FormErrorsMixin, generic.UpdateView):
     pass
 
 
-class BSModalReadView(generic.DetailView):
+class BSModalReadView(ConditionalGetMixin, ModalCacheMixin, generic.DetailView):
     pass
 
 
-class BSModalDeleteView(DeleteMessageMixin, generic.DeleteView):
+class BSModalDeleteView(ConditionalGetMixin, DeleteMessageMixin, generic.DeleteView):
+    pass
+
+
+class BSModalDataView(AsyncDataMixin, generic.View):
+    pass
+
+
+class BSModalBulkCreateView(PassRequestMixin, BulkCreateMixin, FormErrorsMixin, MultipleObjectMixin, generic.FormView):
+    pass
+
+
+class BSModalBulkUpdateView(PassRequestMixin, BulkUpdateMixin, FormErrorsMixin, MultipleObjectMixin, generic.FormView):
+    pass
+
+
+class BSModalBulkDeleteView(BulkDeleteMessageMixin, generic.ListView):
+    pass
+
+
+class BSModalChoicesSearchView(ChoicesSearchMixin, generic.ListView):
+    pass
+
+
+class BSModalAsyncLoginView(AsyncLoginAjaxMixin, FormErrorsMixin, LoginView):
+    pass
+
+
+class BSModalAsyncFormView(PassRequestMixin, FieldValidationMixin, AsyncFormMixin, FormErrorsMixin, generic.FormView):
+    pass
+
+
+class BSModalAsyncCreateView(PassRequestMixin, FieldValidationMixin, AsyncFormValidationMixin, FormErrorsMixin, generic.CreateView):
+    pass
+
+
+class BSModalAsyncUpdateView(PassRequestMixin, FieldValidationMixin, AsyncFormValidationMixin, FormErrorsMixin, generic.UpdateView):
+    pass
+
+
+class BSModalAsyncReadView(AsyncSingleObjectMixin, generic.DetailView):
+    pass
+
+
+class BSModalAsyncDeleteView(AsyncDeleteMessageMixin, generic.DeleteView):
     pass
@@ -0,0 +1,356 @@
+import collections
+import contextlib
+import enum
+import logging
+import re
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.utils.functional import cached_property
+from django.utils.module_loading import import_string
+
+from .signals import modal_timings
+
+try:
+    from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+except ImportError:
+    # asgiref < 3.6, middleware runs only synchronously
+    iscoroutinefunction = markcoroutinefunction = None
+
+logger = logging.getLogger('bootstrap_modal_forms')
+statsd_logger = logging.getLogger('bootstrap_modal_forms.statsd')
+
+
+class ModalPhase(enum.Enum):
+    """
+    Phase of the modal form's request. The form is opened with GET request, validated with ajax request and
+    saved with non-ajax or one-shot request, or with asynchronous ajax request if asyncUpdate is set. A single
+    field of the form is validated with ajax request containing validateField.
+    """
+
+    OPEN = 'open'
+    VALIDATE = 'validate'
+    VALIDATE_FIELD = 'validate-field'
+    COMMIT = 'commit'
+    ASYNC_COMMIT = 'async-commit'
+
+    @property
+    def is_validation(self):
+        return self in (ModalPhase.VALIDATE, ModalPhase.VALIDATE_FIELD)
+
+
+class ModalTimings:
+    """
+    Durations of the steps of the modal request in milliseconds. Steps are measured only when timing is enabled
+    for the request, see ModalPhaseMiddleware, otherwise measuring is a no-op.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.durations = {}
+        self._starts = {}
+
+    def start(self, name):
+        if self.enabled:
+            self._starts[name] = time.perf_counter()
+
+    def stop(self, name):
+        start = self._starts.pop(name, None)
+        if start is not None:
+            self.durations[name] = self.durations.get(name, 0) + (time.perf_counter() - start) * 1000
+
+    @contextlib.contextmanager
+    def measure(self, name):
+        if name in self._starts:
+            # Nested step is part of the outer step of the same name
+            yield
+            return
+        self.start(name)
+        try:
+            yield
+        finally:
+            self.stop(name)
+
+    def server_timing(self, phase):
+        metrics = ['%s;dur=%.1f' % (name, duration) for name, duration in self.durations.items()]
+        metrics.append('phase;desc="%s"' % phase.value)
+        return ', '.join(metrics)
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+class ModalQueries:
+    """
+    SQL of the queries executed during the modal request, recorded by ModalPhaseMiddleware with
+    connection.execute_wrapper.
+    """
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        self.queries.append(sql)
+        return execute(sql, params, many, context)
+
+    def __len__(self):
+        return len(self.queries)
+
+    def repeated(self, limit):
+        """
+        Return shapes of SELECT queries executed more than limit times, e.g. by a loop fetching related objects.
+        """
+        shapes = collections.Counter(query_shape(sql) for sql in self.queries if sql.lstrip()[:6].upper() == 'SELECT')
+        return {shape: count for shape, count in shapes.items() if count > limit}
+
+
+class ModalRequest:
+    """
+    Modal form state of the request, computed once and shared by all mixins. POST data is parsed only when
+    the phase is needed.
+
+    Requests are recognized as ajax requests by X-Requested-With header, by X-Modal-Phase header, which
+    declares the phase explicitly, or by Accept: application/json header sent by fetch-based clients.
+    """
+
+    def __init__(self, request):
+        self.request = request
+        self.view_class = None
+        self.timings = ModalTimings()
+        self.queries = ModalQueries()
+        self.query_recording = None
+
+    @cached_property
+    def is_ajax(self):
+        meta = self.request.META
+        return is_ajax(meta) or 'HTTP_X_MODAL_PHASE' in meta or accepts_json(meta)
+
+    @cached_property
+    def accepts_json(self):
+        return accepts_json(self.request.META)
+
+    @cached_property
+    def declared_phase(self):
+        try:
+            return ModalPhase(self.request.META.get('HTTP_X_MODAL_PHASE'))
+        except ValueError:
+            return None
+
+    @cached_property
+    def async_update(self):
+        if not self.is_ajax:
+            return False
+        return self.declared_phase is ModalPhase.ASYNC_COMMIT or self.request.POST.get('asyncUpdate') == 'True'
+
+    @cached_property
+    def one_shot(self):
+        if not self.is_ajax:
+            return False
+        return self.declared_phase is ModalPhase.COMMIT or self.request.POST.get('oneShot') == 'True'
+
+    @cached_property
+    def validate_field(self):
+        if not self.is_ajax:
+            return None
+        return self.request.POST.get('validateField') or None
+
+    @cached_property
+    def phase(self):
+        if self.request.method in ('GET', 'HEAD', 'OPTIONS'):
+            return ModalPhase.OPEN
+        if self.validate_field is not None:
+            return ModalPhase.VALIDATE_FIELD
+        if self.async_update:
+            return ModalPhase.ASYNC_COMMIT
+        if not self.is_ajax or self.one_shot:
+            return ModalPhase.COMMIT
+        return ModalPhase.VALIDATE
+
+
+class ModalPhaseMiddleware:
+    """
+    Middleware which attaches ModalRequest to every request as request.modal. Without the middleware mixins
+    attach it on demand, so the middleware is the place to hang per-phase metrics and short-circuits.
+
+    If BOOTSTRAP_MODAL_FORMS_TIMING setting is True, steps of the requests handled by the views of this package
+    are timed and emitted in Server-Timing header, modal_timings signal and callables listed by dotted path in
+    BOOTSTRAP_MODAL_FORMS_TIMING_SINKS setting.
+
+    If BOOTSTRAP_MODAL_FORMS_QUERY_CHECK setting is 'raise' or 'log', queries of these requests are recorded and
+    QueryBudgetExceeded is raised, or a warning is logged, when the view executes more than its max_queries or
+    repeats the same SELECT more than its max_repeated_queries times. Database connections are per thread, so
+    queries are recorded from process_view, which runs in the thread of the view under ASGI as well.
+    """
+
+    sync_capable = True
+    async_capable = markcoroutinefunction is not None
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.timing = getattr(settings, 'BOOTSTRAP_MODAL_FORMS_TIMING', False)
+        self.sinks = [import_string(path) for path in getattr(settings, 'BOOTSTRAP_MODAL_FORMS_TIMING_SINKS', [])]
+        self.query_check = getattr(settings, 'BOOTSTRAP_MODAL_FORMS_QUERY_CHECK', None)
+        self.max_repeated_queries = getattr(settings, 'BOOTSTRAP_MODAL_FORMS_MAX_REPEATED_QUERIES', 3)
+        if self.async_capable and iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_capable and iscoroutinefunction(self):
+            return self.__acall__(request)
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            self.stop_recording_queries(request)
+        self.finish_timings(request, response, start)
+        self.check_queries(request)
+        return response
+
+    async def __acall__(self, request):
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            if get_modal_request(request).query_recording is not None:
+                # Wrappers are removed in the thread of the view, where process_view installed them
+                await sync_to_async(self.stop_recording_queries)(request)
+        self.finish_timings(request, response, start)
+        self.check_queries(request)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        modal = get_modal_request(request)
+        modal.view_class = getattr(view_func, 'view_class', None)
+        if self.timing and is_modal_view(modal.view_class):
+            modal.timings.enabled = True
+        if self.query_check and is_modal_view(modal.view_class):
+            self.start_recording_queries(request)
+
+    def process_template_response(self, request, response):
+        timings = get_modal_request(request).timings
+        if timings.enabled:
+            timings.start('render')
+            response.add_post_render_callback(lambda response: timings.stop('render'))
+        return response
+
+    def finish_timings(self, request, response, start):
+        modal = get_modal_request(request)
+        if not modal.timings.enabled:
+            return
+        modal.timings.durations['total'] = (time.perf_counter() - start) * 1000
+        header = modal.timings.server_timing(modal.phase)
+        if response.has_header('Server-Timing'):
+            header = '%s, %s' % (response.headers['Server-Timing'], header)
+        response.headers['Server-Timing'] = header
+
+        durations = dict(modal.timings.durations)
+        modal_timings.send(sender=modal.view_class, request=request, phase=modal.phase, timings=durations)
+        for sink in self.sinks:
+            sink(request=request, view_class=modal.view_class, phase=modal.phase, timings=durations)
+
+    def start_recording_queries(self, request):
+        modal = get_modal_request(request)
+        stack = contextlib.ExitStack()
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(modal.queries))
+        modal.query_recording = stack
+
+    def stop_recording_queries(self, request):
+        modal = get_modal_request(request)
+        if modal.query_recording is not None:
+            modal.query_recording.close()
+            modal.query_recording = None
+
+    def check_queries(self, request):
+        modal = get_modal_request(request)
+        if not self.query_check or not is_modal_view(modal.view_class):
+            return
+        name = modal.view_class.__name__
+        problems = []
+        max_queries = getattr(modal.view_class, 'max_queries', None)
+        if max_queries is not None and len(modal.queries) > max_queries:
+            problems.append('%s executed %d queries in %s phase, max_queries is %d.' % (
+                name, len(modal.queries), modal.phase.value, max_queries
+            ))
+        max_repeated = getattr(modal.view_class, 'max_repeated_queries', self.max_repeated_queries)
+        for shape, count in modal.queries.repeated(max_repeated).items():
+            problems.append('%s repeated query %d times in %s phase, possible N+1: %s' % (
+                name, count, modal.phase.value, shape
+            ))
+        if not problems:
+            return
+        if self.query_check == 'raise':
+            raise QueryBudgetExceeded('\n'.join(problems))
+        for problem in problems:
+            logger.warning(problem)
+
+
+def get_modal_request(request):
+    if not hasattr(request, 'modal'):
+        request.modal = ModalRequest(request)
+    return request.modal
+
+
+def get_modal_phase(request):
+    return get_modal_request(request).phase
+
+
+def is_ajax(meta):
+    return 'HTTP_X_REQUESTED_WITH' in meta and meta['HTTP_X_REQUESTED_WITH'] == 'XMLHttpRequest'
+
+
+def accepts_json(meta):
+    return 'application/json' in meta.get('HTTP_ACCEPT', '')
+
+
+_modal_views = {}
+
+
+def is_modal_view(view_class):
+    """
+    Return True if view_class is based on a generic view or mixin of this package.
+    """
+    if view_class is None:
+        return False
+    if view_class not in _modal_views:
+        _modal_views[view_class] = any(cls.__module__.startswith('bootstrap_modal_forms.') for cls in view_class.__mro__)
+    return _modal_views[view_class]
+
+
+def query_shape(sql):
+    # Lists of parameters of any length have the same shape
+    return re.sub(r'\((?:\s*%s\s*,)*\s*%s\s*\)', '(...)', ' '.join(sql.split()))
+
+
+def measure_modal_timing(request, name):
+    if request is None:
+        return contextlib.nullcontext()
+    return get_modal_request(request).timings.measure(name)
+
+
+def log_modal_timings(request, view_class, phase, timings, **kwargs):
+    """
+    Timing sink which logs timings of the modal request to bootstrap_modal_forms logger.
+    """
+    logger.info(
+        '%s %s %s: %s',
+        request.method,
+        request.path,
+        phase.value,
+        ', '.join('%s=%.1fms' % (name, duration) for name, duration in timings.items()),
+        extra={'view_class': view_class, 'phase': phase.value, 'timings': timings},
+    )
+
+
+def statsd_modal_timings(request, view_class, phase, timings, **kwargs):
+    """
+    Timing sink which logs timings of the modal request as StatsD timer lines, e.g.
+    bootstrap_modal_forms.BookUpdateView.validate.clean:1.2|ms, to bootstrap_modal_forms.statsd logger.
+    Route the logger to a handler sending its records to StatsD.
+    """
+    prefix = 'bootstrap_modal_forms.%s.%s' % (view_class.__name__ if view_class else 'unknown', phase.value)
+    for name, duration in timings.items():
+        statsd_logger.info('%s.%s:%.1f|ms', prefix, name, duration)
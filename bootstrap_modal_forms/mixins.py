@@ -1,6 +1,42 @@
+import contextvars
+import datetime
+import hashlib
+import json
+import time
+from itertools import islice
+
+from asgiref.sync import sync_to_async
 from django.contrib import messages
 from django.contrib.auth import login as auth_login
-from django.http import HttpResponseRedirect, HttpResponse
+from django.core import signing
+from django.core.cache import DEFAULT_CACHE_ALIAS, caches
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured, PermissionDenied, ValidationError
+from django.core.handlers.asgi import ASGIRequest
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.signals import post_delete, post_save
+from django.forms import modelformset_factory
+from django.http import Http404, HttpResponseRedirect, HttpResponse, JsonResponse, StreamingHttpResponse
+from django.template.context import make_context
+from django.middleware.csrf import CsrfViewMiddleware, get_token
+from django.template.loader import get_template, render_to_string
+from django.utils import timezone
+from django.utils.cache import add_never_cache_headers, get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+from django.utils.translation import get_language, gettext as _
+from django.views import View
+from django.views.generic.edit import BaseUpdateView
+
+# is_ajax and accepts_json are importable from mixins as before
+from .middleware import ModalPhase, accepts_json, get_modal_request, is_ajax, measure_modal_timing  # noqa: F401
+
+try:
+    from django.contrib.auth import alogin
+except ImportError:
+    # Django < 5.0
+    alogin = sync_to_async(auth_login)
+
 
 class PassRequestMixin:
     """
@@ -15,6 +51,10 @@ class PassRequestMixin:
         kwargs['request'] = self.request
         return kwargs
 
+    def get_form(self, form_class=None):
+        with measure_modal_timing(self.request, 'form'):
+            return super().get_form(form_class)
+
 
 class PopRequestMixin:
     """
@@ -31,51 +71,487 @@ class PopRequestMixin:
         super().__init__(*args, **kwargs)
 
 
+class ModalPhaseFormMixin:
+    """
+    Form Mixin which makes validation aware of the phase of the modal form's request. Fields listed in
+    commit_only_fields, e.g. ModelChoiceField with large queryset, are not validated during the ajax validation
+    request, but only when the form is committed. If commit_only_validate_unique is set, unique checks of
+    ModelForm are skipped during the validation request as well. Clean methods and validators are marked with
+    commit_only and validate_only decorators.
+
+    Field validation request validates only the requested field and the fields it depends on, listed in
+    field_dependencies, e.g. {'password2': ['password1']}. Other fields and clean() of the form are skipped.
+
+    Note: Requires the request, see PopRequestMixin.
+    """
+
+    commit_only_fields = ()
+    commit_only_validate_unique = False
+    field_dependencies = {}
+
+    def get_skipped_fields(self):
+        modal = get_modal_request(self.request)
+        if not modal.phase.is_validation:
+            return set()
+        skipped = set(self.commit_only_fields)
+        if modal.phase is ModalPhase.VALIDATE_FIELD:
+            validated = {modal.validate_field, *self.field_dependencies.get(modal.validate_field, ())}
+            skipped.update(name for name in self.fields if name not in validated)
+        return skipped
+
+    @property
+    def modal_phase(self):
+        request = getattr(self, 'request', None)
+        return get_modal_request(request).phase if request is not None else None
+
+    def full_clean(self):
+        phase = self.modal_phase
+        token = _validation_phase.set(phase)
+        fields = self.fields
+        if phase is not None:
+            # Fields are removed only while the form is cleaned, so rerendered form still contains them in order
+            skipped = self.get_skipped_fields()
+            self.fields = {name: field for name, field in fields.items() if name not in skipped}
+        try:
+            with measure_modal_timing(getattr(self, 'request', None), 'clean'):
+                super().full_clean()
+        finally:
+            self.fields = fields
+            _validation_phase.reset(token)
+
+    def _clean_form(self):
+        if self.modal_phase is not ModalPhase.VALIDATE_FIELD:
+            super()._clean_form()
+
+    def validate_unique(self):
+        if self.commit_only_validate_unique and self.modal_phase is not None and self.modal_phase.is_validation:
+            return
+        super().validate_unique()
+
+
 class CreateUpdateAjaxMixin:
     """
     ModelForm Mixin which passes or saves object based on request type.
     """
 
     def save(self, commit=True):
-        isAjaxRequest = is_ajax(self.request.META)
-        asyncUpdate = self.request.POST.get('asyncUpdate') == 'True'
-
-        if not isAjaxRequest or asyncUpdate:
-            return super().save(commit=commit)
-        if isAjaxRequest:
+        # Object is not saved by the validation request
+        if get_modal_request(self.request).phase.is_validation:
             return super().save(commit=False)
+        with measure_modal_timing(self.request, 'save'):
+            return super().save(commit=commit)
+
+
+class AsyncRowMixin:
+    """
+    Generic View Mixin which describes the object changed by an asynchronous request. If row_template_name is set,
+    the table row of the object is rendered as well, so the client can update just that row instead of
+    refreshing the whole table from dataUrl.
+    """
+
+    row_template_name = None
+
+    def get_row_context_data(self):
+        context = {'object': self.object}
+        context_object_name = self.get_context_object_name(self.object)
+        if context_object_name:
+            context[context_object_name] = self.object
+        return context
+
+    def get_row_data(self, operation):
+        data = {'pk': self.object.pk, 'operation': operation}
+        if self.row_template_name and operation != 'delete':
+            data['row'] = render_to_string(self.row_template_name, self.get_row_context_data(), request=self.request)
+        return data
+
+
+class AsyncDataMixin:
+    """
+    Generic View Mixin which returns table rows rendered with row_template_name as JSON under data_key, for
+    asynchronous page updates. The queryset is ordered by the unique keyset_field and consumed with iterator(),
+    so model instances are never held in memory all at once.
+
+    Rows are paginated by keyset if paginate_by is set or the request contains limit parameter. Request parameter
+    after returns rows following the cursor, around returns a window of rows around the object with given pk.
+    The cursor of the next page is returned as next. Invalid after or around parameter raises Http404.
+
+    If stream is set, the response is streamed as rows are rendered. Under ASGI the rows are fetched and rendered
+    in a thread in chunks of chunk_size rows and streamed by an async iterator, since Django would consume a sync
+    iterator completely before sending it.
+    """
+
+    model = None
+    queryset = None
+    row_template_name = None
+    data_key = 'table'
+    keyset_field = 'pk'
+    paginate_by = None
+    max_paginate_by = 1000
+    stream = False
+    chunk_size = 2000
+
+    def get_queryset(self):
+        if self.queryset is not None:
+            return self.queryset.all()
+        if self.model is not None:
+            return self.model._default_manager.all()
+        raise ImproperlyConfigured('%s is missing a QuerySet. Define %s.model or %s.queryset.' % (
+            self.__class__.__name__, self.__class__.__name__, self.__class__.__name__
+        ))
 
+    def get_limit(self):
+        limit = self.request.GET.get('limit')
+        if limit is None:
+            return self.paginate_by
+        try:
+            return max(1, min(int(limit), self.max_paginate_by))
+        except ValueError:
+            return self.paginate_by
 
-class DeleteMessageMixin:
+    def get_keyset_model_field(self, model):
+        field = None
+        for name in self.keyset_field.split('__'):
+            field = model._meta.pk if name == 'pk' else model._meta.get_field(name)
+            model = field.related_model
+        return field
+
+    def get_cursor_value(self, field, name):
+        """
+        Return request parameter name converted by to_python of the model field, None if it's missing.
+        """
+        value = self.request.GET.get(name)
+        if value is None:
+            return None
+        try:
+            return field.to_python(value)
+        except (ValidationError, ValueError, TypeError):
+            raise Http404(_('Invalid %(name)s parameter.') % {'name': name})
+
+    def get_rows(self):
+        """
+        Return iterable of objects on the requested page and the cursor of the next page.
+        """
+        queryset = self.get_queryset().order_by(self.keyset_field)
+        limit = self.get_limit()
+        after = self.get_cursor_value(self.get_keyset_model_field(queryset.model), 'after')
+        around = self.get_cursor_value(queryset.model._meta.pk, 'around')
+
+        if after is not None:
+            queryset = queryset.filter(**{self.keyset_field + '__gt': after})
+        elif around is not None and limit is not None:
+            value = queryset.filter(pk=around).values_list(self.keyset_field, flat=True).first()
+            if value is not None:
+                before = list(queryset.filter(**{self.keyset_field + '__lt': value}).reverse()[:limit // 2])
+                rows = before[::-1] + list(queryset.filter(**{self.keyset_field + '__gte': value})[:limit - len(before)])
+                return rows, self.get_next_cursor(rows, limit)
+
+        if limit is None:
+            return queryset.iterator(chunk_size=self.chunk_size), None
+        rows = list(queryset[:limit])
+        return rows, self.get_next_cursor(rows, limit)
+
+    def get_next_cursor(self, rows, limit):
+        if len(rows) < limit:
+            return None
+        # Keyset field may span relations, take its value with the same lookup the queryset is ordered by
+        value = rows[-1]
+        for attname in self.keyset_field.split('__'):
+            value = value.pk if attname == 'pk' else getattr(value, attname)
+        return value
+
+    def render_rows(self, rows):
+        return render_rows(self.row_template_name, rows, self.request)
+
+    def stream_data(self, rows, cursor):
+        yield '{%s: "' % json.dumps(self.data_key)
+        for row in self.render_rows(rows):
+            # Rows are encoded as parts of a single JSON string
+            yield json.dumps(row)[1:-1]
+        yield '", "next": %s}' % json.dumps(cursor, cls=DjangoJSONEncoder)
+
+    async def astream_data(self, rows, cursor):
+        chunks = iter(self.stream_data(rows, cursor))
+        # Database is queried and rows are rendered in a thread, not in the event loop
+        read = sync_to_async(lambda: list(islice(chunks, self.chunk_size)))
+        while True:
+            parts = await read()
+            if not parts:
+                return
+            yield ''.join(parts)
+
+    def get(self, request, *args, **kwargs):
+        rows, cursor = self.get_rows()
+        if self.stream:
+            if isinstance(request, ASGIRequest):
+                return StreamingHttpResponse(self.astream_data(rows, cursor), content_type='application/json')
+            return StreamingHttpResponse(self.stream_data(rows, cursor), content_type='application/json')
+        return JsonResponse({self.data_key: ''.join(self.render_rows(rows)), 'next': cursor})
+
+
+class DeleteMessageMixin(AsyncRowMixin):
     """
     Generic View Mixin which adds message to BSModalDeleteView and only calls the post method if request
     is not ajax request. In case request is ajax post method calls delete method, which redirects to success url.
+    Asynchronous ajax request deletes the object and returns JSON with its pk, so the client can remove its row.
+
+    Ajax request with delete_token signed by make_delete_token deletes the object without fetching it first, so
+    trigger elements rendered with the token are deleted by a single POST after a confirmation in the client.
     """
 
+    delete_token_max_age = 60 * 60
+
+    def get_delete_token_pk(self):
+        """
+        Return pk of the object signed by delete_token POST parameter, or None if the request has no token. Invalid
+        or expired token, or token signed for another object or user raises PermissionDenied.
+        """
+        token = self.request.POST.get('delete_token')
+        if token is None:
+            return None
+        try:
+            label, pk, user = signing.loads(token, salt=DELETE_TOKEN_SALT, max_age=self.delete_token_max_age)
+        except (signing.BadSignature, ValueError):
+            raise PermissionDenied(_('Invalid or expired delete token.'))
+        model = self.get_queryset().model
+        url_pk = self.kwargs.get(self.pk_url_kwarg)
+        if (label != model._meta.concrete_model._meta.label_lower or user != get_delete_token_user(getattr(self.request, 'user', None))
+                or (url_pk is not None and str(url_pk) != pk)):
+            raise PermissionDenied(_('Invalid or expired delete token.'))
+        return model._meta.pk.to_python(pk)
+
+    def get_signed_delete_queryset(self, pk):
+        return self.get_queryset().filter(pk=pk)
+
+    def signed_delete_response(self, queryset, pk, deleted):
+        """
+        Return JSON of the object deleted by pk, so the client can remove its row. Model.delete isn't called, delete
+        signals are still sent.
+        """
+        if not deleted:
+            raise Http404(_('No %(verbose_name)s found matching the query') % {'verbose_name': queryset.model._meta.verbose_name})
+        invalidate_modal_cache(queryset.model, pk, getattr(self, 'modal_cache_alias', DEFAULT_CACHE_ALIAS))
+        return JsonResponse({'pk': pk, 'operation': 'delete'})
+
+    def delete_signed_object(self, pk):
+        queryset = self.get_signed_delete_queryset(pk)
+        deleted = queryset.delete()[0]
+        return self.signed_delete_response(queryset, pk, deleted)
+
     def post(self, request, *args, **kwargs):
-        if not is_ajax(request.META):
+        modal = get_modal_request(request)
+        pk = self.get_delete_token_pk() if modal.is_ajax else None
+        if pk is not None:
+            return self.delete_signed_object(pk)
+        if not modal.is_ajax:
+            pk = self.kwargs.get(self.pk_url_kwarg)
+            if pk is None:
+                pk = self.get_object().pk
             messages.success(request, self.success_message)
-            return super().post(request, *args, **kwargs)
+            response = super().post(request, *args, **kwargs)
+            invalidate_modal_cache(self.object.__class__, pk, getattr(self, 'modal_cache_alias', DEFAULT_CACHE_ALIAS))
+            return response
+        elif modal.async_update:
+            self.object = self.get_object()
+            data = self.get_row_data('delete')
+            self.object.delete()
+            invalidate_modal_cache(self.object.__class__, data['pk'], getattr(self, 'modal_cache_alias', DEFAULT_CACHE_ALIAS))
+            return JsonResponse(data)
         else:
             self.object = self.get_object()
             return HttpResponseRedirect(self.get_success_url())
 
 
+class ConditionalGetMixin:
+    """
+    Generic View Mixin which answers GET requests for unchanged objects with 304 Not Modified. ETag and
+    Last-Modified headers are computed by get_etag and get_last_modified, by default from last_modified_field
+    of the object. Conditional responses are disabled unless last_modified_field is set. Views overriding these
+    methods instead enable conditional responses with conditional_get.
+
+    The ETag also depends on the user, active language, CSRF cookie and generation of the object used by
+    ModalCacheMixin, since modal html contains the CSRF token and may differ per user. Responses are marked
+    private and no-cache, so browsers revalidate them every time the modal is opened.
+    """
+
+    last_modified_field = None
+    conditional_get = False
+
+    def get_object(self, queryset=None):
+        # Object is already fetched for the conditional headers
+        if queryset is None and getattr(self, 'object', None) is not None:
+            return self.object
+        return super().get_object(queryset)
+
+    def get_last_modified(self):
+        if self.last_modified_field:
+            last_modified = getattr(self.object, self.last_modified_field)
+            if last_modified is not None and not isinstance(last_modified, datetime.datetime):
+                last_modified = datetime.datetime.combine(last_modified, datetime.time())
+            return last_modified
+
+    def get_etag(self):
+        last_modified = self.get_last_modified()
+        if last_modified is None:
+            return None
+        model = self.object.__class__
+        key = ':'.join(str(part) for part in [
+            model._meta.label_lower,
+            self.object.pk,
+            last_modified.isoformat(),
+            get_modal_cache_generation(model, self.object.pk, getattr(self, 'modal_cache_alias', DEFAULT_CACHE_ALIAS)),
+            getattr(self.request.user, 'pk', ''),
+            get_language(),
+            self.request.META.get('CSRF_COOKIE', ''),
+            self.__class__.__qualname__,
+        ])
+        return '"%s"' % hashlib.md5(key.encode()).hexdigest()
+
+    def get(self, request, *args, **kwargs):
+        if not self.conditional_get and self.last_modified_field is None:
+            return super().get(request, *args, **kwargs)
+
+        self.object = self.get_object()
+        etag = self.get_etag()
+        last_modified = self.get_last_modified()
+        if etag is None and last_modified is None:
+            return super().get(request, *args, **kwargs)
+
+        timestamp = None
+        if last_modified is not None:
+            if not timezone.is_aware(last_modified):
+                last_modified = timezone.make_aware(last_modified, datetime.timezone.utc)
+            timestamp = int(last_modified.timestamp())
+
+        response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+        if etag is not None:
+            response.headers.setdefault('ETag', etag)
+        if timestamp is not None:
+            response.headers.setdefault('Last-Modified', http_date(timestamp))
+        patch_vary_headers(response, ['Cookie'])
+        # Revalidate on every opening, Last-Modified alone lets browsers reuse stale modal html heuristically
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+
 class LoginAjaxMixin:
     """
-    Generic View Mixin which authenticates user if request is not ajax request.
+    Generic View Mixin which authenticates user if request is not ajax request. In one-shot mode the
+    user is authenticated on the first ajax request and JSON with the success url is returned.
     """
 
     def form_valid(self, form):
-        if not is_ajax(self.request.META):
+        modal = get_modal_request(self.request)
+
+        if not modal.is_ajax or modal.one_shot:
             auth_login(self.request, form.get_user())
             messages.success(self.request, self.success_message)
+        if modal.one_shot:
+            return JsonResponse({'valid': True, 'success_url': str(self.get_success_url())})
         return HttpResponseRedirect(self.get_success_url())
 
 
-class FormValidationMixin:
+class FieldValidationMixin:
+    """
+    Generic View Mixin which answers the ajax request validating a single field, see ModalPhaseFormMixin, with JSON
+    containing errors of that field only. The template context is never built for the field validation request.
+    """
+
+    def get_field_validation_data(self, form):
+        name = get_modal_request(self.request).validate_field
+        errors = {}
+        if name in form.fields and name in form.errors:
+            errors[name] = {'id': form[name].auto_id, 'messages': list(form.errors[name])}
+        return {'field': name, 'valid': not errors, 'errors': errors}
+
+    def get_field_validation_response(self, form):
+        data = self.get_field_validation_data(form)
+        return mark_form_validity(JsonResponse(data), data['valid'])
+
+    def form_valid(self, form):
+        if get_modal_request(self.request).phase is ModalPhase.VALIDATE_FIELD:
+            return self.get_field_validation_response(form)
+        return super().form_valid(form)
+
+    def form_invalid(self, form):
+        if get_modal_request(self.request).phase is ModalPhase.VALIDATE_FIELD:
+            return self.get_field_validation_response(form)
+        return super().form_invalid(form)
+
+    async def aform_valid(self, form):
+        if get_modal_request(self.request).phase is ModalPhase.VALIDATE_FIELD:
+            return self.get_field_validation_response(form)
+        return await super().aform_valid(form)
+
+
+class FormErrorsMixin:
+    """
+    Generic View Mixin which returns form errors as JSON instead of rendering the template again if ajax request
+    accepts JSON. Errors of every field are returned together with the field's id, so the client can show them
+    next to the field. If skip_validation_context is set, the form rendered again for the ajax validation request
+    gets only the form and the view in its context, see get_validation_context_data.
+
+    Response of the submitted form tells whether the form was valid in X-Modal-Form-Valid header, so the client
+    doesn't have to search the rendered form for errors.
+    """
+
+    skip_validation_context = False
+
+    def get_validation_context_data(self, form):
+        return {'form': form, 'view': self}
+
+    def get_errors_data(self, form):
+        if hasattr(form, 'forms'):
+            return self.get_formset_errors_data(form)
+        errors = {}
+        for name, field_errors in form.errors.items():
+            if name in form.fields:
+                errors[name] = {'id': form[name].auto_id, 'messages': list(field_errors)}
+        return {
+            'valid': False,
+            'errors': errors,
+            'non_field_errors': list(form.non_field_errors()),
+        }
+
+    def get_formset_errors_data(self, formset):
+        # Errors of all forms are returned under field names prefixed by the form's prefix
+        errors = {}
+        non_field_errors = list(formset.non_form_errors())
+        for form in formset.forms:
+            for name, field_errors in form.errors.items():
+                if name in form.fields:
+                    errors[form[name].html_name] = {'id': form[name].auto_id, 'messages': list(field_errors)}
+            non_field_errors += form.non_field_errors()
+        return {
+            'valid': False,
+            'errors': errors,
+            'non_field_errors': non_field_errors,
+        }
+
+    def post(self, request, *args, **kwargs):
+        response = super().post(request, *args, **kwargs)
+        # Response of the invalid form is already marked by form_invalid
+        if response.status_code < 400:
+            mark_form_validity(response, True)
+        return response
+
+    def form_invalid(self, form):
+        modal = get_modal_request(self.request)
+        if modal.is_ajax and modal.accepts_json:
+            response = JsonResponse(self.get_errors_data(form), status=400)
+        elif modal.phase is ModalPhase.VALIDATE and self.skip_validation_context:
+            response = self.render_to_response(self.get_validation_context_data(form))
+        else:
+            response = super().form_invalid(form)
+        return mark_form_validity(response, False)
+
+
+class FormValidationMixin(AsyncRowMixin):
     """
     Generic View Mixin which saves object and redirects to success_url if request is not ajax request. Otherwise response 204 No content is returned.
+    In one-shot mode the object is saved on the first ajax request and JSON describing the saved object is returned.
+    Asynchronous ajax request returns JSON with the rendered table row of the saved object if row_template_name is set.
     """
 
     def get_success_message(self):
@@ -87,19 +563,716 @@ class FormValidationMixin:
             return self.success_url
         return super().get_success_url()
 
+    def get_success_data(self, operation):
+        data = {
+            'valid': True,
+            'success_url': str(self.get_success_url()),
+        }
+        if get_modal_request(self.request).async_update:
+            data.update(self.get_row_data(operation))
+        else:
+            data.update(pk=self.object.pk, operation=operation)
+        return data
+
     def form_valid(self, form):
-        isAjaxRequest = is_ajax(self.request.META)
-        asyncUpdate = self.request.POST.get('asyncUpdate') == 'True'
+        modal = get_modal_request(self.request)
 
-        if isAjaxRequest:
-            if asyncUpdate:
+        if modal.is_ajax:
+            if not modal.phase.is_validation:
+                operation = 'create' if self.object is None else 'update'
                 self.object = form.save()
+                self.invalidate_modal_cache()
+                if modal.one_shot or self.row_template_name:
+                    if not modal.async_update:
+                        # Client redirects to success_url itself, so the message is shown after redirection
+                        messages.success(self.request, self.get_success_message())
+                    return JsonResponse(self.get_success_data(operation))
             return HttpResponse(status=204)
 
         self.object = form.save()
+        self.invalidate_modal_cache()
+        messages.success(self.request, self.get_success_message())
+        return HttpResponseRedirect(self.get_success_url())
+
+    def invalidate_modal_cache(self):
+        if self.object is not None and self.object.pk is not None:
+            invalidate_modal_cache(self.object.__class__, self.object.pk, getattr(self, 'modal_cache_alias', DEFAULT_CACHE_ALIAS))
+
+
+class ModalCacheMixin:
+    """
+    Generic View Mixin which caches the rendered modal html of a single object with Django's cache framework.
+    Caching is disabled unless modal_cache_timeout is set.
+
+    The cache key is built from the model, pk, value of modal_cache_version_field, the user if
+    modal_cache_vary_on_user is set, active language and a generation of the object, which is bumped whenever
+    the object is saved or deleted through FormValidationMixin or DeleteMessageMixin. Before cached html is returned,
+    a single exists() query checks that the object is still in get_queryset(), so querysets scoped per user and 404
+    responses apply to cached html as well. The object is fetched instead if modal_cache_version_field is set or the
+    object is looked up by slug.
+
+    Context variables listed in modal_cache_placeholders differ per request. They are cached as placeholders and
+    filled in with get_modal_cache_placeholder_value on every response.
+    """
+
+    modal_cache_timeout = None
+    modal_cache_alias = DEFAULT_CACHE_ALIAS
+    modal_cache_version_field = None
+    modal_cache_vary_on_user = False
+    modal_cache_placeholders = ['csrf_token']
+
+    def get_modal_cache_pk(self):
+        """
+        Return pk of the url converted like the object's pk, so the key matches the one invalidated after saving.
+        """
+        pk = self.kwargs.get(self.pk_url_kwarg)
+        if pk is None:
+            return None
+        model = self.get_queryset().model
+        try:
+            return model._meta.pk.to_python(pk)
+        except ValidationError:
+            raise Http404(_('No %(verbose_name)s found matching the query') % {'verbose_name': model._meta.verbose_name})
+
+    def get_modal_cache_key(self):
+        model = self.get_queryset().model
+        pk = self.get_modal_cache_pk()
+        version = ''
+        if pk is None or self.modal_cache_version_field:
+            obj = self.object = self.get_object()
+            pk = obj.pk
+            if self.modal_cache_version_field:
+                version = getattr(obj, self.modal_cache_version_field)
+        user = self.request.user.pk if self.modal_cache_vary_on_user else ''
+        key = ':'.join(str(part) for part in [
+            model._meta.label_lower,
+            pk,
+            get_modal_cache_generation(model, pk, self.modal_cache_alias),
+            version,
+            user,
+            get_language(),
+            self.__class__.__qualname__,
+        ])
+        return 'bootstrap_modal_forms:modal:' + hashlib.md5(key.encode()).hexdigest()
+
+    def check_modal_cache_object(self):
+        """
+        Raise Http404 unless the object of the cached html is in get_queryset().
+        """
+        if getattr(self, 'object', None) is not None:
+            return
+        queryset = self.get_queryset()
+        if not queryset.filter(pk=self.get_modal_cache_pk()).exists():
+            raise Http404(_('No %(verbose_name)s found matching the query') % {'verbose_name': queryset.model._meta.verbose_name})
+
+    def get_modal_cache_placeholder_value(self, name):
+        if name == 'csrf_token':
+            return get_token(self.request)
+        raise ImproperlyConfigured(
+            '%s must implement get_modal_cache_placeholder_value() for placeholder %r.' % (self.__class__.__name__, name)
+        )
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        if getattr(self, 'modal_cache_rendering', False):
+            for name in self.modal_cache_placeholders:
+                context[name] = modal_cache_placeholder(name)
+        return context
+
+    def get(self, request, *args, **kwargs):
+        if self.modal_cache_timeout is None:
+            return super().get(request, *args, **kwargs)
+
+        cache = caches[self.modal_cache_alias]
+        key = self.get_modal_cache_key()
+        content = cache.get(key)
+        if content is None:
+            self.modal_cache_rendering = True
+            response = super().get(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+            content = response.render().content.decode(response.charset)
+            cache.set(key, content, self.modal_cache_timeout)
+        else:
+            self.check_modal_cache_object()
+
+        for name in self.modal_cache_placeholders:
+            content = content.replace(modal_cache_placeholder(name), str(self.get_modal_cache_placeholder_value(name)))
+        return HttpResponse(content)
+
+
+class BulkObjectsMixin:
+    """
+    Generic View Mixin which works on the objects selected by the list of pks in pk_list_param request parameter,
+    e.g. ?pk=1&pk=2. Selected objects are fetched in a single query. Selection is read from POST data and falls
+    back to the query string, so the form may post the pks or keep them in its action url.
+    """
+
+    pk_list_param = 'pk'
+    row_template_name = None
+
+    def get_pks(self):
+        return self.request.POST.getlist(self.pk_list_param) or self.request.GET.getlist(self.pk_list_param)
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        try:
+            pks = [queryset.model._meta.pk.to_python(pk) for pk in self.get_pks()]
+        except ValidationError:
+            raise Http404(_('Invalid selection of %(verbose_name_plural)s') % {
+                'verbose_name_plural': queryset.model._meta.verbose_name_plural
+            })
+        return queryset.filter(pk__in=pks)
+
+    def get_rows_data(self, operation):
+        pks = [obj.pk for obj in self.object_list]
+        data = {'pks': pks, 'operation': operation}
+        if self.row_template_name and operation != 'delete':
+            data['rows'] = dict(zip(pks, render_rows(self.row_template_name, self.object_list, self.request)))
+        return data
+
+    def invalidate_modal_cache(self):
+        alias = getattr(self, 'modal_cache_alias', DEFAULT_CACHE_ALIAS)
+        for obj in self.object_list:
+            invalidate_modal_cache(obj.__class__, obj.pk, alias)
+        # bulk_create and bulk_update don't send post_save signals
+        for model in {obj.__class__ for obj in self.object_list}:
+            invalidate_cached_choices(model)
+
+
+class BulkDeleteMessageMixin(BulkObjectsMixin):
+    """
+    Generic View Mixin which deletes all selected objects with a single queryset delete in one transaction.
+    Like DeleteMessageMixin, asynchronous ajax request returns JSON with pks of the deleted objects, so the client
+    can remove their rows, other requests are redirected to success_url.
+    """
+
+    def get_success_url(self):
+        return str(self.success_url)
+
+    def post(self, request, *args, **kwargs):
+        modal = get_modal_request(request)
+        if modal.is_ajax and not modal.async_update:
+            return HttpResponseRedirect(self.get_success_url())
+
+        with transaction.atomic():
+            self.object_list = list(self.get_queryset())
+            data = self.get_rows_data('delete')
+            self.get_queryset().delete()
+        self.invalidate_modal_cache()
+
+        if modal.is_ajax:
+            return JsonResponse(data)
+        messages.success(request, self.success_message)
+        return HttpResponseRedirect(self.get_success_url())
+
+
+class BulkFormValidationMixin(FormValidationMixin):
+    """
+    Generic View Mixin which saves all objects of the valid form or formset with save_objects in one transaction,
+    by default every form of the formset saves its object. Like FormValidationMixin, ajax validation request
+    returns 204 No content, while asynchronous and one-shot requests return JSON with pks and rendered rows of
+    the saved objects.
+    """
+
+    bulk_operation = None
+
+    def get(self, request, *args, **kwargs):
+        self.object_list = self.get_queryset()
+        return super().get(request, *args, **kwargs)
+
+    def post(self, request, *args, **kwargs):
+        self.object_list = self.get_queryset()
+        return super().post(request, *args, **kwargs)
+
+    def save_objects(self, form):
+        if hasattr(form, 'forms'):
+            return form.save()
+        return [form.save()]
+
+    def form_valid(self, form):
+        modal = get_modal_request(self.request)
+
+        if modal.phase.is_validation:
+            return HttpResponse(status=204)
+
+        with measure_modal_timing(self.request, 'save'), transaction.atomic():
+            self.object_list = self.save_objects(form)
+        self.invalidate_modal_cache()
+        if not modal.async_update:
+            messages.success(self.request, self.get_success_message())
+        if modal.is_ajax:
+            data = {'valid': True, 'success_url': str(self.get_success_url())}
+            data.update(self.get_rows_data(self.bulk_operation))
+            return JsonResponse(data)
+        return HttpResponseRedirect(self.get_success_url())
+
+
+class BulkUpdateMixin(BulkObjectsMixin, BulkFormValidationMixin):
+    """
+    Generic View Mixin which applies the valid form to all selected objects and saves them with a single
+    bulk_update. Only the model fields listed in update_fields are updated, or if it's None, the fields selected
+    by the user with checkboxes named update_fields_param. A selected field left empty clears the field of all
+    objects, fields which aren't selected are optional and ignored.
+
+    bulk_update doesn't call save() of the objects nor send the pre_save and post_save signals.
+    """
+
+    bulk_operation = 'update'
+    update_fields = None
+    update_fields_param = 'update_fields'
+
+    def get_selected_fields(self):
+        if self.update_fields is not None:
+            return list(self.update_fields)
+        return self.request.POST.getlist(self.update_fields_param)
+
+    def get_form(self, form_class=None):
+        form = super().get_form(form_class)
+        selected = set(self.get_selected_fields())
+        for name, field in form.fields.items():
+            if name not in selected:
+                field.required = False
+        return form
+
+    def get_update_fields(self, form):
+        opts = self.object_list.model._meta
+        fields = []
+        for name in self.get_selected_fields():
+            if name not in form.fields or name in fields:
+                continue
+            try:
+                field = opts.get_field(name)
+            except FieldDoesNotExist:
+                # Form field which isn't a model field, e.g. a confirmation checkbox
+                continue
+            if not field.many_to_many:
+                fields.append(name)
+        return fields
+
+    def save_objects(self, form):
+        fields = self.get_update_fields(form)
+        objects = list(self.object_list)
+        for obj in objects:
+            for name in fields:
+                setattr(obj, name, form.cleaned_data[name])
+        if fields:
+            self.object_list.model._default_manager.bulk_update(objects, fields)
+        return objects
+
+
+class BulkCreateMixin(BulkObjectsMixin, BulkFormValidationMixin):
+    """
+    Generic View Mixin which shows a model formset of form_class with extra empty forms and creates objects of
+    all filled in forms with a single bulk_create.
+
+    bulk_create doesn't call save() of the objects nor send the pre_save and post_save signals.
+    """
+
+    bulk_operation = 'create'
+    extra = 3
+
+    def get_queryset(self):
+        return self.model._default_manager.none()
+
+    def get_form_class(self):
+        return modelformset_factory(self.model, form=self.form_class, extra=self.extra)
+
+    def get_form(self, form_class=None):
+        if form_class is None:
+            form_class = self.get_form_class()
+        kwargs = self.get_form_kwargs()
+        kwargs.pop('initial', None)
+        # Request of PassRequestMixin is passed to the forms of the formset
+        if 'request' in kwargs:
+            kwargs['form_kwargs'] = {'request': kwargs.pop('request')}
+        return form_class(queryset=self.object_list, **kwargs)
+
+    def save_objects(self, formset):
+        # CreateUpdateAjaxMixin never commits here, objects are created below
+        objects = [form.save(commit=False) for form in formset.forms if form.has_changed()]
+        return self.model._default_manager.bulk_create(objects)
+
+
+class ChoicesSearchMixin:
+    """
+    Generic View Mixin which returns JSON with a page of objects matching the search term in q request parameter,
+    searched by RemoteSelect widgets. Objects are filtered by search_fields with icontains and one object more than
+    paginate_by is fetched to tell whether there is a next page, so the objects aren't counted. Unordered queryset
+    is ordered by pk, so pages don't overlap nor skip objects.
+    """
+
+    search_fields = []
+    paginate_by = 20
+    to_field_name = None
+
+    def get_search_term(self):
+        return self.request.GET.get('q', '').strip()
+
+    def get_page_number(self):
+        try:
+            return max(int(self.request.GET.get('page', 1)), 1)
+        except ValueError:
+            raise Http404(_('Invalid page.'))
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        term = self.get_search_term()
+        if term and self.search_fields:
+            query = Q()
+            for name in self.search_fields:
+                query |= Q(**{'%s__icontains' % name: term})
+            queryset = queryset.filter(query)
+        if not queryset.ordered:
+            # Pages are sliced by offset, which is deterministic only for ordered queryset
+            queryset = queryset.order_by('pk')
+        return queryset
+
+    def label_from_instance(self, obj):
+        return str(obj)
+
+    def value_from_instance(self, obj):
+        return obj.serializable_value(self.to_field_name) if self.to_field_name else obj.pk
+
+    def get(self, request, *args, **kwargs):
+        page = self.get_page_number()
+        start = (page - 1) * self.paginate_by
+        objects = list(self.get_queryset()[start:start + self.paginate_by + 1])
+        return JsonResponse({
+            'results': [
+                {'id': self.value_from_instance(obj), 'text': self.label_from_instance(obj)}
+                for obj in objects[:self.paginate_by]
+            ],
+            'page': page,
+            'more': len(objects) > self.paginate_by,
+        }, encoder=DjangoJSONEncoder)
+
+
+class AsyncSingleObjectMixin:
+    """
+    Generic View Mixin which handles GET requests of single object views in async def handler, so the view runs
+    in the event loop under ASGI. The object is fetched with aget_object, which uses Django's async ORM API.
+    """
+
+    async def aget_object(self, queryset=None):
+        if queryset is None:
+            queryset = self.get_queryset()
+        pk = self.kwargs.get(self.pk_url_kwarg)
+        slug = self.kwargs.get(self.slug_url_kwarg)
+        if pk is not None:
+            queryset = queryset.filter(pk=pk)
+        if slug is not None and (pk is None or self.query_pk_and_slug):
+            queryset = queryset.filter(**{self.get_slug_field(): slug})
+        if pk is None and slug is None:
+            raise AttributeError(
+                'Generic detail view %s must be called with either an object pk or a slug in the URLconf.' % self.__class__.__name__
+            )
+        try:
+            return await queryset.aget()
+        except queryset.model.DoesNotExist:
+            raise Http404(_('No %(verbose_name)s found matching the query') % {'verbose_name': queryset.model._meta.verbose_name})
+
+    async def get(self, request, *args, **kwargs):
+        self.object = await self.aget_object()
+        return self.render_to_response(self.get_context_data(object=self.object))
+
+
+class AsyncFormMixin(AsyncSingleObjectMixin):
+    """
+    Generic View Mixin which handles GET and POST requests of form views in async def handlers, so the view runs
+    in the event loop under ASGI. Update views fetch the object edited by the form with aget_object.
+
+    Form validation may query the database, e.g. unique checks or choices of ModelChoiceField, which is not allowed
+    in the event loop, so the form is validated in a thread. Set sync_form_validation to False for forms which
+    are validated without database queries.
+    """
+
+    sync_form_validation = True
+
+    async def aget_form_object(self):
+        if isinstance(self, BaseUpdateView):
+            return await self.aget_object()
+        return None
+
+    async def avalidate_form(self, form):
+        if self.sync_form_validation:
+            return await sync_to_async(form.is_valid)()
+        return form.is_valid()
+
+    async def aform_valid(self, form):
+        return self.form_valid(form)
+
+    async def get(self, request, *args, **kwargs):
+        self.object = await self.aget_form_object()
+        return self.render_to_response(self.get_context_data())
+
+    async def post(self, request, *args, **kwargs):
+        self.object = await self.aget_form_object()
+        form = self.get_form()
+        if await self.avalidate_form(form):
+            return mark_form_validity(await self.aform_valid(form), True)
+        return mark_form_validity(self.form_invalid(form), False)
+
+    async def put(self, *args, **kwargs):
+        return await self.post(*args, **kwargs)
+
+
+class AsyncFormValidationMixin(AsyncFormMixin, FormValidationMixin):
+    """
+    Generic View Mixin which is the async counterpart of FormValidationMixin. The object is saved with asave.
+    """
+
+    async def asave_form(self, form):
+        # CreateUpdateAjaxMixin never commits here, object is saved below
+        instance = form.save(commit=False)
+        await instance.asave()
+        if instance._meta.many_to_many:
+            await sync_to_async(form.save_m2m)()
+        return instance
+
+    async def aget_success_data(self, operation):
+        if get_modal_request(self.request).async_update and self.row_template_name:
+            # Rendering the row may query the database
+            return await sync_to_async(self.get_success_data)(operation)
+        return self.get_success_data(operation)
+
+    async def ainvalidate_modal_cache(self):
+        if self.object is not None and self.object.pk is not None:
+            await ainvalidate_modal_cache(self.object.__class__, self.object.pk, getattr(self, 'modal_cache_alias', DEFAULT_CACHE_ALIAS))
+
+    async def aform_valid(self, form):
+        modal = get_modal_request(self.request)
+
+        if modal.is_ajax:
+            if not modal.phase.is_validation:
+                operation = 'create' if self.object is None else 'update'
+                self.object = await self.asave_form(form)
+                await self.ainvalidate_modal_cache()
+                if modal.one_shot or self.row_template_name:
+                    if not modal.async_update:
+                        messages.success(self.request, self.get_success_message())
+                    return JsonResponse(await self.aget_success_data(operation))
+            return HttpResponse(status=204)
+
+        self.object = await self.asave_form(form)
+        await self.ainvalidate_modal_cache()
         messages.success(self.request, self.get_success_message())
         return HttpResponseRedirect(self.get_success_url())
 
 
-def is_ajax(meta):
-    return 'HTTP_X_REQUESTED_WITH' in meta and meta['HTTP_X_REQUESTED_WITH'] == 'XMLHttpRequest'
+class AsyncDeleteMessageMixin(AsyncSingleObjectMixin, DeleteMessageMixin):
+    """
+    Generic View Mixin which is the async counterpart of DeleteMessageMixin. The object is deleted with adelete.
+    Objects are deleted by POST requests only, DELETE requests are not allowed, since sync DeletionMixin.delete
+    can't be mixed with async handlers and overriding it is deprecated by DeleteView of Django 4.x.
+    """
+
+    http_method_names = [method for method in View.http_method_names if method != 'delete']
+
+    async def adelete_object(self):
+        success_url = self.get_success_url()
+        pk = self.object.pk
+        await self.object.adelete()
+        await ainvalidate_modal_cache(self.object.__class__, pk, getattr(self, 'modal_cache_alias', DEFAULT_CACHE_ALIAS))
+        return HttpResponseRedirect(success_url)
+
+    async def adelete_signed_object(self, pk):
+        queryset = self.get_signed_delete_queryset(pk)
+        deleted = (await queryset.adelete())[0]
+        return await sync_to_async(self.signed_delete_response)(queryset, pk, deleted)
+
+    async def post(self, request, *args, **kwargs):
+        modal = get_modal_request(request)
+        pk = None
+        if modal.is_ajax and 'delete_token' in request.POST:
+            # Token is checked against request.user, lazy user of AuthenticationMiddleware can't be loaded here
+            pk = await sync_to_async(self.get_delete_token_pk)()
+        if pk is not None:
+            return await self.adelete_signed_object(pk)
+        self.object = await self.aget_object()
+        if not modal.is_ajax:
+            messages.success(request, self.success_message)
+            form = self.get_form()
+            if not form.is_valid():
+                return self.form_invalid(form)
+            return await self.adelete_object()
+        elif modal.async_update:
+            data = self.get_row_data('delete')
+            await self.object.adelete()
+            await ainvalidate_modal_cache(self.object.__class__, data['pk'], getattr(self, 'modal_cache_alias', DEFAULT_CACHE_ALIAS))
+            return JsonResponse(data)
+        else:
+            return HttpResponseRedirect(self.get_success_url())
+
+
+class AsyncLoginAjaxMixin(AsyncFormMixin, LoginAjaxMixin):
+    """
+    Generic View Mixin which is the async counterpart of LoginAjaxMixin. The user is logged in with alogin.
+
+    Decorators of LoginView.dispatch expect a response instead of a coroutine, so the CSRF protection, sensitive
+    POST parameters and never cache headers of LoginView are applied by dispatch of this mixin.
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        request.sensitive_post_parameters = '__ALL__'
+        csrf_middleware = CsrfViewMiddleware(lambda request: None)
+        response = csrf_middleware.process_view(request, None, args, kwargs)
+        if response is not None:
+            return response
+
+        if self.redirect_authenticated_user and await sync_to_async(lambda: request.user.is_authenticated)():
+            redirect_to = self.get_success_url()
+            if redirect_to == request.path:
+                raise ValueError(
+                    "Redirection loop for authenticated user detected. Check that "
+                    "your LOGIN_REDIRECT_URL doesn't point to a login page."
+                )
+            response = HttpResponseRedirect(redirect_to)
+        else:
+            # Skip decorated LoginView.dispatch
+            response = await View.dispatch(self, request, *args, **kwargs)
+
+        if hasattr(response, 'render') and callable(response.render):
+            response.add_post_render_callback(lambda response: csrf_middleware.process_response(request, response))
+        else:
+            response = csrf_middleware.process_response(request, response)
+        add_never_cache_headers(response)
+        return response
+
+    async def aform_valid(self, form):
+        modal = get_modal_request(self.request)
+
+        if not modal.is_ajax or modal.one_shot:
+            await alogin(self.request, form.get_user())
+            messages.success(self.request, self.success_message)
+        if modal.one_shot:
+            return JsonResponse({'valid': True, 'success_url': str(self.get_success_url())})
+        return HttpResponseRedirect(self.get_success_url())
+
+
+# Phase of the request whose form is being cleaned, read by commit_only and validate_only decorators
+_validation_phase = contextvars.ContextVar('bootstrap_modal_forms_validation_phase', default=None)
+
+
+def get_validation_phase():
+    return _validation_phase.get()
+
+
+def mark_form_validity(response, valid):
+    response.setdefault('X-Modal-Form-Valid', 'true' if valid else 'false')
+    return response
+
+
+def render_rows(template_name, rows, request=None):
+    template = get_template(template_name).template
+    context = make_context({}, request)
+    # Context processors run once for all rows
+    with context.bind_template(template):
+        for obj in rows:
+            with context.push(object=obj, **{obj._meta.model_name: obj}):
+                yield template.render(context)
+
+
+DELETE_TOKEN_SALT = 'bootstrap_modal_forms.delete'
+
+
+def get_delete_token_user(user):
+    if user is None or user.pk is None:
+        return None
+    return str(user.pk)
+
+
+def make_delete_token(obj, user=None):
+    """
+    Return token signing pk of obj and the user, which allows the user to delete obj with a single ajax POST to
+    a view with DeleteMessageMixin until delete_token_max_age of the view expires.
+    """
+    return signing.dumps(
+        [obj._meta.concrete_model._meta.label_lower, str(obj.pk), get_delete_token_user(user)], salt=DELETE_TOKEN_SALT
+    )
+
+
+def modal_cache_placeholder(name):
+    return '__bootstrap_modal_forms_%s__' % name
+
+
+def modal_cache_generation_key(model, pk):
+    return 'bootstrap_modal_forms:generation:%s:%s' % (model._meta.label_lower, pk)
+
+
+def get_cache_generation(key, using=DEFAULT_CACHE_ALIAS):
+    cache = caches[using]
+    generation = cache.get(key)
+    if generation is None:
+        # Start from current time, so entries cached before the generation was evicted are never reused
+        cache.add(key, time.time_ns(), None)
+        generation = cache.get(key)
+    return generation
+
+
+def bump_cache_generation(key, using=DEFAULT_CACHE_ALIAS):
+    cache = caches[using]
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), None)
+
+
+async def abump_cache_generation(key, using=DEFAULT_CACHE_ALIAS):
+    cache = caches[using]
+    try:
+        await cache.aincr(key)
+    except ValueError:
+        await cache.aset(key, time.time_ns(), None)
+
+
+def get_modal_cache_generation(model, pk, using=DEFAULT_CACHE_ALIAS):
+    return get_cache_generation(modal_cache_generation_key(model, pk), using)
+
+
+def invalidate_modal_cache(model, pk, using=DEFAULT_CACHE_ALIAS):
+    bump_cache_generation(modal_cache_generation_key(model, pk), using)
+
+
+async def ainvalidate_modal_cache(model, pk, using=DEFAULT_CACHE_ALIAS):
+    await abump_cache_generation(modal_cache_generation_key(model, pk), using)
+
+
+# Cache aliases of the cached choices per model, see register_cached_choices
+_cached_choices_aliases = {}
+
+
+def cached_choices_generation_key(model):
+    return 'bootstrap_modal_forms:choices:generation:%s' % model._meta.concrete_model._meta.label_lower
+
+
+def get_cached_choices_generation(model, using=DEFAULT_CACHE_ALIAS):
+    return get_cache_generation(cached_choices_generation_key(model), using)
+
+
+def register_cached_choices(model, using=DEFAULT_CACHE_ALIAS):
+    """
+    Invalidate choices of model cached in the given cache alias whenever its object is saved or deleted.
+    """
+    label = model._meta.concrete_model._meta.label_lower
+    if not _cached_choices_aliases:
+        post_save.connect(_invalidate_cached_choices_receiver, dispatch_uid='bootstrap_modal_forms:choices')
+        post_delete.connect(_invalidate_cached_choices_receiver, dispatch_uid='bootstrap_modal_forms:choices')
+    _cached_choices_aliases.setdefault(label, set()).add(using)
+
+
+def invalidate_cached_choices(model, using=None):
+    """
+    Invalidate cached choices of model, in all registered cache aliases unless using is given.
+    """
+    if using is None:
+        aliases = _cached_choices_aliases.get(model._meta.concrete_model._meta.label_lower, ())
+    else:
+        aliases = [using]
+    for alias in aliases:
+        bump_cache_generation(cached_choices_generation_key(model), alias)
+
+
+def _invalidate_cached_choices_receiver(sender, **kwargs):
+    if sender._meta.concrete_model._meta.label_lower in _cached_choices_aliases:
+        invalidate_cached_choices(sender)
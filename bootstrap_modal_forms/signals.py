@@ -0,0 +1,5 @@
+from django.dispatch import Signal
+
+# Sent by ModalPhaseMiddleware with the durations of the timed modal request in milliseconds.
+# Arguments: sender (view class), request, phase, timings
+modal_timings = Signal()
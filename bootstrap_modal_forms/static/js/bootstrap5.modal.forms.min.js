@@ -1 +1,89 @@
-const modalFormCallback=function(e){let t=document.querySelector(e.modalID),n=t.querySelector(e.modalContent),o=bootstrap.Modal.getInstance(t);null===o&&(o=new bootstrap.Modal(t,{keyboard:!1})),fetch(e.formURL).then(e=>e.text()).then(e=>{n.innerHTML=e}).then(()=>{o.show();let n=t.querySelector(e.modalForm);n&&(n.setAttribute("action",e.formURL),addEventHandlers(t,n,e))})},addEventHandlers=function(e,t,n){t.addEventListener("submit",e=>{if(!1===n.isDeleteForm)return e.preventDefault(),isFormValid(n,submitForm),!1}),e.addEventListener("hidden.bs.modal",t=>{let o=e.querySelector(n.modalContent);for(;o.lastChild;)o.removeChild(o.lastChild)})},isFormValid=function(e,t){let n=document.querySelector(e.modalID),o=n.querySelector(e.modalForm),r=new Headers;r.append("X-Requested-With","XMLHttpRequest");n.querySelector('button[type="submit"]').disabled=!0,fetch(o.getAttribute("action"),{headers:r,method:o.getAttribute("method"),body:new FormData(o)}).then(e=>e.text()).then(r=>{if(r.includes(e.errorClass)){if(n.querySelector(e.modalContent).innerHTML=r,!(o=n.querySelector(e.modalForm))){console.error("no form present in response");return}o.setAttribute("action",e.formURL),addEventHandlers(n,o,e)}else t(e)})},submitForm=function(e){let t=document.querySelector(e.modalID),n=t.querySelector(e.modalForm);if(e.asyncUpdate){if(validateAsyncSettings(e.asyncSettings)){let o=e.asyncSettings,r=new FormData(n);r.append("asyncUpdate","True"),fetch(n.getAttribute("action"),{method:n.getAttribute("method"),body:r}).then(e=>e.text()).then(r=>{let a=document.body;if(void 0===a){console.error("django-bootstrap-modal-forms: <body> element missing in your html.");return}let s=new DOMParser().parseFromString(o.successMessage,"text/xml");a.insertBefore(s.firstChild,a.firstChild),o.dataUrl?fetch(o.dataUrl).then(e=>e.json()).then(r=>{let a=document.querySelector(o.dataElementId);a&&(a.innerHTML=r[o.dataKey]),o.addModalFormFunction&&o.addModalFormFunction(),o.closeOnSubmit?bootstrap.Modal.getInstance(t).hide():fetch(e.formURL).then(e=>e.text()).then(o=>{if(t.querySelector(e.modalContent).innerHTML=o,!(n=t.querySelector(e.modalForm))){console.error("no form present in response");return}n.setAttribute("action",e.formURL),addEventHandlers(t,n,e)})}):o.closeOnSubmit&&bootstrap.Modal.getInstance(t).hide()})}}else n.submit()},validateAsyncSettings=function(e){var t=[];return e.successMessage||(t.push("successMessage"),console.error("django-bootstrap-modal-forms: 'successMessage' in asyncSettings is missing.")),e.dataUrl||(t.push("dataUrl"),console.error("django-bootstrap-modal-forms: 'dataUrl' in asyncSettings is missing.")),e.dataElementId||(t.push("dataElementId"),console.error("django-bootstrap-modal-forms: 'dataElementId' in asyncSettings is missing.")),e.dataKey||(t.push("dataKey"),console.error("django-bootstrap-modal-forms: 'dataKey' in asyncSettings is missing.")),e.addModalFormFunction||(t.push("addModalFormFunction"),console.error("django-bootstrap-modal-forms: 'addModalFormFunction' in asyncSettings is missing.")),!(t.length>0)},modalForm=function(e,t){let n={modalID:"#modal",modalContent:".modal-content",modalForm:".modal-content form",formURL:null,isDeleteForm:!1,errorClass:"is-invalid",asyncUpdate:!1,asyncSettings:{closeOnSubmit:!1,successMessage:null,dataUrl:null,dataElementId:null,dataKey:null,addModalFormFunction:null},...t};return e.addEventListener("click",()=>{modalFormCallback(n)}),e};
\ No newline at end of file
+/*
+django-bootstrap-modal-forms
+version : 3.0.5
+Copyright (c) 2023 Marcel Rupp
+*/
+(function(r,f){typeof define=="function"&&define.amd?define([],f):typeof module=="object"&&module.exports?module.exports=f():Object.assign(r,f())})(typeof self!="undefined"?self:this,function(){const modalBodyCache=new Map();const modalBodyCacheSize=50;const inFlightBodies=new Map();const fetchModalBody=function(url){let inFlight=inFlightBodies.get(url);if(inFlight){return inFlight.body;}
+let cached=modalBodyCache.get(url);const headers=new Headers();if(cached){headers.append("If-None-Match",cached.etag);}
+let abortController=new AbortController();let body=fetch(url,{headers:headers,signal:abortController.signal}).then(res=>{if(res.status===304&&cached){return cached.body;}
+return res.text().then(body=>{let etag=res.headers.get("ETag");modalBodyCache.delete(url);if(etag){modalBodyCache.set(url,{etag:etag,body:body});if(modalBodyCache.size>modalBodyCacheSize){modalBodyCache.delete(modalBodyCache.keys().next().value);}}
+return body;});}).finally(()=>{if(inFlightBodies.get(url)===inFlight){inFlightBodies.delete(url);}});inFlight={body:body,abortController:abortController};inFlightBodies.set(url,inFlight);return body;};const abortModalBody=function(url){let inFlight=inFlightBodies.get(url);if(inFlight){inFlight.abortController.abort();inFlightBodies.delete(url);}};const prefetchCache=new Map();const prefetchCacheSize=20;const prefetchMaxAge=30000;const prefetchConcurrency=2;let prefetchesInFlight=0;const getPrefetchedBody=function(url){let prefetched=prefetchCache.get(url);if(prefetched&&Date.now()-prefetched.time<prefetchMaxAge){return prefetched.body;}
+prefetchCache.delete(url);return null;};const prefetchModalBody=function(url){if(getPrefetchedBody(url)||prefetchesInFlight>=prefetchConcurrency){return;}
+prefetchesInFlight++;let body=fetchModalBody(url);body.catch(()=>prefetchCache.delete(url)).finally(()=>prefetchesInFlight--);prefetchCache.set(url,{body:body,time:Date.now()});if(prefetchCache.size>prefetchCacheSize){prefetchCache.delete(prefetchCache.keys().next().value);}};const clearPrefetchCache=function(){prefetchCache.clear();};class ModalController{constructor(modal){this.modal=modal;this.settings=null;this.hooks={load:[],hidden:[],destroy:[]};this.abortController=new AbortController();this.formAbortController=null;this.loadingURL=null;this.requestId=0;this.submitting=false;this.fieldValidations=new Map();modal.addEventListener('hidden.bs.modal',()=>this.hidden(),{signal:this.abortController.signal});}
+on(name,callback){this.hooks[name].push(callback);return this;}
+trigger(name,...args){this.hooks[name].forEach(callback=>callback(...args));}
+startRequest(url){if(this.loadingURL!==null&&this.loadingURL!==url){abortModalBody(this.loadingURL);}
+this.loadingURL=url;return++this.requestId;}
+finishRequest(requestId){if(requestId!==this.requestId){return false;}
+this.loadingURL=null;return true;}
+bindForm(form,settings){this.unbindForm();this.settings=settings;this.submitting=false;this.formAbortController=new AbortController();form.addEventListener('submit',(event)=>{if(this.submitting){event.preventDefault();return false;}
+this.submitting=true;this.cancelFieldValidations();if(settings.isDeleteForm===false){event.preventDefault();isFormValid(settings,submitForm);return false;}else if(settings.asyncUpdate){event.preventDefault();submitForm(settings);return false;}},{signal:this.formAbortController.signal});if(settings.validateOnBlur&&settings.isDeleteForm===false){form.addEventListener('focusout',(event)=>{let field=event.target;if(field.name&&field.form===form&&!this.submitting){this.scheduleFieldValidation(form,settings,field.name);}},{signal:this.formAbortController.signal});}
+bindRemoteSelects(form,this.formAbortController.signal);this.trigger('load',form,settings);}
+scheduleFieldValidation(form,settings,name){this.cancelFieldValidation(name);let validation={abortController:new AbortController(),timer:null};validation.timer=setTimeout(()=>{validateField(form,settings,name,validation.abortController.signal).finally(()=>{if(this.fieldValidations.get(name)===validation){this.fieldValidations.delete(name);}});},settings.validateDelay);this.fieldValidations.set(name,validation);}
+cancelFieldValidation(name){let validation=this.fieldValidations.get(name);if(validation){clearTimeout(validation.timer);validation.abortController.abort();this.fieldValidations.delete(name);}}
+cancelFieldValidations(){Array.from(this.fieldValidations.keys()).forEach(name=>this.cancelFieldValidation(name));}
+unbindForm(){this.cancelFieldValidations();if(this.formAbortController){this.formAbortController.abort();this.formAbortController=null;}}
+hidden(){this.unbindForm();this.submitting=false;if(this.settings){let content=this.modal.querySelector(this.settings.modalContent);while(content.lastChild){content.removeChild(content.lastChild);}}
+this.trigger('hidden',this.settings);}
+destroy(){this.unbindForm();this.abortController.abort();modalControllers.delete(this.modal);this.trigger('destroy');}}
+const modalControllers=new WeakMap();const getModalController=function(modal){let controller=modalControllers.get(modal);if(!controller){controller=new ModalController(modal);modalControllers.set(modal,controller);}
+return controller;};const modalFormCallback=function(settings){if(settings.deleteToken){signedDelete(settings);return;}
+let modal=document.querySelector(settings.modalID);let content=modal.querySelector(settings.modalContent);let controller=getModalController(modal);controller.unbindForm();controller.settings=settings;let requestId=controller.startRequest(settings.formURL);let started=performance.now();let modalInstance=bootstrap.Modal.getInstance(modal);if(modalInstance===null){modalInstance=new bootstrap.Modal(modal,{keyboard:false})}
+(getPrefetchedBody(settings.formURL)||fetchModalBody(settings.formURL)).then(data=>{if(!controller.finishRequest(requestId)){return;}
+let fetched=performance.now();content.innerHTML=data;modalInstance.show();let form=modal.querySelector(settings.modalForm);if(form){form.setAttribute("action",settings.formURL);addEventHandlers(modal,form,settings)}
+reportTimings(settings,"open",{fetch:fetched-started,insert:performance.now()-fetched});}).catch(error=>{if(error.name!=="AbortError"){controller.finishRequest(requestId);console.error("django-bootstrap-modal-forms: loading of "+settings.formURL+" failed.",error);}});};const addEventHandlers=function(modal,form,settings){getModalController(modal).bindForm(form,settings);};const isFormValid=function(settings,callback){let modal=document.querySelector(settings.modalID);let form=modal.querySelector(settings.modalForm);const headers=new Headers();headers.append('X-Requested-With','XMLHttpRequest');if(settings.jsonErrors){headers.append('Accept','application/json');}
+let formData=new FormData(form);if(settings.oneShot){if(settings.asyncUpdate){if(!validateAsyncSettings(settings.asyncSettings,settings.delegated)){submitFailed(settings);return;}
+formData.append("asyncUpdate","True");}
+formData.append("oneShot","True");}
+let phase=!settings.oneShot?'validate':settings.asyncUpdate?'async-commit':'commit';headers.append('X-Modal-Phase',phase);let btnSubmit=modal.querySelector('button[type="submit"]');btnSubmit.disabled=true;let timings={};let started=performance.now();let valid=null;fetch(form.getAttribute("action"),{headers:headers,method:form.getAttribute("method"),body:formData,}).then(res=>{timings.fetch=performance.now()-started;let contentType=res.headers.get("Content-Type")||"";if(contentType.includes("application/json")){return res.json().then(data=>{timings.parse=performance.now()-started-timings.fetch;if(data.valid===false){let inserting=performance.now();showFormErrors(form,settings,data);timings.insert=performance.now()-inserting;}else{oneShotSuccess(settings,data);}
+reportTimings(settings,phase,timings);return null;});}
+valid=res.headers.get("X-Modal-Form-Valid");return res.text();}).then(data=>{if(data===null){return;}
+timings.parse=performance.now()-started-timings.fetch;if(valid===null?data.includes(settings.errorClass):valid==="false"){let inserting=performance.now();modal.querySelector(settings.modalContent).innerHTML=data;form=modal.querySelector(settings.modalForm);if(!form){console.error('no form present in response')
+return;}
+form.setAttribute("action",settings.formURL);addEventHandlers(modal,form,settings)
+timings.insert=performance.now()-inserting;reportTimings(settings,phase,timings);}else{reportTimings(settings,phase,timings);callback(settings);}}).catch(error=>{console.error("django-bootstrap-modal-forms: submitting of the form failed.",error);submitFailed(settings);});};const submitFailed=function(settings){let modal=document.querySelector(settings.modalID);getModalController(modal).submitting=false;let btnSubmit=modal.querySelector('button[type="submit"]');if(btnSubmit){btnSubmit.disabled=false;}};const createErrorElement=function(className,messages,name){let errorElement=document.createElement("div");errorElement.className=className;errorElement.setAttribute("data-modal-form-error",name||"");messages.forEach(message=>{let p=document.createElement("p");p.className="help-block";p.textContent=message;errorElement.appendChild(p);});return errorElement;};const showFieldErrors=function(form,settings,name,error){let errorClass=settings.errorClass.replace(/^\./,"");let field=(error&&error.id&&form.querySelector("#"+CSS.escape(error.id)))||form.querySelector(`[name="${CSS.escape(name)}"]`);form.querySelectorAll(`[data-modal-form-error="${CSS.escape(name)}"]`).forEach(element=>element.remove());if(!field){return;}
+field.classList.toggle(errorClass,Boolean(error));if(error){field.insertAdjacentElement("afterend",createErrorElement("invalid-feedback d-block",error.messages,name));}};const showFormErrors=function(form,settings,data){let errorClass=settings.errorClass.replace(/^\./,"");form.querySelectorAll("[data-modal-form-error]").forEach(element=>element.remove());form.querySelectorAll("."+errorClass).forEach(element=>element.classList.remove(errorClass));Object.keys(data.errors).forEach(name=>showFieldErrors(form,settings,name,data.errors[name]));if(data.non_field_errors.length>0){let container=form.querySelector(".modal-body")||form;container.prepend(createErrorElement(errorClass+" d-block mb-2",data.non_field_errors));}
+submitFailed(settings);};const validateField=function(form,settings,name,signal){const headers=new Headers();headers.append('X-Requested-With','XMLHttpRequest');headers.append('X-Modal-Phase','validate-field');headers.append('Accept','application/json');let formData=new FormData(form);formData.append("validateField",name);return fetch(form.getAttribute("action"),{headers:headers,method:form.getAttribute("method"),body:formData,signal:signal}).then(res=>res.json()).then(data=>{if(data.field===name){showFieldErrors(form,settings,name,data.errors[name]);}}).catch(error=>{if(error.name!=="AbortError"){console.error("django-bootstrap-modal-forms: validation of "+name+" failed.",error);}});};const bindRemoteSelects=function(form,signal){form.querySelectorAll("select[data-remote-url]").forEach(select=>bindRemoteSelect(select,signal));};const bindRemoteSelect=function(select,signal){let search=document.createElement("input");search.type="search";search.className="form-control form-control-sm mb-1";search.setAttribute("aria-controls",select.id);let more=document.createElement("button");more.type="button";more.className="btn btn-link btn-sm px-0";more.textContent=select.dataset.remoteMoreLabel;more.hidden=true;select.insertAdjacentElement("beforebegin",search);select.insertAdjacentElement("afterend",more);let minLength=parseInt(select.dataset.remoteMinLength,10)||0;let state={term:"",page:0,timer:null,abortController:null};const cancel=function(){clearTimeout(state.timer);if(state.abortController){state.abortController.abort();state.abortController=null;}};const load=function(page){cancel();state.abortController=new AbortController();let url=new URL(select.dataset.remoteUrl,window.location.href);url.searchParams.set("q",state.term);url.searchParams.set("page",page);fetch(url,{headers:{"X-Requested-With":"XMLHttpRequest","Accept":"application/json"},signal:state.abortController.signal}).then(res=>res.json()).then(data=>{if(page===1){Array.from(select.options).forEach(option=>{if(!option.selected&&option.value!==""){option.remove();}});}
+data.results.forEach(result=>{let value=String(result.id);if(!Array.from(select.options).some(option=>option.value===value)){select.add(new Option(result.text,value));}});state.page=page;more.hidden=!data.more;}).catch(error=>{if(error.name!=="AbortError"){console.error("django-bootstrap-modal-forms: search of "+select.name+" failed.",error);}});};search.addEventListener("input",()=>{cancel();state.term=search.value.trim();if(state.term.length<minLength){more.hidden=true;return;}
+state.timer=setTimeout(()=>load(1),300);},{signal:signal});more.addEventListener("click",()=>load(state.page+1),{signal:signal});signal.addEventListener("abort",()=>{cancel();search.remove();more.remove();});};const reportTimings=function(settings,phase,timings){if(!settings.timingEndpoint){return;}
+Object.keys(timings).forEach(name=>timings[name]=Math.round(timings[name]*10)/10);let data=JSON.stringify({url:settings.formURL,phase:phase,timings:timings});if(!navigator.sendBeacon||!navigator.sendBeacon(settings.timingEndpoint,new Blob([data],{type:"application/json"}))){fetch(settings.timingEndpoint,{method:"POST",body:data,headers:{"Content-Type":"application/json"},keepalive:true}).catch(()=>{});}};const oneShotSuccess=function(settings,data){if(settings.asyncUpdate){asyncUpdateSuccess(settings,data);}else{window.location.assign(data.success_url);}};const submitForm=function(settings){let modal=document.querySelector(settings.modalID);let form=modal.querySelector(settings.modalForm);if(!settings.asyncUpdate){form.submit();}else{let asyncSettingsValid=validateAsyncSettings(settings.asyncSettings,settings.delegated);if(!asyncSettingsValid){submitFailed(settings);}else{const headers=new Headers();headers.append('X-Requested-With','XMLHttpRequest');headers.append('X-Modal-Phase','async-commit');let formData=new FormData(form);formData.append("asyncUpdate","True");fetch(form.getAttribute("action"),{headers:headers,method:form.getAttribute("method"),body:formData,}).then(res=>{let contentType=res.headers.get("Content-Type")||"";if(contentType.includes("application/json")){return res.json();}
+return null;}).then(data=>{asyncUpdateSuccess(settings,data);}).catch(error=>{console.error("django-bootstrap-modal-forms: submitting of the form failed.",error);submitFailed(settings);});}}};const getCsrfToken=function(){let input=document.querySelector("input[name=csrfmiddlewaretoken]");if(input){return input.value;}
+let cookie=document.cookie.split(";").map(c=>c.trim()).find(c=>c.startsWith("csrftoken="));return cookie?decodeURIComponent(cookie.slice("csrftoken=".length)):"";};const signedDelete=function(settings){let confirmed=settings.confirmDelete?settings.confirmDelete(settings):window.confirm(settings.confirmMessage);Promise.resolve(confirmed).then(confirmed=>{if(!confirmed){return;}
+const headers=new Headers();headers.append('X-Requested-With','XMLHttpRequest');let formData=new FormData();formData.append("csrfmiddlewaretoken",getCsrfToken());formData.append("delete_token",settings.deleteToken);return fetch(settings.formURL,{headers:headers,method:"POST",body:formData,}).then(res=>{if(!res.ok){throw new Error("Delete failed with status "+res.status);}
+return res.json();}).then(data=>{let asyncSettings=settings.asyncSettings;clearPrefetchCache();if(asyncSettings.successMessage){let doc=new DOMParser().parseFromString(asyncSettings.successMessage,"text/xml");document.body.insertBefore(doc.firstChild,document.body.firstChild);}
+if(updateRow(asyncSettings,data)){return;}
+if(asyncSettings.dataUrl){return fetch(getDataUrl(asyncSettings,data)).then(res=>res.json()).then(data=>{document.querySelector(asyncSettings.dataElementId).innerHTML=data[asyncSettings.dataKey];});}
+window.location.reload();});}).catch(error=>{console.error("django-bootstrap-modal-forms: deleting of "+settings.formURL+" failed.",error);});};const updateRow=function(asyncSettings,data){let dataElement=document.querySelector(asyncSettings.dataElementId);if(!data||!data.operation||!dataElement){return false;}
+if(Array.isArray(data.pks)){let rows=data.rows||{};return data.pks.every(pk=>updateRow(asyncSettings,{pk:pk,operation:data.operation,row:rows[pk]}));}
+let row=dataElement.querySelector(`[data-pk="${CSS.escape(String(data.pk))}"]`);if(data.operation==="delete"){if(row){row.remove();}
+return true;}
+if(!data.row){return false;}
+let template=document.createElement("template");template.innerHTML=data.row.trim();let newRow=template.content.firstElementChild;if(row){row.replaceWith(newRow);}else if(data.operation==="create"){(dataElement.querySelector("tbody")||dataElement).appendChild(newRow);}else{return false;}
+return true;};const getDataUrl=function(asyncSettings,data){if(!asyncSettings.dataWindow){return asyncSettings.dataUrl;}
+let url=new URL(asyncSettings.dataUrl,window.location.href);url.searchParams.set("limit",asyncSettings.dataWindow);if(data&&data.pk!==undefined&&data.operation!=="delete"){url.searchParams.set("around",data.pk);}
+return url.toString();};const asyncUpdateSuccess=function(settings,data){let modal=document.querySelector(settings.modalID);let asyncSettings=settings.asyncSettings;let body=document.body;if(body===undefined){console.error("django-bootstrap-modal-forms: <body> element missing in your html.");return;}
+let doc=new DOMParser().parseFromString(asyncSettings.successMessage,"text/xml");body.insertBefore(doc.firstChild,body.firstChild);clearPrefetchCache();const pageUpdated=function(){if(asyncSettings.addModalFormFunction){asyncSettings.addModalFormFunction();}
+if(asyncSettings.closeOnSubmit||(data&&data.operation==="delete")){bootstrap.Modal.getInstance(modal).hide();}else{fetchModalBody(settings.formURL).then(data=>{let content=modal.querySelector(settings.modalContent);content.innerHTML=data;let form=modal.querySelector(settings.modalForm);if(!form){console.error('no form present in response')
+return;}
+form.setAttribute("action",settings.formURL);addEventHandlers(modal,form,settings)});}};if(updateRow(asyncSettings,data)){pageUpdated();}else if(asyncSettings.dataUrl){fetch(getDataUrl(asyncSettings,data)).then(res=>res.json()).then(data=>{let dataElement=document.querySelector(asyncSettings.dataElementId);if(dataElement){dataElement.innerHTML=data[asyncSettings.dataKey];}
+pageUpdated();});}else if(asyncSettings.closeOnSubmit){bootstrap.Modal.getInstance(modal).hide();}};const validateAsyncSettings=function(settings,delegated){var missingSettings=[];if(!settings.successMessage){missingSettings.push("successMessage");console.error("django-bootstrap-modal-forms: 'successMessage' in asyncSettings is missing.");}
+if(!settings.dataUrl){missingSettings.push("dataUrl");console.error("django-bootstrap-modal-forms: 'dataUrl' in asyncSettings is missing.");}
+if(!settings.dataElementId){missingSettings.push("dataElementId");console.error("django-bootstrap-modal-forms: 'dataElementId' in asyncSettings is missing.");}
+if(!settings.dataKey){missingSettings.push("dataKey");console.error("django-bootstrap-modal-forms: 'dataKey' in asyncSettings is missing.");}
+if(!settings.addModalFormFunction&&!delegated){missingSettings.push("addModalFormFunction");console.error("django-bootstrap-modal-forms: 'addModalFormFunction' in asyncSettings is missing.");}
+if(missingSettings.length>0){return false;}
+return true;};const modalFormDefaults={modalID:"#modal",modalContent:".modal-content",modalForm:".modal-content form",formURL:null,isDeleteForm:false,errorClass:"is-invalid",jsonErrors:false,oneShot:false,prefetch:false,prefetchDelay:100,selection:null,validateOnBlur:false,validateDelay:300,timingEndpoint:null,deleteToken:null,confirmMessage:"Are you sure you want to delete this?",confirmDelete:null,asyncUpdate:false,asyncSettings:{closeOnSubmit:false,successMessage:null,dataUrl:null,dataElementId:null,dataKey:null,dataWindow:null,addModalFormFunction:null}};const getSelectionSettings=function(settings){if(!settings.selection){return settings;}
+let url=new URL(settings.formURL,window.location.href);url.searchParams.delete("pk");document.querySelectorAll(settings.selection).forEach(input=>url.searchParams.append("pk",input.value));return{...settings,formURL:url.toString()};};const modalForm=function(elem,options){let settings={...modalFormDefaults,...options}
+elem.addEventListener('click',()=>{modalFormCallback(getSelectionSettings(settings));})
+if(settings.prefetch&&!settings.selection&&!settings.deleteToken){let timer=null;const schedulePrefetch=()=>{clearTimeout(timer);timer=setTimeout(()=>prefetchModalBody(settings.formURL),settings.prefetchDelay);};elem.addEventListener('mouseenter',schedulePrefetch);elem.addEventListener('focus',schedulePrefetch);elem.addEventListener('mouseleave',()=>clearTimeout(timer));elem.addEventListener('pointerdown',()=>{clearTimeout(timer);prefetchModalBody(settings.formURL);});}
+return elem;}
+const getTriggerSettings=function(elem,settings){let data=elem.dataset;let triggerSettings={...settings};if(data.formUrl){triggerSettings.formURL=data.formUrl;}
+if(data.modalId){triggerSettings.modalID=data.modalId;}
+if(data.selection){triggerSettings.selection=data.selection;}
+if(data.deleteToken){triggerSettings.deleteToken=data.deleteToken;}
+if(data.confirm){triggerSettings.confirmMessage=data.confirm;}
+["isDeleteForm","asyncUpdate","oneShot","jsonErrors","validateOnBlur"].forEach(name=>{if(data[name]!==undefined){triggerSettings[name]=data[name]==="true";}});return triggerSettings;};const modalFormDelegate=function(container,selector,options){let settings={...modalFormDefaults,...options,delegated:true};const findTrigger=(event)=>{let elem=event.target.closest(selector);return elem&&container.contains(elem)?elem:null;};container.addEventListener('click',(event)=>{let elem=findTrigger(event);if(elem){modalFormCallback(getSelectionSettings(getTriggerSettings(elem,settings)));}});if(settings.prefetch&&!settings.selection){let timer=null;let hovered=null;const prefetchTrigger=(elem)=>{let triggerSettings=getTriggerSettings(elem,settings);if(!triggerSettings.deleteToken){prefetchModalBody(triggerSettings.formURL);}};const schedulePrefetch=(event)=>{let elem=findTrigger(event);if(elem===hovered){return;}
+hovered=elem;clearTimeout(timer);if(elem){timer=setTimeout(()=>prefetchTrigger(elem),settings.prefetchDelay);}};container.addEventListener('mouseover',schedulePrefetch);container.addEventListener('focusin',schedulePrefetch);container.addEventListener('pointerdown',(event)=>{let elem=findTrigger(event);if(elem){clearTimeout(timer);prefetchTrigger(elem);}});}
+return container;};
+return{modalForm:modalForm,modalFormDelegate:modalFormDelegate,getModalController:getModalController}});
+//# sourceMappingURL=bootstrap5.modal.forms.min.js.map
@@ -7,64 +7,399 @@ https://github.com/trco/django-bootstrap-modal-forms
 
 (function ($) {
 
+    // Modal bodies received with ETag, revalidated with If-None-Match on the next opening
+    var modalBodyCache = {};
+    var modalBodyCacheSize = 50;
+
+    // Requests of modal bodies in flight, concurrent requests of the same url share a single request
+    var inFlightBodies = {};
+
+    // Fetch modal body from url, reusing the cached body if server answers 304 Not Modified
+    var fetchModalBody = function (url) {
+        if (inFlightBodies[url]) {
+            return inFlightBodies[url].body;
+        }
+
+        var cached = modalBodyCache[url];
+        var xhr = $.ajax({
+            type: "GET",
+            url: url,
+            dataType: "html",
+            headers: cached ? {"If-None-Match": cached.etag} : {}
+        });
+        var inFlight = {xhr: xhr};
+        inFlight.body = xhr.then(function (response, status, xhr) {
+            if (xhr.status === 304 && cached) {
+                return cached.body;
+            }
+            var etag = xhr.getResponseHeader("ETag");
+            delete modalBodyCache[url];
+            if (etag) {
+                modalBodyCache[url] = {etag: etag, body: response};
+                var urls = Object.keys(modalBodyCache);
+                if (urls.length > modalBodyCacheSize) {
+                    // Evict the oldest body
+                    delete modalBodyCache[urls[0]];
+                }
+            }
+            return response;
+        }).always(function () {
+            if (inFlightBodies[url] === inFlight) {
+                delete inFlightBodies[url];
+            }
+        });
+        inFlightBodies[url] = inFlight;
+        return inFlight.body;
+    };
+
+    // Abort request of the modal body which is not needed anymore
+    var abortModalBody = function (url) {
+        if (inFlightBodies[url]) {
+            inFlightBodies[url].xhr.abort();
+            delete inFlightBodies[url];
+        }
+    };
+
+    // Modal bodies prefetched on user intent, shared by all trigger elements with the same formURL
+    var prefetchCache = {};
+    var prefetchCacheSize = 20;
+    var prefetchMaxAge = 30000;
+    var prefetchConcurrency = 2;
+    var prefetchesInFlight = 0;
+
+    var getPrefetchedBody = function (url) {
+        var prefetched = prefetchCache[url];
+        if (prefetched && $.now() - prefetched.time < prefetchMaxAge) {
+            return prefetched.body;
+        }
+        delete prefetchCache[url];
+        return null;
+    };
+
+    // Warm prefetchCache with the modal body of url, unless too many prefetches are in flight
+    var prefetchModalBody = function (url) {
+        if (getPrefetchedBody(url) || prefetchesInFlight >= prefetchConcurrency) {
+            return;
+        }
+
+        prefetchesInFlight++;
+        var body = fetchModalBody(url);
+        body.fail(function () {
+            delete prefetchCache[url];
+        }).always(function () {
+            prefetchesInFlight--;
+        });
+        prefetchCache[url] = {body: body, time: $.now()};
+        var urls = Object.keys(prefetchCache);
+        if (urls.length > prefetchCacheSize) {
+            // Evict the oldest body
+            delete prefetchCache[urls[0]];
+        }
+    };
+
+    // Prefetched bodies may be outdated after the form was submitted
+    var clearPrefetchCache = function () {
+        prefetchCache = {};
+    };
+
+    // Load modal body from formURL to the modalContent element
+    // Request of the previously opened url is aborted, responses of requests which are not current anymore are ignored
+    var loadModalBody = function (settings, callback) {
+        var modal = $(settings.modalID);
+        var loading = modal.data("modalFormLoading");
+        if (loading && loading.url !== settings.formURL) {
+            abortModalBody(loading.url);
+        }
+        var current = {url: settings.formURL};
+        modal.data("modalFormLoading", current);
+
+        (getPrefetchedBody(settings.formURL) || fetchModalBody(settings.formURL)).done(function (body) {
+            // Another modal form was opened in the meantime
+            if (modal.data("modalFormLoading") !== current) {
+                return;
+            }
+            modal.removeData("modalFormLoading");
+            var fetched = now();
+            modal.find(settings.modalContent).html(body);
+            callback(fetched);
+        });
+    };
+
     // Open modal & load the form at formURL to the modalContent element
     var modalForm = function (settings) {
-        $(settings.modalID).find(settings.modalContent).load(settings.formURL, function () {
+        if (settings.deleteToken) {
+            signedDelete(settings);
+            return;
+        }
+        var started = now();
+        loadModalBody(settings, function (fetched) {
             $(settings.modalID).modal("show");
             $(settings.modalForm).attr("action", settings.formURL);
             addEventHandlers(settings);
+            reportTimings(settings, "open", {fetch: fetched - started, insert: now() - fetched});
         });
     };
 
+    // Namespaced handlers are removed before they are added again, so they don't pile up on the shared modal
     var addEventHandlers = function (settings) {
-        $(settings.modalForm).on("submit", function (event) {
+        $(settings.modalForm).off("submit.modalForm").on("submit.modalForm", function (event) {
+            if (event.originalEvent !== undefined) {
+                // Ignore repeated submits until the response of the first one is handled
+                if ($(this).data("modalFormSubmitting")) {
+                    event.preventDefault();
+                    return false;
+                }
+                $(this).data("modalFormSubmitting", true);
+            }
+
             if (event.originalEvent !== undefined && settings.isDeleteForm === false) {
                 event.preventDefault();
                 isFormValid(settings, submitForm);
                 return false;
+            } else if (event.originalEvent !== undefined && settings.asyncUpdate) {
+                // Delete object without page redirection
+                event.preventDefault();
+                submitForm(settings);
+                return false;
             }
         });
+        bindRemoteSelects(settings);
         // Modal close handler
-        $(settings.modalID).on("hidden.bs.modal", function (event) {
+        $(settings.modalID).off("hidden.bs.modal.modalForm").on("hidden.bs.modal.modalForm", function (event) {
             $(settings.modalForm).remove();
         });
     };
 
+    // Search choices of RemoteSelect widgets at their data-remote-url, see ChoicesSearchMixin
+    var bindRemoteSelects = function (settings) {
+        var form = $(settings.modalForm);
+        // Remove search inputs added when the form was bound before
+        form.find("[data-modal-form-remote]").remove();
+        form.find("select[data-remote-url]").each(function () {
+            bindRemoteSelect($(this));
+        });
+    };
+
+    var bindRemoteSelect = function (select) {
+        var search = $("<input type='search' class='form-control form-control-sm mb-1' data-modal-form-remote>");
+        var more = $("<button type='button' class='btn btn-link btn-sm px-0' data-modal-form-remote></button>");
+        more.text(select.data("remoteMoreLabel")).hide();
+        select.before(search).after(more);
+
+        var minLength = parseInt(select.data("remoteMinLength"), 10) || 0;
+        var state = {term: "", page: 0, timer: null, xhr: null};
+
+        var cancel = function () {
+            clearTimeout(state.timer);
+            if (state.xhr) {
+                state.xhr.abort();
+                state.xhr = null;
+            }
+        };
+
+        var load = function (page) {
+            cancel();
+            state.xhr = $.ajax({
+                type: "GET",
+                url: select.data("remoteUrl"),
+                data: {q: state.term, page: page},
+                dataType: "json",
+                success: function (data) {
+                    if (page === 1) {
+                        // Keep selected options, results of the previous search are replaced
+                        select.find("option").filter(function () {
+                            return !this.selected && this.value !== "";
+                        }).remove();
+                    }
+                    $.each(data.results, function (i, result) {
+                        var value = String(result.id);
+                        var exists = select.find("option").filter(function () {
+                            return this.value === value;
+                        }).length > 0;
+                        if (!exists) {
+                            select.append(new Option(result.text, value));
+                        }
+                    });
+                    state.page = page;
+                    more.toggle(data.more);
+                },
+                error: function (xhr, status) {
+                    if (status !== "abort") {
+                        console.error("django-bootstrap-modal-forms: search of " + select.attr("name") + " failed.");
+                    }
+                }
+            });
+        };
+
+        search.on("input", function () {
+            cancel();
+            state.term = $.trim(search.val());
+            if (state.term.length < minLength) {
+                more.hide();
+                return;
+            }
+            state.timer = setTimeout(function () {
+                load(1);
+            }, 300);
+        });
+        more.on("click", function () {
+            load(state.page + 1);
+        });
+    };
+
     // Check if form.is_valid() & either show errors or submit it via callback
     var isFormValid = function (settings, callback) {
+        var formdata = new FormData($(settings.modalForm)[0]);
+        if (settings.oneShot) {
+            if (settings.asyncUpdate) {
+                if (!validateAsyncSettings(settings.asyncSettings, settings.delegated)) {
+                    submitFailed(settings);
+                    return;
+                }
+                formdata.append("asyncUpdate", "True");
+            }
+            // Validate and save in a single request, see FormValidationMixin
+            formdata.append("oneShot", "True");
+        }
+
+        // Declare the phase of the request, see ModalPhase
+        var phase = !settings.oneShot ? "validate" : settings.asyncUpdate ? "async-commit" : "commit";
+        var headers = {"X-Modal-Phase": phase};
+        var timings = {};
+        var started = now();
+        if (settings.jsonErrors) {
+            // Ask FormErrorsMixin for errors as JSON instead of rerendered form
+            headers["Accept"] = "application/json";
+        }
+
         $.ajax({
             type: $(settings.modalForm).attr("method"),
             url: $(settings.modalForm).attr("action"),
-            data: new FormData($(settings.modalForm)[0]),
+            data: formdata,
             contentType: false,
             processData: false,
+            headers: headers,
             beforeSend: function () {
                 $(settings.submitBtn).prop("disabled", true);
             },
-            success: function (response) {
-                if ($(response).find(settings.errorClass).length > 0) {
+            error: function (xhr) {
+                if (xhr.responseJSON && xhr.responseJSON.valid === false) {
+                    timings.fetch = now() - started;
+                    showFormErrors(settings, xhr.responseJSON);
+                    timings.insert = now() - started - timings.fetch;
+                    reportTimings(settings, phase, timings);
+                } else {
+                    submitFailed(settings);
+                }
+            },
+            success: function (response, status, xhr) {
+                // Response is already parsed by jQuery
+                timings.fetch = now() - started;
+                var contentType = xhr.getResponseHeader("Content-Type") || "";
+                var valid = xhr.getResponseHeader("X-Modal-Form-Valid");
+                var content = null;
+                if (contentType.indexOf("application/json") === -1 && valid === null) {
+                    // Server doesn't tell validity of the form, parse the response once in a detached document,
+                    // so its images aren't loaded, and search it for errors
+                    content = $($.parseHTML(response, document.implementation.createHTMLDocument(""), true));
+                    valid = content.find(settings.errorClass).length > 0 ? "false" : "true";
+                }
+
+                if (contentType.indexOf("application/json") !== -1) {
+                    // One-shot response, object is already saved
+                    reportTimings(settings, phase, timings);
+                    oneShotSuccess(settings, response);
+                } else if (valid === "false") {
                     // Form is not valid, update it with errors
-                    $(settings.modalID).find(settings.modalContent).html(response);
+                    $(settings.modalID).find(settings.modalContent).empty().append(content || response);
                     $(settings.modalForm).attr("action", settings.formURL);
                     // Reinstantiate handlers
                     addEventHandlers(settings);
+                    timings.insert = now() - started - timings.fetch;
+                    reportTimings(settings, phase, timings);
                 } else {
                     // Form is valid, submit it
+                    reportTimings(settings, phase, timings);
                     callback(settings);
                 }
             }
         });
     };
 
+    var now = function () {
+        return window.performance ? window.performance.now() : $.now();
+    };
+
+    // Send client timings of the modal request in milliseconds to timingEndpoint, see ModalPhaseMiddleware
+    var reportTimings = function (settings, phase, timings) {
+        if (!settings.timingEndpoint) {
+            return;
+        }
+        $.each(timings, function (name, duration) {
+            timings[name] = Math.round(duration * 10) / 10;
+        });
+        var data = JSON.stringify({url: settings.formURL, phase: phase, timings: timings});
+        if (!navigator.sendBeacon || !navigator.sendBeacon(settings.timingEndpoint, new Blob([data], {type: "application/json"}))) {
+            $.ajax({type: "POST", url: settings.timingEndpoint, data: data, contentType: "application/json"});
+        }
+    };
+
+    // Allow submitting the form again after the submit didn't succeed
+    var submitFailed = function (settings) {
+        $(settings.modalForm).removeData("modalFormSubmitting");
+        $(settings.submitBtn).prop("disabled", false);
+    };
+
+    // Show JSON errors returned by FormErrorsMixin in the existing form
+    var showFormErrors = function (settings, data) {
+        var form = $(settings.modalForm);
+        var errorClass = settings.errorClass.replace(/^\./, "");
+
+        // Remove errors of the previous submit
+        form.find("[data-modal-form-error]").remove();
+        form.find("." + errorClass).removeClass(errorClass);
+
+        var createErrorElement = function (className, messages) {
+            var errorElement = $("<div data-modal-form-error></div>").addClass(className);
+            $.each(messages, function (i, message) {
+                errorElement.append($("<p class='help-block'></p>").text(message));
+            });
+            return errorElement;
+        };
+
+        $.each(data.errors, function (name, error) {
+            var field = error.id ? form.find("#" + $.escapeSelector(error.id)) : $();
+            if (field.length === 0) {
+                field = form.find("[name='" + $.escapeSelector(name) + "']");
+            }
+            field.first().addClass(errorClass).after(createErrorElement("invalid-feedback d-block", error.messages));
+        });
+
+        if (data.non_field_errors.length > 0) {
+            var container = form.find(".modal-body");
+            (container.length ? container : form).first().prepend(createErrorElement(errorClass + " d-block mb-2", data.non_field_errors));
+        }
+
+        submitFailed(settings);
+    };
+
+    // Finish one-shot submit without posting the form again
+    var oneShotSuccess = function (settings, response) {
+        if (settings.asyncUpdate) {
+            asyncUpdateSuccess(settings, response);
+        } else {
+            window.location.assign(response.success_url);
+        }
+    };
+
     // Submit form callback function
     var submitForm = function (settings) {        
         if (!settings.asyncUpdate) {
             $(settings.modalForm).submit();
         } else {          
-            var asyncSettingsValid = validateAsyncSettings(settings.asyncSettings);
+            var asyncSettingsValid = validateAsyncSettings(settings.asyncSettings, settings.delegated);
             
             if (asyncSettingsValid) {                
-                var asyncSettings = settings.asyncSettings;
                 // Serialize form data
                 var formdata = new FormData($(settings.modalForm)[0]);
                 // Add asyncUpdate and check for it in save method of CreateUpdateAjaxMixin
@@ -73,48 +408,174 @@ https://github.com/trco/django-bootstrap-modal-forms
                 $.ajax({
                     type: $(settings.modalForm).attr("method"),
                     url: $(settings.modalForm).attr("action"),
+                    headers: {"X-Modal-Phase": "async-commit"},
                     data: formdata,
                     contentType: false,
                     processData: false,
                     success: function (response) {
-                        var body = $("body");
-                        if (body.length === 0) {
-                            console.error("django-bootstrap-modal-forms: <body> element missing in your html.");
-                        }
-                        body.prepend(asyncSettings.successMessage);
-    
-                        // Update page without refresh
-                        $.ajax({
-                            type: "GET",
-                            url: asyncSettings.dataUrl,
-                            dataType: "json",
-                            success: function (response) {
-                                // Update page
-                                $(asyncSettings.dataElementId).html(response[asyncSettings.dataKey]);
-    
-                                // Add modalForm to trigger element after async page update
-                                if (asyncSettings.addModalFormFunction) {
-                                    asyncSettings.addModalFormFunction();
-                                }
-    
-                                if (asyncSettings.closeOnSubmit) {
-                                    $(settings.modalID).modal("hide");
-                                } else {
-                                    // Reload form
-                                    $(settings.modalID).find(settings.modalContent).load(settings.formURL, function () {
-                                        $(settings.modalForm).attr("action", settings.formURL);
-                                        addEventHandlers(settings);
-                                    });
-                                }
-                            }
+                        asyncUpdateSuccess(settings, $.isPlainObject(response) ? response : null);
+                    },
+                    error: function () {
+                        submitFailed(settings);
+                    }
+                });
+            } else {
+                submitFailed(settings);
+            }
+        }
+    };
+
+    // CSRF token of a form on the page or of the CSRF cookie
+    var getCsrfToken = function () {
+        var input = $("input[name=csrfmiddlewaretoken]");
+        if (input.length) {
+            return input.val();
+        }
+        var match = document.cookie.match(/(?:^|;\s*)csrftoken=([^;]*)/);
+        return match ? decodeURIComponent(match[1]) : "";
+    };
+
+    // Delete the object of a trigger element with delete token after a local confirmation with a single POST,
+    // without loading the confirmation form into the modal
+    var signedDelete = function (settings) {
+        var confirmed = settings.confirmDelete ? settings.confirmDelete(settings) : window.confirm(settings.confirmMessage);
+        $.when(confirmed).then(function (confirmed) {
+            if (!confirmed) {
+                return;
+            }
+            $.ajax({
+                type: "POST",
+                url: settings.formURL,
+                data: {csrfmiddlewaretoken: getCsrfToken(), delete_token: settings.deleteToken},
+                dataType: "json",
+                success: function (response) {
+                    var asyncSettings = settings.asyncSettings;
+                    clearPrefetchCache();
+                    if (asyncSettings.successMessage) {
+                        $("body").prepend(asyncSettings.successMessage);
+                    }
+                    if (updateRow(asyncSettings, response)) {
+                        return;
+                    }
+                    if (asyncSettings.dataUrl) {
+                        $.getJSON(asyncSettings.dataUrl, getDataParams(asyncSettings, response), function (data) {
+                            $(asyncSettings.dataElementId).html(data[asyncSettings.dataKey]);
                         });
+                        return;
                     }
+                    window.location.reload();
+                },
+                error: function (xhr) {
+                    console.error("django-bootstrap-modal-forms: deleting of " + settings.formURL + " failed with status " + xhr.status + ".");
+                }
+            });
+        });
+    };
+
+    // Update, insert or remove the table row of the object returned by AsyncRowMixin,
+    // returns false if the whole table has to be refreshed from dataUrl
+    var updateRow = function (asyncSettings, response) {
+        var dataElement = $(asyncSettings.dataElementId);
+        if (!response || !response.operation || dataElement.length === 0) {
+            return false;
+        }
+        if ($.isArray(response.pks)) {
+            // Bulk views return pks and rendered rows of all changed objects
+            var rows = response.rows || {};
+            for (var i = 0; i < response.pks.length; i++) {
+                var pk = response.pks[i];
+                if (!updateRow(asyncSettings, {pk: pk, operation: response.operation, row: rows[pk]})) {
+                    return false;
+                }
+            }
+            return true;
+        }
+
+        var row = dataElement.find("[data-pk='" + $.escapeSelector(String(response.pk)) + "']");
+        if (response.operation === "delete") {
+            if (row.length === 0) {
+                // Row isn't on the page, e.g. the table shows a window of rows
+                return false;
+            }
+            row.remove();
+            return true;
+        }
+        if (!response.row) {
+            return false;
+        }
+
+        var newRow = $($.parseHTML($.trim(response.row))).filter("*").first();
+        if (row.length > 0) {
+            row.replaceWith(newRow);
+        } else if (response.operation === "create") {
+            var tbody = dataElement.find("tbody");
+            (tbody.length ? tbody : dataElement).first().append(newRow);
+        } else {
+            return false;
+        }
+        return true;
+    };
+
+    // Request only a window of rows around the changed object from BSModalDataView if dataWindow is set
+    var getDataParams = function (asyncSettings, data) {
+        var params = {};
+        if (asyncSettings.dataWindow) {
+            params.limit = asyncSettings.dataWindow;
+            if (data && data.pk !== undefined && data.operation !== "delete") {
+                params.around = data.pk;
+            }
+        }
+        return params;
+    };
+
+    // Show success message and update page after object was saved asynchronously
+    var asyncUpdateSuccess = function (settings, data) {
+        var asyncSettings = settings.asyncSettings;
+        var body = $("body");
+        if (body.length === 0) {
+            console.error("django-bootstrap-modal-forms: <body> element missing in your html.");
+        }
+        body.prepend(asyncSettings.successMessage);
+
+        clearPrefetchCache();
+
+        var pageUpdated = function () {
+            // Add modalForm to trigger element after async page update
+            if (asyncSettings.addModalFormFunction) {
+                asyncSettings.addModalFormFunction();
+            }
+
+            if (asyncSettings.closeOnSubmit || (data && data.operation === "delete")) {
+                $(settings.modalID).modal("hide");
+            } else {
+                // Reload form
+                loadModalBody(settings, function () {
+                    $(settings.modalForm).attr("action", settings.formURL);
+                    addEventHandlers(settings);
                 });
             }
+        };
+
+        if (updateRow(asyncSettings, data)) {
+            pageUpdated();
+            return;
         }
+
+        // Update page without refresh
+        $.ajax({
+            type: "GET",
+            url: asyncSettings.dataUrl,
+            data: getDataParams(asyncSettings, data),
+            dataType: "json",
+            success: function (response) {
+                // Update page
+                $(asyncSettings.dataElementId).html(response[asyncSettings.dataKey]);
+                pageUpdated();
+            }
+        });
     };
 
-    var validateAsyncSettings = function (settings) {
+    var validateAsyncSettings = function (settings, delegated) {
         var missingSettings = [];
 
         if (!settings.successMessage) {
@@ -133,7 +594,8 @@ https://github.com/trco/django-bootstrap-modal-forms
             missingSettings.push("dataKey");
             console.error("django-bootstrap-modal-forms: 'dataKey' in asyncSettings is missing.");
         }
-        if (!settings.addModalFormFunction) {
+        // Delegated trigger elements don't have to be bound again after async page update
+        if (!settings.addModalFormFunction && !delegated) {
             missingSettings.push("addModalFormFunction");
             console.error("django-bootstrap-modal-forms: 'addModalFormFunction' in asyncSettings is missing.");
         }
@@ -145,15 +607,24 @@ https://github.com/trco/django-bootstrap-modal-forms
         return true;
     };
 
-    $.fn.modalForm = function (options) {
-        // Default settings
-        var defaults = {
+    // Default settings
+    var getDefaults = function () {
+        return {
             modalID: "#modal",
             modalContent: ".modal-content",
             modalForm: ".modal-content form",
             formURL: null,
             isDeleteForm: false,
             errorClass: ".invalid",
+            jsonErrors: false,
+            oneShot: false,
+            prefetch: false,
+            prefetchDelay: 100,
+            selection: null,
+            timingEndpoint: null,
+            deleteToken: null,
+            confirmMessage: "Are you sure you want to delete this?",
+            confirmDelete: null,
             asyncUpdate: false,
             asyncSettings: {
                 closeOnSubmit: false,
@@ -161,22 +632,117 @@ https://github.com/trco/django-bootstrap-modal-forms
                 dataUrl: null,
                 dataElementId: null,
                 dataKey: null,
+                dataWindow: null,
                 addModalFormFunction: null
             }
         };
+    };
 
+    // Add pks of the selected objects to formURL of bulk views
+    var getSelectionSettings = function (settings) {
+        if (!settings.selection) {
+            return settings;
+        }
+        var url = settings.formURL.split("?");
+        var params = $.grep((url[1] || "").split("&"), function (param) {
+            return param !== "" && param.split("=")[0] !== "pk";
+        });
+        $(settings.selection).each(function () {
+            params.push("pk=" + encodeURIComponent($(this).val()));
+        });
+        return $.extend({}, settings, {formURL: url[0] + (params.length ? "?" + params.join("&") : "")});
+    };
+
+    $.fn.modalForm = function (options) {
         // Extend default settings with provided options
-        var settings = $.extend(defaults, options);
+        var settings = $.extend(getDefaults(), options);
 
         this.each(function () {
             // Add click event handler to the element with attached modalForm
             $(this).click(function (event) {
                 // Instantiate new form in modal
-                modalForm(settings);
+                modalForm(getSelectionSettings(settings));
             });
+
+            // Selection changes until the trigger element is clicked, so bulk views are not prefetched
+            if (settings.prefetch && !settings.selection && !settings.deleteToken) {
+                // Prefetch modal body when user is about to click the trigger element
+                var timer = null;
+                $(this).on("mouseenter focus", function () {
+                    clearTimeout(timer);
+                    timer = setTimeout(function () {
+                        prefetchModalBody(settings.formURL);
+                    }, settings.prefetchDelay);
+                }).on("mouseleave", function () {
+                    clearTimeout(timer);
+                }).on("pointerdown", function () {
+                    clearTimeout(timer);
+                    prefetchModalBody(settings.formURL);
+                });
+            }
         });
 
         return this;
     };
 
+    // Settings of the trigger element, data-* attributes override the shared settings of modalFormDelegate
+    var getTriggerSettings = function (elem, settings) {
+        var triggerSettings = $.extend({}, settings);
+        var attributes = {
+            formURL: "data-form-url",
+            modalID: "data-modal-id",
+            isDeleteForm: "data-is-delete-form",
+            asyncUpdate: "data-async-update",
+            oneShot: "data-one-shot",
+            jsonErrors: "data-json-errors",
+            selection: "data-selection",
+            deleteToken: "data-delete-token",
+            confirmMessage: "data-confirm"
+        };
+        var stringSettings = ["formURL", "modalID", "selection", "deleteToken", "confirmMessage"];
+        $.each(attributes, function (name, attribute) {
+            var value = elem.getAttribute(attribute);
+            if (value !== null) {
+                triggerSettings[name] = $.inArray(name, stringSettings) !== -1 ? value : value === "true";
+            }
+        });
+        return triggerSettings;
+    };
+
+    // Open modalForm for every element matching selector within the container with a single handler. Elements
+    // added to the container later, e.g. by asynchronous update of a table, don't have to be bound again.
+    $.fn.modalFormDelegate = function (selector, options) {
+        var settings = $.extend(getDefaults(), options, {delegated: true});
+
+        this.on("click", selector, function (event) {
+            modalForm(getSelectionSettings(getTriggerSettings(this, settings)));
+        });
+
+        if (settings.prefetch && !settings.selection) {
+            // Prefetch modal body when user is about to click a trigger element
+            var timer = null;
+            var prefetchTrigger = function (elem) {
+                var triggerSettings = getTriggerSettings(elem, settings);
+                // Objects of trigger elements with delete token are deleted without loading the modal
+                if (!triggerSettings.deleteToken) {
+                    prefetchModalBody(triggerSettings.formURL);
+                }
+            };
+            this.on("mouseenter focusin", selector, function () {
+                var elem = this;
+                clearTimeout(timer);
+                timer = setTimeout(function () {
+                    prefetchTrigger(elem);
+                }, settings.prefetchDelay);
+            }).on("mouseleave", selector, function () {
+                clearTimeout(timer);
+            }).on("pointerdown", selector, function () {
+                clearTimeout(timer);
+                prefetchTrigger(this);
+            });
+        }
+
+        return this;
+    };
+
 }(jQuery));
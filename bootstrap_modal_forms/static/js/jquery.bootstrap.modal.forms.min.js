@@ -1 +1,52 @@
-!function(o){var a=function(a){o(a.modalForm).on("submit",function(o){if(void 0!==o.originalEvent&&!1===a.isDeleteForm)return o.preventDefault(),n(a,t),!1}),o(a.modalID).on("hidden.bs.modal",function(n){o(a.modalForm).remove()})},n=function(n,t){o.ajax({type:o(n.modalForm).attr("method"),url:o(n.modalForm).attr("action"),data:new FormData(o(n.modalForm)[0]),contentType:!1,processData:!1,beforeSend:function(){o(n.submitBtn).prop("disabled",!0)},success:function(e){o(e).find(n.errorClass).length>0?(o(n.modalID).find(n.modalContent).html(e),o(n.modalForm).attr("action",n.formURL),a(n)):t(n)}})},t=function(n){if(n.asyncUpdate){if(e(n.asyncSettings)){var t=n.asyncSettings,s=new FormData(o(n.modalForm)[0]);s.append("asyncUpdate","True"),o.ajax({type:o(n.modalForm).attr("method"),url:o(n.modalForm).attr("action"),data:s,contentType:!1,processData:!1,success:function(e){var s=o("body");0===s.length&&console.error("django-bootstrap-modal-forms: <body> element missing in your html."),s.prepend(t.successMessage),o.ajax({type:"GET",url:t.dataUrl,dataType:"json",success:function(e){o(t.dataElementId).html(e[t.dataKey]),t.addModalFormFunction&&t.addModalFormFunction(),t.closeOnSubmit?o(n.modalID).modal("hide"):o(n.modalID).find(n.modalContent).load(n.formURL,function(){o(n.modalForm).attr("action",n.formURL),a(n)})}})}})}}else o(n.modalForm).submit()},e=function(o){var a=[];return o.successMessage||(a.push("successMessage"),console.error("django-bootstrap-modal-forms: 'successMessage' in asyncSettings is missing.")),o.dataUrl||(a.push("dataUrl"),console.error("django-bootstrap-modal-forms: 'dataUrl' in asyncSettings is missing.")),o.dataElementId||(a.push("dataElementId"),console.error("django-bootstrap-modal-forms: 'dataElementId' in asyncSettings is missing.")),o.dataKey||(a.push("dataKey"),console.error("django-bootstrap-modal-forms: 'dataKey' in asyncSettings is missing.")),o.addModalFormFunction||(a.push("addModalFormFunction"),console.error("django-bootstrap-modal-forms: 'addModalFormFunction' in asyncSettings is missing.")),!(a.length>0)};o.fn.modalForm=function(n){var t=o.extend({modalID:"#modal",modalContent:".modal-content",modalForm:".modal-content form",formURL:null,isDeleteForm:!1,errorClass:".invalid",asyncUpdate:!1,asyncSettings:{closeOnSubmit:!1,successMessage:null,dataUrl:null,dataElementId:null,dataKey:null,addModalFormFunction:null}},n);return this.each(function(){o(this).click(function(n){!function(n){o(n.modalID).find(n.modalContent).load(n.formURL,function(){o(n.modalID).modal("show"),o(n.modalForm).attr("action",n.formURL),a(n)})}(t)})}),this}}(jQuery);
\ No newline at end of file
+/*
+django-bootstrap-modal-forms
+version : 3.0.5
+Copyright (c) 2023 Uroš Trstenjak
+https://github.com/trco/django-bootstrap-modal-forms
+*/
+(function(f){typeof define=="function"&&define.amd?define(["jquery"],f):typeof module=="object"&&module.exports?f(require("jquery")):f(jQuery)})(function(jQuery){(function($){var modalBodyCache={};var modalBodyCacheSize=50;var inFlightBodies={};var fetchModalBody=function(url){if(inFlightBodies[url]){return inFlightBodies[url].body;}
+var cached=modalBodyCache[url];var xhr=$.ajax({type:"GET",url:url,dataType:"html",headers:cached?{"If-None-Match":cached.etag}:{}});var inFlight={xhr:xhr};inFlight.body=xhr.then(function(response,status,xhr){if(xhr.status===304&&cached){return cached.body;}
+var etag=xhr.getResponseHeader("ETag");delete modalBodyCache[url];if(etag){modalBodyCache[url]={etag:etag,body:response};var urls=Object.keys(modalBodyCache);if(urls.length>modalBodyCacheSize){delete modalBodyCache[urls[0]];}}
+return response;}).always(function(){if(inFlightBodies[url]===inFlight){delete inFlightBodies[url];}});inFlightBodies[url]=inFlight;return inFlight.body;};var abortModalBody=function(url){if(inFlightBodies[url]){inFlightBodies[url].xhr.abort();delete inFlightBodies[url];}};var prefetchCache={};var prefetchCacheSize=20;var prefetchMaxAge=30000;var prefetchConcurrency=2;var prefetchesInFlight=0;var getPrefetchedBody=function(url){var prefetched=prefetchCache[url];if(prefetched&&$.now()-prefetched.time<prefetchMaxAge){return prefetched.body;}
+delete prefetchCache[url];return null;};var prefetchModalBody=function(url){if(getPrefetchedBody(url)||prefetchesInFlight>=prefetchConcurrency){return;}
+prefetchesInFlight++;var body=fetchModalBody(url);body.fail(function(){delete prefetchCache[url];}).always(function(){prefetchesInFlight--;});prefetchCache[url]={body:body,time:$.now()};var urls=Object.keys(prefetchCache);if(urls.length>prefetchCacheSize){delete prefetchCache[urls[0]];}};var clearPrefetchCache=function(){prefetchCache={};};var loadModalBody=function(settings,callback){var modal=$(settings.modalID);var loading=modal.data("modalFormLoading");if(loading&&loading.url!==settings.formURL){abortModalBody(loading.url);}
+var current={url:settings.formURL};modal.data("modalFormLoading",current);(getPrefetchedBody(settings.formURL)||fetchModalBody(settings.formURL)).done(function(body){if(modal.data("modalFormLoading")!==current){return;}
+modal.removeData("modalFormLoading");var fetched=now();modal.find(settings.modalContent).html(body);callback(fetched);});};var modalForm=function(settings){if(settings.deleteToken){signedDelete(settings);return;}
+var started=now();loadModalBody(settings,function(fetched){$(settings.modalID).modal("show");$(settings.modalForm).attr("action",settings.formURL);addEventHandlers(settings);reportTimings(settings,"open",{fetch:fetched-started,insert:now()-fetched});});};var addEventHandlers=function(settings){$(settings.modalForm).off("submit.modalForm").on("submit.modalForm",function(event){if(event.originalEvent!==undefined){if($(this).data("modalFormSubmitting")){event.preventDefault();return false;}
+$(this).data("modalFormSubmitting",true);}
+if(event.originalEvent!==undefined&&settings.isDeleteForm===false){event.preventDefault();isFormValid(settings,submitForm);return false;}else if(event.originalEvent!==undefined&&settings.asyncUpdate){event.preventDefault();submitForm(settings);return false;}});bindRemoteSelects(settings);$(settings.modalID).off("hidden.bs.modal.modalForm").on("hidden.bs.modal.modalForm",function(event){$(settings.modalForm).remove();});};var bindRemoteSelects=function(settings){var form=$(settings.modalForm);form.find("[data-modal-form-remote]").remove();form.find("select[data-remote-url]").each(function(){bindRemoteSelect($(this));});};var bindRemoteSelect=function(select){var search=$("<input type='search' class='form-control form-control-sm mb-1' data-modal-form-remote>");var more=$("<button type='button' class='btn btn-link btn-sm px-0' data-modal-form-remote></button>");more.text(select.data("remoteMoreLabel")).hide();select.before(search).after(more);var minLength=parseInt(select.data("remoteMinLength"),10)||0;var state={term:"",page:0,timer:null,xhr:null};var cancel=function(){clearTimeout(state.timer);if(state.xhr){state.xhr.abort();state.xhr=null;}};var load=function(page){cancel();state.xhr=$.ajax({type:"GET",url:select.data("remoteUrl"),data:{q:state.term,page:page},dataType:"json",success:function(data){if(page===1){select.find("option").filter(function(){return!this.selected&&this.value!=="";}).remove();}
+$.each(data.results,function(i,result){var value=String(result.id);var exists=select.find("option").filter(function(){return this.value===value;}).length>0;if(!exists){select.append(new Option(result.text,value));}});state.page=page;more.toggle(data.more);},error:function(xhr,status){if(status!=="abort"){console.error("django-bootstrap-modal-forms: search of "+select.attr("name")+" failed.");}}});};search.on("input",function(){cancel();state.term=$.trim(search.val());if(state.term.length<minLength){more.hide();return;}
+state.timer=setTimeout(function(){load(1);},300);});more.on("click",function(){load(state.page+1);});};var isFormValid=function(settings,callback){var formdata=new FormData($(settings.modalForm)[0]);if(settings.oneShot){if(settings.asyncUpdate){if(!validateAsyncSettings(settings.asyncSettings,settings.delegated)){submitFailed(settings);return;}
+formdata.append("asyncUpdate","True");}
+formdata.append("oneShot","True");}
+var phase=!settings.oneShot?"validate":settings.asyncUpdate?"async-commit":"commit";var headers={"X-Modal-Phase":phase};var timings={};var started=now();if(settings.jsonErrors){headers["Accept"]="application/json";}
+$.ajax({type:$(settings.modalForm).attr("method"),url:$(settings.modalForm).attr("action"),data:formdata,contentType:false,processData:false,headers:headers,beforeSend:function(){$(settings.submitBtn).prop("disabled",true);},error:function(xhr){if(xhr.responseJSON&&xhr.responseJSON.valid===false){timings.fetch=now()-started;showFormErrors(settings,xhr.responseJSON);timings.insert=now()-started-timings.fetch;reportTimings(settings,phase,timings);}else{submitFailed(settings);}},success:function(response,status,xhr){timings.fetch=now()-started;var contentType=xhr.getResponseHeader("Content-Type")||"";var valid=xhr.getResponseHeader("X-Modal-Form-Valid");var content=null;if(contentType.indexOf("application/json")===-1&&valid===null){content=$($.parseHTML(response,document.implementation.createHTMLDocument(""),true));valid=content.find(settings.errorClass).length>0?"false":"true";}
+if(contentType.indexOf("application/json")!==-1){reportTimings(settings,phase,timings);oneShotSuccess(settings,response);}else if(valid==="false"){$(settings.modalID).find(settings.modalContent).empty().append(content||response);$(settings.modalForm).attr("action",settings.formURL);addEventHandlers(settings);timings.insert=now()-started-timings.fetch;reportTimings(settings,phase,timings);}else{reportTimings(settings,phase,timings);callback(settings);}}});};var now=function(){return window.performance?window.performance.now():$.now();};var reportTimings=function(settings,phase,timings){if(!settings.timingEndpoint){return;}
+$.each(timings,function(name,duration){timings[name]=Math.round(duration*10)/10;});var data=JSON.stringify({url:settings.formURL,phase:phase,timings:timings});if(!navigator.sendBeacon||!navigator.sendBeacon(settings.timingEndpoint,new Blob([data],{type:"application/json"}))){$.ajax({type:"POST",url:settings.timingEndpoint,data:data,contentType:"application/json"});}};var submitFailed=function(settings){$(settings.modalForm).removeData("modalFormSubmitting");$(settings.submitBtn).prop("disabled",false);};var showFormErrors=function(settings,data){var form=$(settings.modalForm);var errorClass=settings.errorClass.replace(/^\./,"");form.find("[data-modal-form-error]").remove();form.find("."+errorClass).removeClass(errorClass);var createErrorElement=function(className,messages){var errorElement=$("<div data-modal-form-error></div>").addClass(className);$.each(messages,function(i,message){errorElement.append($("<p class='help-block'></p>").text(message));});return errorElement;};$.each(data.errors,function(name,error){var field=error.id?form.find("#"+$.escapeSelector(error.id)):$();if(field.length===0){field=form.find("[name='"+$.escapeSelector(name)+"']");}
+field.first().addClass(errorClass).after(createErrorElement("invalid-feedback d-block",error.messages));});if(data.non_field_errors.length>0){var container=form.find(".modal-body");(container.length?container:form).first().prepend(createErrorElement(errorClass+" d-block mb-2",data.non_field_errors));}
+submitFailed(settings);};var oneShotSuccess=function(settings,response){if(settings.asyncUpdate){asyncUpdateSuccess(settings,response);}else{window.location.assign(response.success_url);}};var submitForm=function(settings){if(!settings.asyncUpdate){$(settings.modalForm).submit();}else{var asyncSettingsValid=validateAsyncSettings(settings.asyncSettings,settings.delegated);if(asyncSettingsValid){var formdata=new FormData($(settings.modalForm)[0]);formdata.append("asyncUpdate","True");$.ajax({type:$(settings.modalForm).attr("method"),url:$(settings.modalForm).attr("action"),headers:{"X-Modal-Phase":"async-commit"},data:formdata,contentType:false,processData:false,success:function(response){asyncUpdateSuccess(settings,$.isPlainObject(response)?response:null);},error:function(){submitFailed(settings);}});}else{submitFailed(settings);}}};var getCsrfToken=function(){var input=$("input[name=csrfmiddlewaretoken]");if(input.length){return input.val();}
+var match=document.cookie.match(/(?:^|;\s*)csrftoken=([^;]*)/);return match?decodeURIComponent(match[1]):"";};var signedDelete=function(settings){var confirmed=settings.confirmDelete?settings.confirmDelete(settings):window.confirm(settings.confirmMessage);$.when(confirmed).then(function(confirmed){if(!confirmed){return;}
+$.ajax({type:"POST",url:settings.formURL,data:{csrfmiddlewaretoken:getCsrfToken(),delete_token:settings.deleteToken},dataType:"json",success:function(response){var asyncSettings=settings.asyncSettings;clearPrefetchCache();if(asyncSettings.successMessage){$("body").prepend(asyncSettings.successMessage);}
+if(updateRow(asyncSettings,response)){return;}
+if(asyncSettings.dataUrl){$.getJSON(asyncSettings.dataUrl,function(data){$(asyncSettings.dataElementId).html(data[asyncSettings.dataKey]);});return;}
+window.location.reload();},error:function(xhr){console.error("django-bootstrap-modal-forms: deleting of "+settings.formURL+" failed with status "+xhr.status+".");}});});};var updateRow=function(asyncSettings,response){var dataElement=$(asyncSettings.dataElementId);if(!response||!response.operation||dataElement.length===0){return false;}
+if($.isArray(response.pks)){var rows=response.rows||{};for(var i=0;i<response.pks.length;i++){var pk=response.pks[i];if(!updateRow(asyncSettings,{pk:pk,operation:response.operation,row:rows[pk]})){return false;}}
+return true;}
+var row=dataElement.find("[data-pk='"+$.escapeSelector(String(response.pk))+"']");if(response.operation==="delete"){row.remove();return true;}
+if(!response.row){return false;}
+var newRow=$($.parseHTML($.trim(response.row))).filter("*").first();if(row.length>0){row.replaceWith(newRow);}else if(response.operation==="create"){var tbody=dataElement.find("tbody");(tbody.length?tbody:dataElement).first().append(newRow);}else{return false;}
+return true;};var asyncUpdateSuccess=function(settings,data){var asyncSettings=settings.asyncSettings;var body=$("body");if(body.length===0){console.error("django-bootstrap-modal-forms: <body> element missing in your html.");}
+body.prepend(asyncSettings.successMessage);clearPrefetchCache();var pageUpdated=function(){if(asyncSettings.addModalFormFunction){asyncSettings.addModalFormFunction();}
+if(asyncSettings.closeOnSubmit||(data&&data.operation==="delete")){$(settings.modalID).modal("hide");}else{loadModalBody(settings,function(){$(settings.modalForm).attr("action",settings.formURL);addEventHandlers(settings);});}};if(updateRow(asyncSettings,data)){pageUpdated();return;}
+var params={};if(asyncSettings.dataWindow){params.limit=asyncSettings.dataWindow;if(data&&data.pk!==undefined&&data.operation!=="delete"){params.around=data.pk;}}
+$.ajax({type:"GET",url:asyncSettings.dataUrl,data:params,dataType:"json",success:function(response){$(asyncSettings.dataElementId).html(response[asyncSettings.dataKey]);pageUpdated();}});};var validateAsyncSettings=function(settings,delegated){var missingSettings=[];if(!settings.successMessage){missingSettings.push("successMessage");console.error("django-bootstrap-modal-forms: 'successMessage' in asyncSettings is missing.");}
+if(!settings.dataUrl){missingSettings.push("dataUrl");console.error("django-bootstrap-modal-forms: 'dataUrl' in asyncSettings is missing.");}
+if(!settings.dataElementId){missingSettings.push("dataElementId");console.error("django-bootstrap-modal-forms: 'dataElementId' in asyncSettings is missing.");}
+if(!settings.dataKey){missingSettings.push("dataKey");console.error("django-bootstrap-modal-forms: 'dataKey' in asyncSettings is missing.");}
+if(!settings.addModalFormFunction&&!delegated){missingSettings.push("addModalFormFunction");console.error("django-bootstrap-modal-forms: 'addModalFormFunction' in asyncSettings is missing.");}
+if(missingSettings.length>0){return false;}
+return true;};var getDefaults=function(){return{modalID:"#modal",modalContent:".modal-content",modalForm:".modal-content form",formURL:null,isDeleteForm:false,errorClass:".invalid",jsonErrors:false,oneShot:false,prefetch:false,prefetchDelay:100,selection:null,timingEndpoint:null,deleteToken:null,confirmMessage:"Are you sure you want to delete this?",confirmDelete:null,asyncUpdate:false,asyncSettings:{closeOnSubmit:false,successMessage:null,dataUrl:null,dataElementId:null,dataKey:null,dataWindow:null,addModalFormFunction:null}};};var getSelectionSettings=function(settings){if(!settings.selection){return settings;}
+var url=settings.formURL.split("?");var params=$.grep((url[1]||"").split("&"),function(param){return param!==""&&param.split("=")[0]!=="pk";});$(settings.selection).each(function(){params.push("pk="+encodeURIComponent($(this).val()));});return $.extend({},settings,{formURL:url[0]+(params.length?"?"+params.join("&"):"")});};$.fn.modalForm=function(options){var settings=$.extend(getDefaults(),options);this.each(function(){$(this).click(function(event){modalForm(getSelectionSettings(settings));});if(settings.prefetch&&!settings.selection&&!settings.deleteToken){var timer=null;$(this).on("mouseenter focus",function(){clearTimeout(timer);timer=setTimeout(function(){prefetchModalBody(settings.formURL);},settings.prefetchDelay);}).on("mouseleave",function(){clearTimeout(timer);}).on("pointerdown",function(){clearTimeout(timer);prefetchModalBody(settings.formURL);});}});return this;};var getTriggerSettings=function(elem,settings){var triggerSettings=$.extend({},settings);var attributes={formURL:"data-form-url",modalID:"data-modal-id",isDeleteForm:"data-is-delete-form",asyncUpdate:"data-async-update",oneShot:"data-one-shot",jsonErrors:"data-json-errors",selection:"data-selection",deleteToken:"data-delete-token",confirmMessage:"data-confirm"};var stringSettings=["formURL","modalID","selection","deleteToken","confirmMessage"];$.each(attributes,function(name,attribute){var value=elem.getAttribute(attribute);if(value!==null){triggerSettings[name]=$.inArray(name,stringSettings)!==-1?value:value==="true";}});return triggerSettings;};$.fn.modalFormDelegate=function(selector,options){var settings=$.extend(getDefaults(),options,{delegated:true});this.on("click",selector,function(event){modalForm(getSelectionSettings(getTriggerSettings(this,settings)));});if(settings.prefetch&&!settings.selection){var timer=null;var prefetchTrigger=function(elem){var triggerSettings=getTriggerSettings(elem,settings);if(!triggerSettings.deleteToken){prefetchModalBody(triggerSettings.formURL);}};this.on("mouseenter focusin",selector,function(){var elem=this;clearTimeout(timer);timer=setTimeout(function(){prefetchTrigger(elem);},settings.prefetchDelay);}).on("mouseleave",selector,function(){clearTimeout(timer);}).on("pointerdown",selector,function(){clearTimeout(timer);prefetchTrigger(this);});}
+return this;};}(jQuery));
+});
+//# sourceMappingURL=jquery.bootstrap.modal.forms.min.js.map
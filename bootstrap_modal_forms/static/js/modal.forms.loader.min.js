@@ -0,0 +1,12 @@
+/*
+django-bootstrap-modal-forms
+version : 3.0.5
+Copyright (c) 2023 Marcel Rupp
+*/
+(function(){const script=document.currentScript;const config=script.dataset;const selector=config.modalFormsSelector||"[data-form-url]";const options=JSON.parse(config.modalFormsOptions||"{}");const events=["mouseover","focusin","pointerdown","click"];let loading=null;let pendingClick=null;const loadScript=function(src){return new Promise((resolve,reject)=>{let element=document.createElement("script");element.src=src;element.onload=resolve;element.onerror=()=>reject(new Error("Failed to load "+src));document.head.appendChild(element);});};const loadModalForms=function(){if(loading){return loading;}
+let client;if(config.modalFormsFlavor==="jquery"){client=(window.jQuery?Promise.resolve():loadScript(config.modalFormsJquery)).then(()=>loadScript(config.modalFormsClient)).then(()=>{window.jQuery(document).modalFormDelegate(selector,options);return window.jQuery;});}else{client=import(config.modalFormsClient).then(module=>{module.modalFormDelegate(document,selector,options);return module;});}
+loading=client.then(result=>{events.forEach(name=>document.removeEventListener(name,onEvent,true));if(pendingClick){let elem=pendingClick;pendingClick=null;elem.click();}
+return result;},error=>{loading=null;throw error;});return loading;};const onEvent=function(event){let elem=event.target instanceof Element?event.target.closest(selector):null;if(!elem){return;}
+if(event.type==="click"){pendingClick=elem;}
+loadModalForms().catch(error=>console.error(error));};events.forEach(name=>document.addEventListener(name,onEvent,true));window.loadModalForms=loadModalForms;}());
+//# sourceMappingURL=modal.forms.loader.min.js.map
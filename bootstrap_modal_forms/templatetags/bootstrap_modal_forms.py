@@ -0,0 +1,171 @@
+import json
+from urllib.parse import quote
+
+from django import template
+from django.core.serializers.json import DjangoJSONEncoder
+from django.templatetags.static import static
+from django.urls import NoReverseMatch, reverse
+from django.utils.html import format_html, format_html_join
+from django.utils.safestring import mark_safe
+
+from bootstrap_modal_forms.mixins import make_delete_token
+
+register = template.Library()
+
+# Reversed in place of the pk, so the URL of a view is reversed once per render
+PK_SENTINEL = '9021780538'
+# Safe characters of the path quoted by reverse
+PATH_SAFE = "!$&'()*+,;=/~:@"
+SCRIPT_ESCAPES = {ord('>'): '\\u003E', ord('<'): '\\u003C', ord('&'): '\\u0026'}
+
+LOADER_CLIENTS = {
+    'bootstrap5': 'js/bootstrap5.modal.forms.esm.min.js',
+    'jquery': 'js/jquery.bootstrap.modal.forms.min.js',
+}
+
+
+@register.simple_tag
+def modal_forms_loader(flavor='bootstrap5', selector='[data-form-url]', options=None, jquery=None, **kwargs):
+    """
+    Render the script which loads the modal client on the first hover, focus or click of an element matching
+    selector and binds modalFormDelegate to the document with options updated by keyword arguments. For the jquery
+    flavor, jQuery is loaded from jquery static path if it isn't on the page already.
+
+        {% modal_forms_loader 'jquery' '.bs-modal' jquery='assets/js/jquery-3.2.1.min.js' isDeleteForm=True %}
+    """
+
+    if flavor not in LOADER_CLIENTS:
+        raise template.TemplateSyntaxError(
+            "modal_forms_loader flavor must be one of %s, not %r." % (', '.join(LOADER_CLIENTS), flavor)
+        )
+
+    attrs = {
+        'data-modal-forms-flavor': flavor,
+        'data-modal-forms-client': static(LOADER_CLIENTS[flavor]),
+        'data-modal-forms-selector': selector,
+        'data-modal-forms-options': json.dumps({**(options or {}), **kwargs}, cls=DjangoJSONEncoder),
+    }
+    if jquery:
+        attrs['data-modal-forms-jquery'] = static(jquery)
+
+    return format_html(
+        '<script src="{}"{} async></script>',
+        static('js/modal.forms.loader.min.js'),
+        format_html_join('', ' {}="{}"', attrs.items())
+    )
+
+
+def get_current_app(context):
+    request = context.get('request')
+    if request is None:
+        return None
+    try:
+        return request.current_app
+    except AttributeError:
+        return request.resolver_match.namespace if request.resolver_match else None
+
+
+@register.simple_tag(takes_context=True)
+def modal_url(context, viewname, pk):
+    """
+    Return URL of viewname for the object with pk, like {% url viewname pk %}. The URL is reversed once per render
+    with a sentinel pk, which is replaced by the quoted pk of every object, so rendering many rows doesn't reverse
+    the URL for each of them. URL patterns whose pk doesn't match the sentinel are reversed for every object.
+    """
+
+    # Root dict of the render context is shared by the included templates, e.g. rows of a table
+    urls = context.render_context.dicts[0].setdefault('bootstrap_modal_forms_urls', {})
+    current_app = get_current_app(context)
+    key = (viewname, current_app)
+    if key not in urls:
+        try:
+            url = reverse(viewname, kwargs={'pk': PK_SENTINEL}, current_app=current_app)
+        except NoReverseMatch:
+            try:
+                url = reverse(viewname, args=[PK_SENTINEL], current_app=current_app)
+            except NoReverseMatch:
+                url = None
+        urls[key] = url.rpartition(PK_SENTINEL) if url and url.count(PK_SENTINEL) == 1 else None
+
+    parts = urls[key]
+    if parts is None:
+        try:
+            return reverse(viewname, kwargs={'pk': pk}, current_app=current_app)
+        except NoReverseMatch:
+            return reverse(viewname, args=[pk], current_app=current_app)
+    return parts[0] + quote(str(pk), safe=PATH_SAFE) + parts[2]
+
+
+@register.simple_tag(takes_context=True)
+def modal_trigger(context, viewname, pk, label='', icon=None, **attrs):
+    """
+    Render trigger button of the modal form of viewname for the object with pk. Its data-form-url is set by
+    modal_url, other keyword arguments are rendered as attributes, with underscores replaced by hyphens.
+
+        {% modal_trigger 'update_book' book.pk icon='fa fa-pencil' class='update-book btn btn-sm btn-primary' %}
+    """
+
+    attrs = {name.replace('_', '-'): value for name, value in attrs.items()}
+    attrs['data-form-url'] = modal_url(context, viewname, pk)
+    return format_html(
+        '<button type="button"{}>{}{}</button>',
+        format_html_join('', ' {}="{}"', attrs.items()),
+        format_html('<span class="{}"></span>', icon) if icon else '',
+        label
+    )
+
+
+@register.simple_tag(takes_context=True)
+def modal_delete_token(context, obj):
+    """
+    Return token which allows the user of the request to delete obj with a single POST, see DeleteMessageMixin.
+
+        {% modal_delete_token book as token %}
+        {% modal_trigger 'delete_book' book.pk data_delete_token=token data_confirm='Delete this book?' %}
+    """
+
+    request = context.get('request')
+    return make_delete_token(obj, getattr(request, 'user', None))
+
+
+@register.simple_tag
+def modal_container(id='modal', dialog_class=''):
+    """
+    Render empty modal element into which the forms are loaded, modalID setting of the client is "#" + id.
+    """
+
+    return format_html(
+        '<div class="modal fade" tabindex="-1" role="dialog" id="{}" aria-hidden="true">'
+        '<div class="{}" role="document"><div class="modal-content"></div></div></div>',
+        id,
+        ' '.join(['modal-dialog', dialog_class]).strip()
+    )
+
+
+@register.simple_tag
+def modal_forms_delegate(container, selector, flavor='bootstrap5', options=None, **kwargs):
+    """
+    Render script binding modalFormDelegate to the container element with options updated by keyword arguments,
+    so settings shared by all trigger elements are rendered once. Trigger elements set only data-form-url and other
+    data-* attributes overriding the settings.
+
+        {% modal_forms_delegate '#books-table' '.delete-book' 'jquery' isDeleteForm=True %}
+    """
+
+    if flavor not in LOADER_CLIENTS:
+        raise template.TemplateSyntaxError(
+            "modal_forms_delegate flavor must be one of %s, not %r." % (', '.join(LOADER_CLIENTS), flavor)
+        )
+
+    arguments = [
+        json.dumps(value, cls=DjangoJSONEncoder).translate(SCRIPT_ESCAPES)
+        for value in [container, selector, {**(options or {}), **kwargs}]
+    ]
+    if flavor == 'jquery':
+        code = 'jQuery(function () { jQuery(%s).modalFormDelegate(%s, %s); });' % tuple(arguments)
+    else:
+        code = (
+            'document.addEventListener("DOMContentLoaded", function () { '
+            'modalFormDelegate(document.querySelector(%s), %s, %s); });' % tuple(arguments)
+        )
+    return mark_safe('<script>%s</script>' % code)
@@ -0,0 +1,73 @@
+from django import forms
+from django.core.exceptions import ValidationError
+from django.forms.models import ModelChoiceIterator
+from django.utils.translation import gettext_lazy as _
+
+
+class RemoteSelectMixin:
+    """
+    Widget Mixin which renders only the selected choices, so the choices of a large queryset aren't rendered into
+    the modal. Other choices are searched at search_url by the client, see ChoicesSearchMixin. Selected objects of
+    ModelChoiceField are fetched with a single query filtering the queryset by the selected values.
+    """
+
+    search_url = None
+    min_length = 1
+    more_label = _('More results')
+
+    def __init__(self, attrs=None, choices=(), search_url=None, min_length=None, more_label=None):
+        super().__init__(attrs, choices)
+        if search_url is not None:
+            self.search_url = search_url
+        if min_length is not None:
+            self.min_length = min_length
+        if more_label is not None:
+            self.more_label = more_label
+
+    def get_context(self, name, value, attrs):
+        context = super().get_context(name, value, attrs)
+        context['widget']['attrs'].update({
+            'data-remote-url': str(self.search_url),
+            'data-remote-min-length': self.min_length,
+            'data-remote-more-label': str(self.more_label),
+        })
+        return context
+
+    def get_selected_choices(self, value):
+        values = {str(v) for v in value if v not in ('', None)}
+        if not isinstance(self.choices, ModelChoiceIterator):
+            return [choice for choice in self.choices if str(choice[0]) in values or choice[0] == '']
+
+        field = self.choices.field
+        choices = [('', field.empty_label)] if field.empty_label is not None else []
+        if values:
+            key = field.to_field_name or 'pk'
+            try:
+                queryset = self.choices.queryset.filter(**{'%s__in' % key: values})
+                choices.extend(self.choices.choice(obj) for obj in queryset)
+            except (ValueError, TypeError, ValidationError):
+                # Invalid submitted value isn't rendered
+                pass
+        return choices
+
+    def optgroups(self, name, value, attrs=None):
+        choices = self.choices
+        self.choices = self.get_selected_choices(value)
+        try:
+            return super().optgroups(name, value, attrs)
+        finally:
+            self.choices = choices
+
+    def use_required_attribute(self, initial):
+        # Select.use_required_attribute would fetch the first object of the queryset
+        if isinstance(self.choices, ModelChoiceIterator) and not self.allow_multiple_selected:
+            return not self.is_hidden and self.choices.field.empty_label is not None
+        return super().use_required_attribute(initial)
+
+
+class RemoteSelect(RemoteSelectMixin, forms.Select):
+    pass
+
+
+class RemoteSelectMultiple(RemoteSelectMixin, forms.SelectMultiple):
+    pass
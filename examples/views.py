@@ -51,6 +51,7 @@ class BookCreateView(BSModalCreateView):
     form_class = BookModelForm
     success_message = 'Success: Book was created.'
     success_url = reverse_lazy('index')
+    row_template_name = '_book_row.html'
 
 
 class BookUpdateView(BSModalUpdateView):
@@ -59,6 +60,7 @@ class BookUpdateView(BSModalUpdateView):
     form_class = BookModelForm
     success_message = 'Success: Book was updated.'
     success_url = reverse_lazy('index')
+    row_template_name = '_book_row.html'
 
 
 class BookReadView(BSModalReadView):
@@ -0,0 +1,117 @@
+// Build minified, source-mapped bundles of the JS clients in bootstrap_modal_forms/static/js with esbuild.
+//
+//     npm run build    write the bundles
+//     npm run check    fail if the bundles are outdated or exceed their size budget
+//
+// esbuild is pinned to an exact version in package.json, so the same sources always build the same bundles.
+
+import fs from "node:fs";
+import path from "node:path";
+import zlib from "node:zlib";
+import {fileURLToPath} from "node:url";
+import * as esbuild from "esbuild";
+
+const root = path.join(path.dirname(fileURLToPath(import.meta.url)), "..");
+const jsDir = path.join(root, "bootstrap_modal_forms", "static", "js");
+
+// Public API of the Bootstrap 5 client, everything else stays private to the bundle
+const bootstrap5Exports = ["modalForm", "modalFormDelegate", "getModalController"];
+
+const bundles = [
+    {
+        source: "bootstrap5.modal.forms.js",
+        output: "bootstrap5.modal.forms.min.js",
+        // UMD: AMD module, CommonJS module or globals. The IIFE stores the exports in a variable of the factory.
+        format: "iife",
+        globalName: "modalForms",
+        exports: bootstrap5Exports,
+        target: "es2017",
+        prefix: "(function(r,f){typeof define==\"function\"&&define.amd?define([],f):typeof module==\"object\"&&module.exports?module.exports=f():Object.assign(r,f())})(typeof self!=\"undefined\"?self:this,function(){",
+        suffix: "return modalForms});",
+        budget: 9000
+    },
+    {
+        source: "bootstrap5.modal.forms.js",
+        output: "bootstrap5.modal.forms.esm.min.js",
+        format: "esm",
+        exports: bootstrap5Exports,
+        target: "es2017",
+        prefix: "",
+        suffix: "",
+        budget: 9000
+    },
+    {
+        source: "jquery.bootstrap.modal.forms.js",
+        output: "jquery.bootstrap.modal.forms.min.js",
+        // UMD: the plugin is registered on jQuery of AMD or CommonJS module, or on global jQuery
+        format: "iife",
+        target: "es5",
+        prefix: "(function(f){typeof define==\"function\"&&define.amd?define([\"jquery\"],f):typeof module==\"object\"&&module.exports?f(require(\"jquery\")):f(jQuery)})(function(jQuery){",
+        suffix: "});",
+        budget: 7500
+    },
+    {
+        source: "modal.forms.loader.js",
+        output: "modal.forms.loader.min.js",
+        format: "iife",
+        // Dynamic import() of the Bootstrap 5 client
+        target: "es2020",
+        prefix: "",
+        suffix: "",
+        budget: 1000
+    }
+];
+
+const build = async function (bundle) {
+    let source = fs.readFileSync(path.join(jsDir, bundle.source), "utf8");
+    // License banner at the top of the source is kept
+    let banner = source.match(/^\/\*[\s\S]*?\*\//);
+    if (bundle.exports) {
+        source += "\nexport {" + bundle.exports.join(", ") + "};\n";
+    }
+    let result = await esbuild.build({
+        stdin: {contents: source, sourcefile: bundle.source, resolveDir: jsDir, loader: "js"},
+        outfile: path.join(jsDir, bundle.output),
+        write: false,
+        format: bundle.format,
+        globalName: bundle.globalName,
+        target: bundle.target,
+        minify: true,
+        sourcemap: "linked",
+        sourcesContent: false,
+        legalComments: "none",
+        banner: {js: (banner ? banner[0] + "\n" : "") + bundle.prefix},
+        footer: {js: bundle.suffix},
+        logLevel: "warning"
+    });
+    let file = extension => result.outputFiles.find(output => output.path.endsWith(extension)).text;
+    return {code: file(".js"), map: file(".map")};
+};
+
+const check = process.argv.includes("--check");
+let failed = false;
+
+for (let bundle of bundles) {
+    let {code, map} = await build(bundle);
+    let codePath = path.join(jsDir, bundle.output);
+    let mapPath = codePath + ".map";
+    let size = zlib.gzipSync(code, {level: 9}).length;
+
+    if (check) {
+        let current = fs.existsSync(codePath) && fs.readFileSync(codePath, "utf8");
+        let currentMap = fs.existsSync(mapPath) && fs.readFileSync(mapPath, "utf8");
+        if (current !== code || currentMap !== map) {
+            console.error(bundle.output + " is outdated, run npm run build");
+            failed = true;
+        }
+    } else {
+        fs.writeFileSync(codePath, code);
+        fs.writeFileSync(mapPath, map);
+    }
+
+    let status = size > bundle.budget ? "over budget" : "ok";
+    console.log(bundle.output + ": " + code.length + " bytes, " + size + " bytes gzipped, budget " + bundle.budget + " " + status);
+    failed = failed || size > bundle.budget;
+}
+
+process.exit(failed ? 1 : 0);
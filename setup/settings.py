@@ -27,6 +27,7 @@ MIDDLEWARE = [
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
+    'bootstrap_modal_forms.middleware.ModalPhaseMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
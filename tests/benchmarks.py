@@ -0,0 +1,154 @@
+"""
+Benchmarks of the modal request lifecycle run with Django's test client against the examples app.
+
+    python manage.py test tests.benchmarks
+
+Every operation is measured for each table size in BENCHMARK_SIZES environment variable (comma separated,
+100 and 1000 Book rows by default, up to 100000). Number of requests, queries and response bytes are compared with
+benchmarks_baseline.json and the benchmark fails if any of them grew. Render and total times are only reported,
+unless BENCHMARK_TIME_TOLERANCE sets how many times slower than the baseline they may get. Set BENCHMARK_UPDATE=1
+to store the measured values as the new baseline.
+"""
+import json
+import os
+import re
+import sys
+import time
+from pathlib import Path
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from examples.models import Book
+
+BASELINE_PATH = Path(__file__).with_name('benchmarks_baseline.json')
+BYTES_TOLERANCE = 1.1
+
+
+class Measurement:
+    """
+    Totals of all requests of a single operation.
+    """
+
+    def __init__(self):
+        self.requests = 0
+        self.queries = 0
+        self.bytes = 0
+        self.render_ms = 0
+        self.total_ms = 0
+
+    def add(self, response, queries, duration):
+        self.requests += 1
+        self.queries += queries
+        self.bytes += len(response.content)
+        self.total_ms += duration
+        # Render time is reported by ModalPhaseMiddleware for modal views only
+        match = re.search(r'render;dur=([\d.]+)', response.headers.get('Server-Timing', ''))
+        if match:
+            self.render_ms += float(match.group(1))
+
+    def as_dict(self):
+        return {
+            'requests': self.requests,
+            'queries': self.queries,
+            'bytes': self.bytes,
+            'render_ms': round(self.render_ms, 1),
+            'total_ms': round(self.total_ms, 1),
+        }
+
+
+@override_settings(BOOTSTRAP_MODAL_FORMS_TIMING=True, BOOTSTRAP_MODAL_FORMS_TIMING_SINKS=[])
+class LifecycleBenchmark(TestCase):
+    sizes = [int(size) for size in os.environ.get('BENCHMARK_SIZES', '100,1000').split(',')]
+    operations = ['open', 'invalid', 'submit', 'async_update', 'delete']
+
+    def setUp(self):
+        self.data = {
+            'title': 'Life of John Doe',
+            'publication_date': '2019-01-01',
+            'author': 'John Doe',
+            'price': 19.99,
+            'pages': 449,
+            'book_type': 1
+        }
+
+    def fill_table(self, size):
+        missing = size - Book.objects.count()
+        Book.objects.bulk_create(
+            [Book(title='Book %s' % i, price=9.99, book_type=1) for i in range(missing)],
+            batch_size=1000
+        )
+
+    def request(self, measurement, method, url, **kwargs):
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            response = getattr(self.client, method)(url, **kwargs)
+            duration = (time.perf_counter() - start) * 1000
+        measurement.add(response, len(queries), duration)
+        return response
+
+    def run_operation(self, operation, pk):
+        measurement = Measurement()
+        ajax = {'HTTP_X_REQUESTED_WITH': 'XMLHttpRequest'}
+        if operation == 'open':
+            self.request(measurement, 'get', f'/update/{pk}')
+        elif operation == 'invalid':
+            self.request(measurement, 'post', f'/update/{pk}', data=dict(self.data, title=''), **ajax)
+        elif operation == 'submit':
+            self.request(measurement, 'post', f'/update/{pk}', data=self.data, **ajax)
+            self.request(measurement, 'post', f'/update/{pk}', data=self.data)
+        elif operation == 'async_update':
+            self.request(measurement, 'post', f'/update/{pk}', data=self.data, **ajax)
+            self.request(measurement, 'post', f'/update/{pk}', data=dict(self.data, asyncUpdate='True'), **ajax)
+            self.request(measurement, 'get', '/books/', **ajax)
+        elif operation == 'delete':
+            self.request(measurement, 'post', f'/delete/{pk}')
+        return measurement.as_dict()
+
+    def check(self, size, operation, result, baseline):
+        expected = baseline.get(str(size), {}).get(operation)
+        if expected is None:
+            return
+        with self.subTest(size=size, operation=operation):
+            self.assertLessEqual(result['requests'], expected['requests'], 'More requests than in the baseline.')
+            self.assertLessEqual(result['queries'], expected['queries'], 'More queries than in the baseline.')
+            self.assertLessEqual(
+                result['bytes'], expected['bytes'] * BYTES_TOLERANCE, 'Bigger responses than in the baseline.'
+            )
+            tolerance = os.environ.get('BENCHMARK_TIME_TOLERANCE')
+            if tolerance:
+                for name in ['render_ms', 'total_ms']:
+                    self.assertLessEqual(
+                        result[name], expected[name] * float(tolerance), 'Slower than in the baseline.'
+                    )
+
+    def report(self, results):
+        # Written to the stream of the test runner's own output, stdout stays clean
+        row = '%8s %-14s %8s %8s %10s %10s %10s\n'
+        lines = ['\n', row % ('rows', 'operation', 'requests', 'queries', 'bytes', 'render ms', 'total ms')]
+        for size, operations in results.items():
+            for operation, result in operations.items():
+                lines.append(row % (size, operation, *result.values()))
+        sys.stderr.write(''.join(lines))
+
+    def test_lifecycle(self):
+        baseline = json.loads(BASELINE_PATH.read_text()) if BASELINE_PATH.exists() else {}
+        results = {}
+        for size in sorted(self.sizes):
+            self.fill_table(size)
+            pks = iter(Book.objects.order_by('pk').values_list('pk', flat=True)[:len(self.operations)])
+            results[str(size)] = {operation: self.run_operation(operation, next(pks)) for operation in self.operations}
+            # Keep the table size for the next operations
+            self.fill_table(size)
+
+        self.report(results)
+
+        if os.environ.get('BENCHMARK_UPDATE'):
+            baseline.update(results)
+            BASELINE_PATH.write_text(json.dumps(baseline, indent=4, sort_keys=True) + '\n')
+            return
+
+        for size, operations in results.items():
+            for operation, result in operations.items():
+                self.check(size, operation, result, baseline)
@@ -1,11 +1,58 @@
-from django.contrib.auth.models import User
+import asyncio
+import json
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from django import forms
+from django.contrib.auth.models import AnonymousUser, User
 from django.contrib.messages import get_messages
-from django.test import TestCase
+from django.contrib.messages.storage.cookie import CookieStorage
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.cache import cache
+from django.core.exceptions import PermissionDenied
+from django.core.management import call_command
+from django.db import connection
+from django.http import Http404
+from django.template import Context, Template, TemplateSyntaxError
+from django.test import AsyncRequestFactory, RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils.functional import SimpleLazyObject
 
+import bootstrap_modal_forms
+from bootstrap_modal_forms.generic import (
+    BSModalAsyncCreateView,
+    BSModalAsyncDeleteView,
+    BSModalAsyncReadView,
+    BSModalAsyncUpdateView,
+    BSModalBulkCreateView,
+    BSModalBulkDeleteView,
+    BSModalBulkUpdateView,
+    BSModalChoicesSearchView,
+    BSModalDataView,
+    BSModalDeleteView
+)
+from bootstrap_modal_forms.forms import (
+    BSModalForm,
+    CachedModelChoiceField,
+    CachedModelMultipleChoiceField,
+    commit_only
+)
+from bootstrap_modal_forms.middleware import ModalPhase, ModalPhaseMiddleware, QueryBudgetExceeded, get_modal_phase
+from bootstrap_modal_forms.mixins import invalidate_cached_choices, make_delete_token
+from bootstrap_modal_forms.signals import modal_timings
+from bootstrap_modal_forms.widgets import RemoteSelect, RemoteSelectMultiple
+from examples.forms import BookModelForm
 from examples.models import Book
+from examples.views import BookReadView, BookUpdateView
 
 
-class MixinsTest(TestCase):
+class BookTestCase(TestCase):
+    """
+    Test case with a single Book, shared by tests of the views of a single object.
+    """
 
     def setUp(self):
         self.book = Book.objects.create(
@@ -16,6 +63,12 @@ class MixinsTest(TestCase):
             pages=477,
             book_type=2
         )
+
+
+class MixinsTest(BookTestCase):
+
+    def setUp(self):
+        super().setUp()
         self.user = User.objects.create_user(
             username='user',
             password='test1234'
@@ -183,3 +236,1248 @@ class MixinsTest(TestCase):
         self.assertRedirects(response, '/')
         # User is authenticated
         self.assertTrue(response.wsgi_request.user.is_authenticated)
+
+    def test_FormValidationMixin_one_shot(self):
+        """
+        Create and update object through single ajax request in one-shot mode.
+        """
+
+        # Invalid form is rendered with errors and object is not created
+        response = self.client.post(
+            '/create/',
+            data={
+                'title': 'Life of John Doe',
+                'publication_date': '2019-01-01',
+                'author': 'John Doe',
+                'price': 19.99,
+                'pages': 449,
+                # Wrong value
+                'book_type': 'wrong_value',
+                'oneShot': 'True'
+            },
+            HTTP_X_REQUESTED_WITH='XMLHttpRequest'
+        )
+
+        self.assertTrue(response.context_data['form'].errors)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Book.objects.count(), 1)
+
+        # Valid form creates object on the first ajax request
+        response = self.client.post(
+            '/create/',
+            data={
+                'title': 'Life of John Doe',
+                'publication_date': '2019-01-01',
+                'author': 'John Doe',
+                'price': 19.99,
+                'pages': 449,
+                'book_type': 1,
+                'oneShot': 'True'
+            },
+            HTTP_X_REQUESTED_WITH='XMLHttpRequest'
+        )
+
+        self.assertEqual(response.status_code, 200)
+        book = Book.objects.get(title='Life of John Doe')
+        self.assertEqual(response.json(), {'valid': True, 'pk': book.pk, 'operation': 'create', 'success_url': '/'})
+        # Message is stored for the page client redirects to
+        messages = get_messages(response.wsgi_request)
+        self.assertEqual(len(messages), 1)
+
+        # Valid form updates object on the first ajax request
+        response = self.client.post(
+            '/update/1',
+            data={
+                'title': 'Life of Jane and John Doe',
+                'publication_date': '2019-01-01',
+                'author': 'Jane Doe',
+                'price': 29.99,
+                'pages': 477,
+                'book_type': 2,
+                'oneShot': 'True',
+                'asyncUpdate': 'True'
+            },
+            HTTP_X_REQUESTED_WITH='XMLHttpRequest'
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['pk'], 1)
+        self.book.refresh_from_db()
+        self.assertEqual(self.book.title, 'Life of Jane and John Doe')
+
+    def test_LoginAjaxMixin_one_shot(self):
+        """
+        Login user through single ajax request in one-shot mode.
+        """
+
+        response = self.client.post(
+            '/login/',
+            data={
+                'username': 'user',
+                'password': 'test1234',
+                'oneShot': 'True'
+            },
+            HTTP_X_REQUESTED_WITH='XMLHttpRequest'
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {'valid': True, 'success_url': '/'})
+        self.assertTrue(response.wsgi_request.user.is_authenticated)
+
+    def test_FormErrorsMixin(self):
+        """
+        Return form errors as JSON if ajax request accepts JSON.
+        """
+
+        response = self.client.post(
+            '/create/',
+            data={
+                'title': 'Life of John Doe',
+                'publication_date': '2019-01-01',
+                'author': 'John Doe',
+                'price': 19.99,
+                'pages': 449,
+                # Wrong value
+                'book_type': 'wrong_value'
+            },
+            HTTP_X_REQUESTED_WITH='XMLHttpRequest',
+            HTTP_ACCEPT='application/json'
+        )
+
+        self.assertEqual(response.status_code, 400)
+        data = response.json()
+        self.assertFalse(data['valid'])
+        self.assertEqual(list(data['errors']), ['book_type'])
+        self.assertEqual(data['errors']['book_type']['id'], 'id_book_type')
+        self.assertEqual(data['non_field_errors'], [])
+        self.assertEqual(Book.objects.count(), 1)
+
+        # Non field errors of BSModalLoginView
+        response = self.client.post(
+            '/login/',
+            data={
+                'username': 'user',
+                # Wrong value
+                'password': 'wrong_password'
+            },
+            HTTP_X_REQUESTED_WITH='XMLHttpRequest',
+            HTTP_ACCEPT='application/json'
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(len(response.json()['non_field_errors']), 1)
+
+    def test_AsyncRowMixin(self):
+        """
+        Return table row of the object changed by asynchronous request.
+        """
+
+        response = self.client.post(
+            '/update/1',
+            data={
+                'title': 'Life of Jane and John Doe',
+                'publication_date': '2019-01-01',
+                'author': 'Jane Doe',
+                'price': 29.99,
+                'pages': 477,
+                'book_type': 2,
+                'asyncUpdate': 'True'
+            },
+            HTTP_X_REQUESTED_WITH='XMLHttpRequest'
+        )
+
+        data = response.json()
+        self.assertEqual(data['pk'], 1)
+        self.assertEqual(data['operation'], 'update')
+        self.assertIn('<tr data-pk="1">', data['row'])
+        # Number cell doesn't depend on a loop, which single rows are rendered without
+        self.assertIn('<th class="text-center" scope="row">1</th>', data['row'])
+        self.assertIn('Life of Jane and John Doe', data['row'])
+
+        # Asynchronous delete returns pk of deleted object
+        response = self.client.post(
+            '/delete/1',
+            data={'asyncUpdate': 'True'},
+            HTTP_X_REQUESTED_WITH='XMLHttpRequest'
+        )
+
+        self.assertEqual(response.json(), {'pk': 1, 'operation': 'delete'})
+        self.assertEqual(Book.objects.count(), 0)
+
+
+class ModalCacheMixinTest(BookTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.factory = RequestFactory()
+        self.addCleanup(cache.clear)
+
+    def get(self, view_class, pk=None, **kwargs):
+        request = self.factory.get('/')
+        request.user = AnonymousUser()
+        return view_class.as_view(modal_cache_timeout=60, **kwargs)(request, pk=self.book.pk if pk is None else pk)
+
+    def test_cached_until_invalidated(self):
+        """
+        Cached html is returned with a single existence query until the object is changed through the modal views.
+        """
+
+        response = self.get(BookReadView)
+        self.assertContains(response, 'Life of Jane Doe')
+
+        # Change is not made through the modal views, so cache is not invalidated
+        Book.objects.filter(pk=self.book.pk).update(title='Life of John Doe')
+        with self.assertNumQueries(1):
+            response = self.get(BookReadView)
+        self.assertContains(response, 'Life of Jane Doe')
+
+        # Cached html isn't returned for objects excluded from the queryset, e.g. of another user
+        with self.assertRaises(Http404):
+            self.get(BookReadView, queryset=Book.objects.exclude(pk=self.book.pk))
+
+        # Update through BSModalUpdateView invalidates cached html
+        self.client.post(
+            f'/update/{self.book.pk}',
+            data={
+                'title': 'Life of Jane and John Doe',
+                'publication_date': '2019-01-01',
+                'author': 'Jane Doe',
+                'price': 29.99,
+                'pages': 477,
+                'book_type': 2
+            },
+        )
+        response = self.get(BookReadView)
+        self.assertContains(response, 'Life of Jane and John Doe')
+
+        # Url pk is converted like the object's pk, so cached html of a zero-padded pk is invalidated as well
+        self.assertContains(self.get(BookReadView, pk=f'0{self.book.pk}'), 'Life of Jane and John Doe')
+        self.client.post(f'/update/{self.book.pk}', data={
+            'title': 'Life of John Doe',
+            'publication_date': '2019-01-01',
+            'author': 'John Doe',
+            'price': 29.99,
+            'pages': 477,
+            'book_type': 2
+        })
+        self.assertContains(self.get(BookReadView, pk=f'0{self.book.pk}'), 'Life of John Doe')
+        with self.assertRaises(Http404):
+            self.get(BookReadView, pk='wrong_value')
+
+        # Delete through BSModalDeleteView invalidates cached html
+        self.client.post(f'/delete/{self.book.pk}')
+        with self.assertRaises(Http404):
+            self.get(BookReadView)
+
+    def test_csrf_token_placeholder(self):
+        """
+        CSRF token is not cached, every response gets the token of its request.
+        """
+
+        response = self.get(BookUpdateView)
+        token = response.content.decode().split('name="csrfmiddlewaretoken" value="')[1].split('"')[0]
+        self.assertNotIn('__bootstrap_modal_forms_', token)
+
+        response = self.get(BookUpdateView)
+        self.assertNotIn(token, response.content.decode())
+        self.assertContains(response, 'name="csrfmiddlewaretoken"')
+
+
+class ConditionalGetMixinTest(BookTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.factory = RequestFactory()
+
+    def get(self, view_class, **headers):
+        request = self.factory.get('/', **headers)
+        request.user = AnonymousUser()
+        return view_class.as_view(last_modified_field='timestamp')(request, pk=self.book.pk)
+
+    def test_not_modified(self):
+        """
+        Unchanged object is answered with 304 Not Modified.
+        """
+
+        response = self.get(BookReadView)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Life of Jane Doe')
+        etag = response['ETag']
+        self.assertTrue(response.has_header('Last-Modified'))
+        # Browsers revalidate instead of caching heuristically by Last-Modified
+        self.assertEqual(response['Cache-Control'], 'private, no-cache')
+
+        # ETag is checked without rendering the template
+        with self.assertNumQueries(1):
+            response = self.get(BookReadView, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(response['Cache-Control'], 'private, no-cache')
+
+        # Update through BSModalUpdateView changes ETag
+        self.client.post(
+            f'/update/{self.book.pk}',
+            data={
+                'title': 'Life of Jane and John Doe',
+                'publication_date': '2019-01-01',
+                'author': 'Jane Doe',
+                'price': 29.99,
+                'pages': 477,
+                'book_type': 2
+            },
+        )
+        response = self.get(BookReadView, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Life of Jane and John Doe')
+
+    def test_disabled_without_last_modified_field(self):
+        """
+        Conditional headers are not set unless last_modified_field is set.
+        """
+
+        request = self.factory.get('/')
+        request.user = AnonymousUser()
+        response = BookReadView.as_view()(request, pk=self.book.pk)
+        self.assertFalse(response.has_header('ETag'))
+
+
+class AsyncDataMixinTest(TestCase):
+
+    def setUp(self):
+        Book.objects.bulk_create([
+            Book(title=f'Book {i}', price=10, book_type=1) for i in range(10)
+        ])
+        self.pks = list(Book.objects.order_by('pk').values_list('pk', flat=True))
+        self.factory = RequestFactory()
+
+    def get(self, **kwargs):
+        request = self.factory.get('/', data=kwargs.pop('data', {}))
+        view = BSModalDataView.as_view(model=Book, row_template_name='_book_row.html', **kwargs)
+        response = view(request)
+        return json.loads(b''.join(response) if response.streaming else response.content)
+
+    def test_all_rows(self):
+        """
+        Return all rows rendered with row_template_name.
+        """
+
+        data = self.get()
+        self.assertEqual(data['table'].count('<tr data-pk='), 10)
+        self.assertIsNone(data['next'])
+
+    def test_keyset_pagination(self):
+        """
+        Return pages of rows following the cursor.
+        """
+
+        data = self.get(data={'limit': 4})
+        self.assertEqual(data['table'].count('<tr data-pk='), 4)
+        self.assertEqual(data['next'], self.pks[3])
+
+        data = self.get(data={'limit': 4, 'after': data['next']})
+        self.assertIn(f'<tr data-pk="{self.pks[4]}">', data['table'])
+        self.assertEqual(data['next'], self.pks[7])
+
+        # Window around the edited row
+        data = self.get(data={'limit': 4, 'around': self.pks[5]})
+        self.assertEqual(
+            [f'<tr data-pk="{pk}">' in data['table'] for pk in self.pks],
+            [False, False, False, True, True, True, True, False, False, False]
+        )
+
+    def test_stream(self):
+        """
+        Streamed response contains the same JSON.
+        """
+
+        self.assertEqual(self.get(stream=True), self.get())
+        self.assertEqual(self.get(stream=True, data={'limit': 4}), self.get(data={'limit': 4}))
+
+    async def test_stream_asgi(self):
+        """
+        Response is streamed by an async iterator under ASGI.
+        """
+
+        view = BSModalDataView.as_view(model=Book, row_template_name='_book_row.html', stream=True, chunk_size=3)
+        response = await sync_to_async(view)(AsyncRequestFactory().get('/'))
+        self.assertTrue(response.is_async)
+        chunks = [chunk async for chunk in response.streaming_content]
+        self.assertGreater(len(chunks), 1)
+        data = json.loads(b''.join(chunks))
+        self.assertEqual(data['table'].count('<tr data-pk='), 10)
+
+    def test_invalid_cursor(self):
+        """
+        Cursor which isn't a value of the keyset field raises Http404.
+        """
+
+        for name in ['after', 'around']:
+            with self.assertRaises(Http404):
+                self.get(data={'limit': 4, name: 'abc'})
+
+
+class BookAsyncCreateView(BSModalAsyncCreateView):
+    template_name = 'examples/create_book.html'
+    form_class = BookModelForm
+    success_message = 'Success: Book was created.'
+    success_url = '/'
+
+
+class BookAsyncUpdateView(BSModalAsyncUpdateView):
+    model = Book
+    template_name = 'examples/update_book.html'
+    form_class = BookModelForm
+    success_message = 'Success: Book was updated.'
+    success_url = '/'
+
+
+class BookAsyncDeleteView(BSModalAsyncDeleteView):
+    model = Book
+    template_name = 'examples/delete_book.html'
+    success_message = 'Success: Book was deleted.'
+    success_url = '/'
+
+
+class AsyncViewsTest(BookTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.factory = AsyncRequestFactory()
+        self.data = {
+            'title': 'Life of John Doe',
+            'publication_date': '2019-01-01',
+            'author': 'John Doe',
+            'price': 19.99,
+            'pages': 449,
+            'book_type': 1
+        }
+
+    def post(self, data, headers=None):
+        request = self.factory.post('/', data=data, headers=headers)
+        request._messages = CookieStorage(request)
+        return request
+
+    def test_views_are_async(self):
+        """
+        Async views run in the event loop, so ASGI handler calls them without thread-pool adapter.
+        """
+
+        for view_class in [BSModalAsyncCreateView, BSModalAsyncUpdateView, BSModalAsyncReadView, BSModalAsyncDeleteView]:
+            self.assertTrue(asyncio.iscoroutinefunction(view_class.as_view()))
+
+    async def test_create_without_thread(self):
+        """
+        Form without database validation is validated and saved without sync_to_async in the view.
+        """
+
+        view = BookAsyncCreateView.as_view(sync_form_validation=False)
+
+        # Validation request doesn't save the object
+        with mock.patch('bootstrap_modal_forms.mixins.sync_to_async', side_effect=AssertionError):
+            response = await view(self.post(self.data, headers={'X-Requested-With': 'XMLHttpRequest'}))
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(response.headers['X-Modal-Form-Valid'], 'true')
+        self.assertEqual(await Book.objects.acount(), 1)
+
+        with mock.patch('bootstrap_modal_forms.mixins.sync_to_async', side_effect=AssertionError):
+            response = await view(self.post(self.data))
+        self.assertEqual(response.status_code, 302)
+        self.assertTrue(await Book.objects.filter(title='Life of John Doe').aexists())
+
+    async def test_update_one_shot(self):
+        """
+        Update object in a single request and return JSON describing it.
+        """
+
+        view = BookAsyncUpdateView.as_view()
+        response = await view(
+            self.post(dict(self.data, oneShot='True'), headers={'X-Requested-With': 'XMLHttpRequest'}),
+            pk=self.book.pk
+        )
+        self.assertJSONEqual(response.content, {
+            'valid': True,
+            'success_url': '/',
+            'pk': self.book.pk,
+            'operation': 'update'
+        })
+        book = await Book.objects.aget(pk=self.book.pk)
+        self.assertEqual(book.title, 'Life of John Doe')
+
+    async def test_update_async_row(self):
+        """
+        Row of the updated object is rendered in a thread and returned with asyncUpdate.
+        """
+
+        view = BookAsyncUpdateView.as_view(row_template_name='_book_row.html')
+        response = await view(
+            self.post(dict(self.data, asyncUpdate='True'), headers={'X-Requested-With': 'XMLHttpRequest'}),
+            pk=self.book.pk
+        )
+        data = json.loads(response.content)
+        self.assertEqual(data['operation'], 'update')
+        self.assertIn('Life of John Doe', data['row'])
+
+    async def test_read_and_delete(self):
+        """
+        Read and delete object through async views.
+        """
+
+        response = await BSModalAsyncReadView.as_view(model=Book, template_name='examples/read_book.html')(
+            self.factory.get('/'), pk=self.book.pk
+        )
+        self.assertContains(response.render(), 'Life of Jane Doe')
+
+        view = BookAsyncDeleteView.as_view()
+        response = await view(
+            self.post({'asyncUpdate': 'True'}, headers={'X-Requested-With': 'XMLHttpRequest'}),
+            pk=self.book.pk
+        )
+        self.assertJSONEqual(response.content, {'pk': self.book.pk, 'operation': 'delete'})
+        self.assertFalse(await Book.objects.filter(pk=self.book.pk).aexists())
+
+        with self.assertRaises(Http404):
+            await view(self.post({}), pk=self.book.pk)
+
+
+class BookBulkCreateView(BSModalBulkCreateView):
+    model = Book
+    template_name = 'examples/create_book.html'
+    form_class = BookModelForm
+    success_message = 'Success: Books were created.'
+    success_url = '/'
+    row_template_name = '_book_row.html'
+
+
+class BookBulkUpdateView(BSModalBulkUpdateView):
+    model = Book
+    template_name = 'examples/update_book.html'
+    form_class = BookModelForm
+    success_message = 'Success: Books were updated.'
+    success_url = '/'
+    row_template_name = '_book_row.html'
+
+
+class BookBulkDeleteView(BSModalBulkDeleteView):
+    model = Book
+    template_name = 'examples/delete_book.html'
+    success_message = 'Success: Books were deleted.'
+    success_url = '/'
+
+
+class BulkViewsTest(TestCase):
+
+    def setUp(self):
+        Book.objects.bulk_create([
+            Book(title=f'Book {i}', price=10, book_type=1) for i in range(5)
+        ])
+        self.pks = list(Book.objects.order_by('pk').values_list('pk', flat=True))
+        self.factory = RequestFactory()
+
+    def post(self, view_class, data, **headers):
+        request = self.factory.post('/', data=data, **headers)
+        request._messages = CookieStorage(request)
+        return view_class.as_view()(request)
+
+    def test_bulk_update(self):
+        """
+        Update only selected fields of the selected objects in a single query.
+        """
+
+        data = {'pk': self.pks[:3], 'price': 15, 'title': 'Book X', 'update_fields': ['price']}
+
+        # Validation request doesn't update the objects
+        response = self.post(BookBulkUpdateView, data, HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        self.assertEqual(response.status_code, 204)
+
+        # Objects are selected and updated in a single query each, within a savepoint of the transaction
+        with self.assertNumQueries(4):
+            response = self.post(
+                BookBulkUpdateView,
+                dict(data, asyncUpdate='True'),
+                HTTP_X_REQUESTED_WITH='XMLHttpRequest'
+            )
+        data = json.loads(response.content)
+        self.assertEqual(data['pks'], self.pks[:3])
+        self.assertEqual(data['operation'], 'update')
+        self.assertEqual(len(data['rows']), 3)
+
+        self.assertEqual(list(Book.objects.filter(price=15).values_list('pk', flat=True)), self.pks[:3])
+        # Fields which aren't selected are not changed
+        self.assertEqual(Book.objects.filter(title='Book 0').count(), 1)
+
+    def test_bulk_update_clear_field(self):
+        """
+        Selected field left empty is cleared on all selected objects, unless the form requires it.
+        """
+
+        Book.objects.update(author='Jane Doe')
+        response = self.post(
+            BookBulkUpdateView,
+            {'pk': self.pks[:2], 'author': '', 'update_fields': ['author']},
+            HTTP_X_REQUESTED_WITH='XMLHttpRequest',
+            HTTP_ACCEPT='application/json'
+        )
+        self.assertEqual(response.status_code, 204)
+        response = self.post(BookBulkUpdateView, {'pk': self.pks[:2], 'author': '', 'update_fields': ['author']})
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(list(Book.objects.filter(author='').values_list('pk', flat=True)), self.pks[:2])
+
+        response = self.post(
+            BookBulkUpdateView,
+            {'pk': self.pks[:2], 'title': '', 'update_fields': ['title']},
+            HTTP_X_REQUESTED_WITH='XMLHttpRequest',
+            HTTP_ACCEPT='application/json'
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('title', json.loads(response.content)['errors'])
+
+    def test_bulk_update_form_only_field(self):
+        """
+        Changed form fields which aren't model fields are not updated.
+        """
+
+        class ConfirmBookModelForm(BookModelForm):
+            confirm = forms.BooleanField(required=False)
+
+        view_class = type('ConfirmBookBulkUpdateView', (BookBulkUpdateView,), {'form_class': ConfirmBookModelForm})
+        response = self.post(
+            view_class,
+            {'pk': self.pks[:2], 'price': 15, 'confirm': 'on', 'update_fields': ['price', 'confirm'], 'asyncUpdate': 'True'},
+            HTTP_X_REQUESTED_WITH='XMLHttpRequest'
+        )
+        self.assertEqual(json.loads(response.content)['pks'], self.pks[:2])
+        self.assertEqual(Book.objects.filter(price=15).count(), 2)
+
+    def test_bulk_delete(self):
+        """
+        Delete the selected objects and return their pks.
+        """
+
+        response = self.post(
+            BookBulkDeleteView,
+            {'pk': self.pks[:2], 'asyncUpdate': 'True'},
+            HTTP_X_REQUESTED_WITH='XMLHttpRequest'
+        )
+        self.assertJSONEqual(response.content, {'pks': self.pks[:2], 'operation': 'delete'})
+        self.assertEqual(Book.objects.count(), 3)
+
+        with self.assertRaises(Http404):
+            self.post(BookBulkDeleteView, {'pk': ['wrong_value']})
+
+    def test_bulk_create(self):
+        """
+        Create objects of all filled in forms of the formset.
+        """
+
+        data = {
+            'form-TOTAL_FORMS': 3,
+            'form-INITIAL_FORMS': 0,
+            'form-0-title': 'Life of John Doe',
+            'form-0-publication_date': '2019-01-01',
+            'form-0-author': 'John Doe',
+            'form-0-price': 19.99,
+            'form-0-pages': 449,
+            'form-0-book_type': 1,
+            'form-1-title': 'Life of Jane Doe',
+            'form-1-publication_date': '2019-01-01',
+            'form-1-author': 'Jane Doe',
+            'form-1-price': 29.99,
+            'form-1-pages': 477,
+            'form-1-book_type': 'wrong_value',
+        }
+
+        response = self.post(BookBulkCreateView, data, HTTP_X_REQUESTED_WITH='XMLHttpRequest', HTTP_ACCEPT='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('form-1-book_type', json.loads(response.content)['errors'])
+
+        data['form-1-book_type'] = 2
+        response = self.post(BookBulkCreateView, dict(data, oneShot='True'), HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        data = json.loads(response.content)
+        self.assertEqual(data['operation'], 'create')
+        self.assertEqual(len(data['pks']), 2)
+        self.assertEqual(Book.objects.count(), 7)
+
+
+class ModalPhaseTest(TestCase):
+
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def test_phases(self):
+        """
+        Phase is computed from request method, headers and POST flags.
+        """
+
+        self.assertIs(get_modal_phase(self.factory.get('/')), ModalPhase.OPEN)
+        self.assertIs(get_modal_phase(self.factory.post('/')), ModalPhase.COMMIT)
+        self.assertIs(get_modal_phase(self.factory.post('/', HTTP_X_REQUESTED_WITH='XMLHttpRequest')), ModalPhase.VALIDATE)
+        self.assertIs(
+            get_modal_phase(self.factory.post('/', {'oneShot': 'True'}, HTTP_X_REQUESTED_WITH='XMLHttpRequest')),
+            ModalPhase.COMMIT
+        )
+        self.assertIs(
+            get_modal_phase(self.factory.post('/', {'asyncUpdate': 'True'}, HTTP_X_REQUESTED_WITH='XMLHttpRequest')),
+            ModalPhase.ASYNC_COMMIT
+        )
+        # Flags of non-ajax requests are ignored
+        self.assertIs(get_modal_phase(self.factory.post('/', {'asyncUpdate': 'True'})), ModalPhase.COMMIT)
+
+    def test_fetch_clients(self):
+        """
+        Fetch-based clients are recognized by Accept header or declare the phase explicitly.
+        """
+
+        self.assertIs(get_modal_phase(self.factory.post('/', HTTP_ACCEPT='application/json')), ModalPhase.VALIDATE)
+        self.assertIs(get_modal_phase(self.factory.post('/', HTTP_X_MODAL_PHASE='validate')), ModalPhase.VALIDATE)
+        self.assertIs(get_modal_phase(self.factory.post('/', HTTP_X_MODAL_PHASE='async-commit')), ModalPhase.ASYNC_COMMIT)
+
+        request = self.factory.post('/', HTTP_X_MODAL_PHASE='commit')
+        self.assertIs(get_modal_phase(request), ModalPhase.COMMIT)
+        self.assertTrue(request.modal.one_shot)
+
+    def test_middleware(self):
+        """
+        Middleware attaches modal state to the request.
+        """
+
+        response = self.client.get('/')
+        self.assertIs(response.wsgi_request.modal.phase, ModalPhase.OPEN)
+
+    @override_settings(
+        BOOTSTRAP_MODAL_FORMS_TIMING=True,
+        BOOTSTRAP_MODAL_FORMS_TIMING_SINKS=['tests.tests_unit.record_timings']
+    )
+    def test_timings(self):
+        """
+        Steps of requests to modal views are timed and emitted in Server-Timing header, signal and sinks.
+        """
+
+        book = Book.objects.create(title='Life of Jane Doe', price=29.99, book_type=2)
+        received = []
+        modal_timings.connect(lambda sender, **kwargs: received.append(sender), weak=False, dispatch_uid='test')
+        self.addCleanup(modal_timings.disconnect, dispatch_uid='test')
+
+        response = self.client.post(
+            f'/update/{book.pk}', data={'title': ''}, HTTP_X_REQUESTED_WITH='XMLHttpRequest'
+        )
+        header = response.headers['Server-Timing']
+        for name in ['form', 'clean', 'render', 'total']:
+            self.assertIn('%s;dur=' % name, header)
+        self.assertIn('phase;desc="validate"', header)
+        self.assertEqual(received, [BookUpdateView])
+        self.assertEqual(recorded_timings[-1]['phase'], ModalPhase.VALIDATE)
+        self.assertIn('clean', recorded_timings[-1]['timings'])
+
+        # Other views are not timed
+        self.assertFalse(self.client.get('/').has_header('Server-Timing'))
+
+    def test_query_check(self):
+        """
+        Modal views exceeding max_queries or repeating the same query raise in tests and log in production.
+        """
+
+        books = [Book.objects.create(title='Book %s' % i, price=9.99, book_type=1) for i in range(5)]
+
+        class NPlusOneReadView(BookReadView):
+            def get_context_data(self, **kwargs):
+                kwargs['books'] = [Book.objects.get(pk=book.pk) for book in books]
+                return super().get_context_data(**kwargs)
+
+        def get(view_class):
+            view = view_class.as_view()
+
+            def get_response(request):
+                middleware.process_view(request, view, (), {'pk': books[0].pk})
+                return view(request, pk=books[0].pk)
+
+            middleware = ModalPhaseMiddleware(get_response)
+            return middleware(self.factory.get('/'))
+
+        with self.settings(BOOTSTRAP_MODAL_FORMS_QUERY_CHECK='raise'):
+            get(BookReadView)
+            with self.assertRaisesMessage(QueryBudgetExceeded, 'executed 1 queries in open phase, max_queries is 0'):
+                get(type('BudgetReadView', (BookReadView,), {'max_queries': 0}))
+            with self.assertRaisesMessage(QueryBudgetExceeded, 'repeated query 6 times in open phase, possible N+1'):
+                get(NPlusOneReadView)
+
+        with self.settings(BOOTSTRAP_MODAL_FORMS_QUERY_CHECK='log'):
+            with self.assertLogs('bootstrap_modal_forms', 'WARNING'):
+                get(NPlusOneReadView)
+
+    @override_settings(BOOTSTRAP_MODAL_FORMS_QUERY_CHECK='raise')
+    async def test_query_check_asgi(self):
+        """
+        Queries of sync views are counted under ASGI, where the view runs in another thread than the middleware.
+        """
+
+        book = await Book.objects.acreate(title='Life of Jane Doe', price=29.99, book_type=2)
+        response = await self.async_client.get(f'/read/{book.pk}')
+        self.assertEqual(response.status_code, 200)
+        with mock.patch.object(BookReadView, 'max_queries', 0, create=True):
+            with self.assertRaisesMessage(QueryBudgetExceeded, 'executed 1 queries in open phase, max_queries is 0'):
+                await self.async_client.get(f'/read/{book.pk}')
+
+
+recorded_timings = []
+
+
+def record_timings(**kwargs):
+    recorded_timings.append(kwargs)
+
+
+class CommitOnlyBookForm(BookModelForm):
+    commit_only_fields = ['author']
+
+    class Meta(BookModelForm.Meta):
+        pass
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields['author'].validators.append(self.validate_author)
+
+    @staticmethod
+    def validate_author(value):
+        raise forms.ValidationError('Author is checked on commit.')
+
+    @commit_only
+    def clean_title(self):
+        raise forms.ValidationError('Title is checked on commit.')
+
+
+class ModalPhaseFormMixinTest(TestCase):
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.data = {
+            'title': 'Life of John Doe',
+            'publication_date': '2019-01-01',
+            'author': 'John Doe',
+            'price': 19.99,
+            'pages': 449,
+            'book_type': 1
+        }
+
+    def test_commit_only(self):
+        """
+        Commit-only fields and clean methods are skipped during the ajax validation request.
+        """
+
+        request = self.factory.post('/', data=self.data, HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        form = CommitOnlyBookForm(data=self.data, request=request)
+        self.assertTrue(form.is_valid())
+        # Skipped field is still rendered, at its place
+        self.assertEqual(list(form.fields), list(CommitOnlyBookForm.base_fields))
+
+        request = self.factory.post('/', data=self.data)
+        form = CommitOnlyBookForm(data=self.data, request=request)
+        self.assertFalse(form.is_valid())
+        self.assertEqual(set(form.errors), {'title', 'author'})
+
+    def test_field_validation(self):
+        """
+        Validate only the requested field and return its errors as JSON without saving the object.
+        """
+
+        book = Book.objects.create(**self.data)
+        data = {'title': '', 'price': 'wrong_value', 'book_type': 'wrong_value', 'validateField': 'book_type'}
+
+        # Only the object is fetched
+        with self.assertNumQueries(1):
+            response = self.client.post(f'/update/{book.pk}', data=data, HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        data = json.loads(response.content)
+        self.assertEqual(data['field'], 'book_type')
+        self.assertFalse(data['valid'])
+        self.assertEqual(list(data['errors']), ['book_type'])
+        self.assertEqual(data['errors']['book_type']['id'], 'id_book_type')
+
+        response = self.client.post(
+            f'/update/{book.pk}',
+            data={'title': '', 'validateField': 'author', 'author': 'Jane Doe'},
+            HTTP_X_MODAL_PHASE='validate-field'
+        )
+        self.assertJSONEqual(response.content, {'field': 'author', 'valid': True, 'errors': {}})
+        book.refresh_from_db()
+        self.assertEqual(book.author, 'John Doe')
+
+    def test_form_validity_header(self):
+        """
+        Response of the submitted form tells whether the form was valid in X-Modal-Form-Valid header.
+        """
+
+        book = Book.objects.create(**self.data)
+        response = self.client.post(f'/update/{book.pk}', data=self.data, HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(response.headers['X-Modal-Form-Valid'], 'true')
+
+        response = self.client.post(
+            f'/update/{book.pk}', data=dict(self.data, title=''), HTTP_X_REQUESTED_WITH='XMLHttpRequest'
+        )
+        self.assertEqual(response.headers['X-Modal-Form-Valid'], 'false')
+
+        response = self.client.post(
+            f'/update/{book.pk}', data={'title': '', 'validateField': 'title'}, HTTP_X_REQUESTED_WITH='XMLHttpRequest'
+        )
+        self.assertEqual(response.headers['X-Modal-Form-Valid'], 'false')
+
+        response = self.client.post('/filter/', data={'type': 1}, HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(response.headers['X-Modal-Form-Valid'], 'true')
+
+    def test_skip_validation_context(self):
+        """
+        Form rendered for the ajax validation request gets only the form and the view in its context.
+        """
+
+        data = dict(self.data, book_type='wrong_value')
+        request = self.factory.post('/', data=data, HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        request.user = AnonymousUser()
+        response = BookUpdateView.as_view(skip_validation_context=True)(request, pk=Book.objects.create(**self.data).pk)
+        self.assertEqual(set(response.context_data), {'form', 'view'})
+        self.assertContains(response.render(), 'invalid')
+
+
+class BookTitleChoiceField(CachedModelChoiceField):
+    def label_from_instance(self, obj):
+        return obj.title
+
+
+class BookChoiceForm(BSModalForm):
+    book = BookTitleChoiceField(queryset=Book.objects.order_by('pk'))
+    books = CachedModelMultipleChoiceField(queryset=Book.objects.order_by('pk'), required=False)
+
+
+class CachedChoicesTest(TestCase):
+
+    def setUp(self):
+        self.addCleanup(cache.clear)
+        self.factory = RequestFactory()
+        self.books = [
+            Book.objects.create(title=title, price=9.99, book_type=1) for title in ['Book A', 'Book B']
+        ]
+
+    def get_form(self, data=None):
+        return BookChoiceForm(data=data, request=self.factory.get('/'))
+
+    def test_choices_are_cached(self):
+        """
+        Choices are read from the cache and invalidated when an object is saved or deleted.
+        """
+
+        # Both fields are labelled differently, so each is cached separately
+        with self.assertNumQueries(2):
+            self.get_form().as_p()
+        with self.assertNumQueries(0):
+            html = self.get_form().as_p()
+        self.assertIn('Book B', html)
+
+        self.books[1].title = 'Book C'
+        self.books[1].save()
+        self.assertIn('Book C', self.get_form().as_p())
+
+        self.books[1].delete()
+        self.assertNotIn('Book C', self.get_form().as_p())
+
+        Book.objects.filter(pk=self.books[0].pk).update(title='Book D')
+        self.assertNotIn('Book D', self.get_form().as_p())
+        invalidate_cached_choices(Book)
+        self.assertIn('Book D', self.get_form().as_p())
+
+    def test_validation(self):
+        """
+        Values which aren't among the cached choices are rejected without querying the database.
+        """
+
+        self.get_form().as_p()
+        pk = self.books[0].pk
+        with self.assertNumQueries(0):
+            form = self.get_form({'book': 0, 'books': [pk, 0]})
+            self.assertFalse(form.is_valid())
+        self.assertEqual(form.errors.as_data()['book'][0].code, 'invalid_choice')
+        self.assertEqual(form.errors.as_data()['books'][0].code, 'invalid_choice')
+
+        form = self.get_form({'book': pk, 'books': [pk]})
+        self.assertTrue(form.is_valid())
+        self.assertEqual(form.cleaned_data['book'], self.books[0])
+        self.assertEqual(list(form.cleaned_data['books']), [self.books[0]])
+
+        # Set of valid values is built once for all submitted values
+        form = self.get_form({'book': pk, 'books': [book.pk for book in self.books]})
+        with mock.patch.object(form.fields['books'], 'get_cached_choices', wraps=form.fields['books'].get_cached_choices) as get:
+            self.assertTrue(form.is_valid())
+        self.assertEqual(get.call_count, 1)
+
+
+class BookRemoteForm(BSModalForm):
+    book = forms.ModelChoiceField(queryset=Book.objects.all(), widget=RemoteSelect(search_url='/books/search/'))
+    books = forms.ModelMultipleChoiceField(
+        queryset=Book.objects.all(),
+        widget=RemoteSelectMultiple(search_url='/books/search/'),
+        required=False
+    )
+
+
+class RemoteChoicesTest(TestCase):
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.books = [
+            Book.objects.create(title='Book %s' % i, price=9.99, book_type=1) for i in range(5)
+        ]
+
+    def test_widget(self):
+        """
+        Only the selected choices are rendered and validated with a single query per field.
+        """
+
+        form = BookRemoteForm(initial={'book': self.books[1].pk}, request=self.factory.get('/'))
+        # Nothing is selected in books
+        with self.assertNumQueries(1):
+            html = form.as_p()
+        self.assertIn('data-remote-url="/books/search/"', html)
+        self.assertIn('value="%s" selected' % self.books[1].pk, html)
+        self.assertNotIn('value="%s"' % self.books[0].pk, html)
+        self.assertIn('<option value="">', html)
+
+        data = {'book': self.books[2].pk, 'books': [self.books[3].pk, self.books[4].pk]}
+        form = BookRemoteForm(data=data, request=self.factory.get('/'))
+        with self.assertNumQueries(2):
+            self.assertTrue(form.is_valid())
+        html = form.as_p()
+        self.assertNotIn('value="%s"' % self.books[0].pk, html)
+        self.assertIn('value="%s" selected' % self.books[4].pk, html)
+
+        form = BookRemoteForm(data={'book': 'wrong_value'}, request=self.factory.get('/'))
+        self.assertFalse(form.is_valid())
+        self.assertIn('<option value="">', form.as_p())
+
+    def test_search(self):
+        """
+        Search view returns a page of matching objects without counting them.
+        """
+
+        view = BSModalChoicesSearchView.as_view(
+            queryset=Book.objects.order_by('pk'), search_fields=['title'], paginate_by=2
+        )
+        with self.assertNumQueries(1):
+            response = view(self.factory.get('/', {'q': 'book', 'page': 2}))
+        self.assertJSONEqual(response.content, {
+            'results': [{'id': book.pk, 'text': str(book)} for book in self.books[2:4]],
+            'page': 2,
+            'more': True
+        })
+
+        response = view(self.factory.get('/', {'q': 'Book 4'}))
+        data = json.loads(response.content)
+        self.assertEqual([result['id'] for result in data['results']], [self.books[4].pk])
+        self.assertFalse(data['more'])
+
+        with self.assertRaises(Http404):
+            view(self.factory.get('/', {'page': 'wrong_value'}))
+
+    def test_search_unordered(self):
+        """
+        Unordered queryset is ordered by pk, so pages neither overlap nor skip objects.
+        """
+
+        view = BSModalChoicesSearchView.as_view(model=Book, paginate_by=2)
+        pks = []
+        for page in range(1, 4):
+            with CaptureQueriesContext(connection) as queries:
+                response = view(self.factory.get('/', {'page': page}))
+            self.assertIn('ORDER BY', queries[0]['sql'])
+            pks.extend(result['id'] for result in json.loads(response.content)['results'])
+        self.assertEqual(pks, [book.pk for book in self.books])
+
+
+class StaticFilesTest(TestCase):
+
+    def test_manifest_storage(self):
+        """
+        Minified bundles and their source maps are hashed by ManifestStaticFilesStorage.
+        """
+
+        with tempfile.TemporaryDirectory() as static_root, override_settings(
+            STATIC_ROOT=static_root,
+            STATICFILES_DIRS=[Path(bootstrap_modal_forms.__file__).parent / 'static'],
+            STATICFILES_FINDERS=['django.contrib.staticfiles.finders.FileSystemFinder'],
+            STORAGES={
+                'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+                'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.ManifestStaticFilesStorage'},
+            }
+        ):
+            call_command('collectstatic', interactive=False, verbosity=0)
+            storage = ManifestStaticFilesStorage()
+            for name in ['bootstrap5.modal.forms.min.js', 'bootstrap5.modal.forms.esm.min.js',
+                         'jquery.bootstrap.modal.forms.min.js', 'modal.forms.loader.min.js']:
+                hashed_name = storage.stored_name('js/%s' % name)
+                self.assertNotEqual(hashed_name, 'js/%s' % name)
+                with storage.open(hashed_name) as bundle:
+                    content = bundle.read().decode()
+                map_name = storage.stored_name('js/%s.map' % name)
+                self.assertIn('//# sourceMappingURL=%s' % map_name.split('/')[-1], content)
+
+
+class TemplateTagsTest(TestCase):
+
+    def test_modal_forms_loader(self):
+        """
+        Loader script points to the client of the flavor and passes the delegate options as JSON.
+        """
+
+        html = Template(
+            "{% load bootstrap_modal_forms %}{% modal_forms_loader options=options modalID='#create-modal' %}"
+        ).render(Context({'options': {'asyncUpdate': True}}))
+        self.assertIn('src="/static/js/modal.forms.loader.min.js"', html)
+        self.assertIn('data-modal-forms-client="/static/js/bootstrap5.modal.forms.esm.min.js"', html)
+        self.assertIn('data-modal-forms-selector="[data-form-url]"', html)
+        self.assertIn(
+            'data-modal-forms-options="{&quot;asyncUpdate&quot;: true, &quot;modalID&quot;: &quot;#create-modal&quot;}"',
+            html
+        )
+        self.assertNotIn('data-modal-forms-jquery', html)
+
+        html = Template(
+            "{% load bootstrap_modal_forms %}{% modal_forms_loader 'jquery' '.bs-modal' jquery='js/jquery.js' %}"
+        ).render(Context())
+        self.assertIn('data-modal-forms-client="/static/js/jquery.bootstrap.modal.forms.min.js"', html)
+        self.assertIn('data-modal-forms-selector=".bs-modal"', html)
+        self.assertIn('data-modal-forms-jquery="/static/js/jquery.js"', html)
+
+        with self.assertRaises(TemplateSyntaxError):
+            Template("{% load bootstrap_modal_forms %}{% modal_forms_loader 'bootstrap4' %}").render(Context())
+
+    def test_modal_url(self):
+        """
+        URL of a view is reversed once per render for all rows of the table.
+        """
+
+        books = [Book(pk=pk) for pk in range(1, 4)]
+        template = Template(
+            "{% load bootstrap_modal_forms %}{% for book in books %}{% include '_book_row.html' %}{% endfor %}"
+        )
+        with mock.patch(
+            'bootstrap_modal_forms.templatetags.bootstrap_modal_forms.reverse', wraps=reverse
+        ) as mocked_reverse:
+            html = template.render(Context({'books': books}))
+        self.assertEqual(mocked_reverse.call_count, 3)
+        for book in books:
+            for viewname in ['read_book', 'update_book', 'delete_book']:
+                self.assertIn('data-form-url="%s"' % reverse(viewname, args=[book.pk]), html)
+        self.assertIn(
+            '<button type="button" class="read-book btn btn-sm btn-primary" data-form-url="/read/1">'
+            '<span class="fa fa-eye"></span></button>',
+            html
+        )
+
+        html = Template("{% load bootstrap_modal_forms %}{% modal_url 'update_book' pk %}").render(Context({'pk': 'a b'}))
+        self.assertEqual(html, '/update/a%20b')
+
+    def test_modal_container(self):
+        html = Template("{% load bootstrap_modal_forms %}{% modal_container 'create-modal' 'mt-5' %}").render(Context())
+        self.assertInHTML(
+            '<div class="modal fade" tabindex="-1" role="dialog" id="create-modal" aria-hidden="true">'
+            '<div class="modal-dialog mt-5" role="document"><div class="modal-content"></div></div></div>',
+            html
+        )
+
+    def test_modal_forms_delegate(self):
+        """
+        Shared settings are rendered once as escaped JSON arguments of modalFormDelegate.
+        """
+
+        html = Template(
+            "{% load bootstrap_modal_forms %}{% modal_forms_delegate '#books-table' '.update-book' 'jquery' "
+            "asyncUpdate=True successMessage=message %}"
+        ).render(Context({'message': '</script>'}))
+        self.assertEqual(
+            html,
+            '<script>jQuery(function () { jQuery("#books-table").modalFormDelegate(".update-book", '
+            '{"asyncUpdate": true, "successMessage": "\\u003C/script\\u003E"}); });</script>'
+        )
+
+        html = Template(
+            "{% load bootstrap_modal_forms %}{% modal_forms_delegate '#books-table' '.read-book' %}"
+        ).render(Context())
+        self.assertIn('modalFormDelegate(document.querySelector("#books-table"), ".read-book", {})', html)
+
+
+class SignedDeleteTest(TestCase):
+
+    def setUp(self):
+        self.books = [Book.objects.create(title='Book %s' % i, price=9.99, book_type=1) for i in range(2)]
+        self.user = User.objects.create_user(username='john')
+        self.factory = RequestFactory()
+
+    def post(self, data, user=None, **headers):
+        request = self.factory.post('/', data=data, **headers)
+        request.user = user or self.user
+        return request
+
+    def test_delete_with_token(self):
+        """
+        Ajax request with signed token deletes the object without fetching it and returns JSON of the deleted row.
+        """
+
+        book = self.books[0]
+        sync_view = BSModalDeleteView.as_view(model=Book, success_url='/')
+        token = make_delete_token(book, self.user)
+        ajax = {'HTTP_X_REQUESTED_WITH': 'XMLHttpRequest'}
+
+        # Token of another object, user or model, and expired token are rejected
+        for request, kwargs in [
+            (self.post({'delete_token': token}, **ajax), {'pk': self.books[1].pk}),
+            (self.post({'delete_token': token}, user=AnonymousUser(), **ajax), {'pk': book.pk}),
+            (self.post({'delete_token': make_delete_token(self.user, self.user)}, **ajax), {'pk': book.pk}),
+            (self.post({'delete_token': token + 'x'}, **ajax), {'pk': book.pk}),
+        ]:
+            with self.assertRaises(PermissionDenied):
+                sync_view(request, **kwargs)
+        with self.assertRaises(PermissionDenied):
+            BSModalDeleteView.as_view(model=Book, delete_token_max_age=-1)(
+                self.post({'delete_token': token}, **ajax), pk=book.pk
+            )
+
+        with mock.patch.object(BSModalDeleteView, 'get_object', side_effect=AssertionError):
+            response = sync_view(self.post({'delete_token': token}, **ajax), pk=book.pk)
+        self.assertJSONEqual(response.content, {'pk': book.pk, 'operation': 'delete'})
+        self.assertFalse(Book.objects.filter(pk=book.pk).exists())
+
+        with self.assertRaises(Http404):
+            sync_view(self.post({'delete_token': token}, **ajax), pk=book.pk)
+
+    async def test_async_delete_with_token(self):
+        """
+        Async view deletes the object by signed token with a single query.
+        """
+
+        book = self.books[1]
+        request = self.post({'delete_token': make_delete_token(book, self.user)}, HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        response = await BookAsyncDeleteView.as_view()(request, pk=book.pk)
+        self.assertJSONEqual(response.content, {'pk': book.pk, 'operation': 'delete'})
+        self.assertFalse(await Book.objects.filter(pk=book.pk).aexists())
+
+    async def test_async_delete_with_token_lazy_user(self):
+        """
+        Lazy user of AuthenticationMiddleware is loaded outside the event loop to check the token.
+        """
+
+        book = self.books[0]
+        request = self.post({'delete_token': make_delete_token(book, self.user)}, HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        request.user = SimpleLazyObject(lambda: User.objects.get(pk=self.user.pk))
+        response = await BookAsyncDeleteView.as_view()(request, pk=book.pk)
+        self.assertJSONEqual(response.content, {'pk': book.pk, 'operation': 'delete'})
+        self.assertFalse(await Book.objects.filter(pk=book.pk).aexists())
+
+    def test_modal_delete_token(self):
+        """
+        Template tag renders the delete token of the object and the user into the trigger element.
+        """
+
+        book = self.books[0]
+        request = self.factory.get('/')
+        request.user = self.user
+        html = Template(
+            "{% load bootstrap_modal_forms %}{% modal_delete_token book as token %}"
+            "{% modal_trigger 'delete_book' book.pk data_delete_token=token %}"
+        ).render(Context({'book': book, 'request': request}))
+        self.assertIn('data-delete-token="%s"' % make_delete_token(book, self.user), html)